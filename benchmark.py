@@ -0,0 +1,215 @@
+import pygame
+import argparse
+import json
+import random
+import sys
+from math import sin
+from time import perf_counter
+from typing import Callable, TypedDict
+from headless import core, window, HeadlessRunner, virtual_clock
+from framework.game.sprite import Sprite
+from framework.utils.particle_effects import ParticleEffect
+from src.game_states import BasicWaveControlScript
+from src.sprites.player import Player
+from src.sprites.projectiles import NormalProjectile, BaseProjectile, Teams
+from framework.utils.helpers import cached_recolor_image
+
+SUBSYSTEMS : tuple[str, ...] = ('events', 'simulation', 'collisions', 'particles', 'ui', 'draw', 'core_update', 'frame')
+
+class Scenario(TypedDict):
+    wave : int
+    bosses : list[str]
+    bullet_spray : int
+    seconds : float
+    seed : int
+
+SCENARIOS : dict[str, Scenario] = {
+    'wave1' : {'wave' : 1, 'bosses' : [], 'bullet_spray' : 0, 'seconds' : 30, 'seed' : 1},
+    'wave10_golden_boss' : {'wave' : 10, 'bosses' : ['golden_boss'], 'bullet_spray' : 0, 'seconds' : 30, 'seed' : 10},
+    'wave15_spaceship_boss' : {'wave' : 15, 'bosses' : ['spaceship_boss'], 'bullet_spray' : 0, 'seconds' : 30, 'seed' : 15},
+    'wave20_final_boss' : {'wave' : 20, 'bosses' : ['final_boss'], 'bullet_spray' : 0, 'seconds' : 30, 'seed' : 20},
+    'bullet_spray_1000' : {'wave' : 1, 'bosses' : [], 'bullet_spray' : 1000, 'seconds' : 15, 'seed' : 1000},
+}
+
+class FrameTimer:
+    '''Collects one duration per subsystem per frame, in milliseconds.'''
+    def __init__(self) -> None:
+        self.samples : dict[str, list[float]] = {name : [] for name in SUBSYSTEMS}
+        self.current : dict[str, float] = {}
+
+    def begin_frame(self):
+        self.current = {name : 0.0 for name in SUBSYSTEMS}
+
+    def add(self, name : str, seconds : float):
+        self.current[name] += seconds * 1000
+
+    def end_frame(self):
+        for name, value in self.current.items():
+            self.samples[name].append(value)
+
+    def timed(self, name : str, func : Callable) -> Callable:
+        def wrapper(*args, **kwargs):
+            start : float = perf_counter()
+            result = func(*args, **kwargs)
+            self.add(name, perf_counter() - start)
+            return result
+        return wrapper
+
+def percentile(sorted_values : list[float], fraction : float) -> float:
+    if not sorted_values: return 0.0
+    index : float = (len(sorted_values) - 1) * fraction
+    low : int = int(index)
+    high : int = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (index - low)
+
+def summarize(values : list[float]) -> dict[str, float]:
+    ordered : list[float] = sorted(values)
+    return {
+        'mean' : sum(ordered) / len(ordered) if ordered else 0.0,
+        'p50' : percentile(ordered, 0.5),
+        'p90' : percentile(ordered, 0.9),
+        'p99' : percentile(ordered, 0.99),
+        'max' : ordered[-1] if ordered else 0.0,
+    }
+
+def spray_bullets(target_count : int, frame : int):
+    '''Keeps about target_count enemy bullets on screen, fired in a rotating fan from the top of the screen.'''
+    missing : int = target_count - len(NormalProjectile.active_elements)
+    image : pygame.Surface = cached_recolor_image(BaseProjectile.normal_image3, "Red")
+    for i in range(min(missing, 40, len(NormalProjectile.inactive_elements))):
+        angle : float = sin((frame + i * 7) * 0.05) * 70
+        velocity : pygame.Vector2 = pygame.Vector2(0, 2.5).rotate(angle)
+        NormalProjectile.spawn(pygame.Vector2(480 + (i - 20) * 12, 10), velocity, None, None, angle, image,
+                               team=Teams.ENEMY, destructible=True)
+
+def script_player(frame : int):
+    if not Player.active_elements: return
+    player : Player = Player.active_elements[0]
+    player.invincible = True
+    player.position = pygame.Vector2(480 + 380 * sin(frame / 60 * 0.8), player.position.y)
+    if player.can_shoot:
+        player.shoot(False)
+        if frame % 90 == 0: player.perform_alternate_fire(False)
+
+def run_scenario(name : str, scenario : Scenario, simulation_rate : int = 60) -> dict:
+    random.seed(scenario['seed'])
+    if scenario['bullet_spray']:
+        NormalProjectile.grow_pool(scenario['bullet_spray'] + 200 - NormalProjectile.get_pool_size())
+    runner : HeadlessRunner = HeadlessRunner(simulation_rate)
+    Sprite.reset_pool_telemetry()
+    runner.start_game(scenario['wave'])
+    for boss_type in scenario['bosses']:
+        BasicWaveControlScript.spawn_boss(boss_type)
+
+    timer : FrameTimer = FrameTimer()
+    collision_matrix = Sprite.collision_matrix
+    collision_matrix.process = timer.timed('collisions', collision_matrix.process)
+    frame_count : int = round(scenario['seconds'] * simulation_rate)
+    peak_sprites : int = 0
+    try:
+        for frame in range(frame_count):
+            if not core.game.active: break
+            timer.begin_frame()
+            frame_start : float = perf_counter()
+            virtual_clock.advance(1 / simulation_rate)
+            core.update_dt(60)
+
+            start : float = perf_counter()
+            runner.process_events()
+            timer.add('events', perf_counter() - start)
+            if not core.game.active: break
+
+            start = perf_counter()
+            script_player(frame)
+            if scenario['bullet_spray']: spray_bullets(scenario['bullet_spray'], frame)
+            core.game.state.main_logic(core.dt)
+            timer.add('simulation', perf_counter() - start)
+
+            start = perf_counter()
+            ParticleEffect.update_all()
+            timer.add('particles', perf_counter() - start)
+
+            start = perf_counter()
+            window.fill((94,129,162))
+            Sprite.draw_all_sprites(window)
+            timer.add('draw', perf_counter() - start)
+
+            start = perf_counter()
+            core.main_ui.update()
+            core.main_ui.render(window)
+            timer.add('ui', perf_counter() - start)
+
+            start = perf_counter()
+            core.update()
+            timer.add('core_update', perf_counter() - start)
+
+            timer.add('frame', perf_counter() - frame_start)
+            timer.current['simulation'] -= timer.current['collisions']
+            timer.end_frame()
+            peak_sprites = max(peak_sprites, len(Sprite.active_elements))
+    finally:
+        del collision_matrix.process
+        pools : dict[str, dict[str, int]] = Sprite.get_pool_telemetry()
+        if core.game.active:
+            core.end_game()
+
+    return {
+        'scenario' : dict(scenario),
+        'frames' : len(timer.samples['frame']),
+        'peak_sprites' : peak_sprites,
+        'subsystems_ms' : {name : summarize(values) for name, values in timer.samples.items()},
+        'pools' : pools,
+    }
+
+def compare(results : dict, baseline : dict, tolerance : float, metric : str = 'p90') -> list[str]:
+    '''Returns one line per subsystem that got slower than the baseline by more than tolerance (a fraction).'''
+    regressions : list[str] = []
+    for name, result in results['scenarios'].items():
+        base = baseline.get('scenarios', {}).get(name)
+        if base is None: continue
+        for subsystem, stats in result['subsystems_ms'].items():
+            base_stats = base['subsystems_ms'].get(subsystem)
+            if not base_stats or base_stats[metric] <= 0: continue
+            ratio : float = stats[metric] / base_stats[metric]
+            print(f'{name:24} {subsystem:12} {metric} {base_stats[metric]:8.3f}ms -> {stats[metric]:8.3f}ms  x{ratio:0.2f}')
+            if ratio > 1 + tolerance and stats[metric] - base_stats[metric] > 0.05:
+                regressions.append(f'{name}/{subsystem} {metric} x{ratio:0.2f}')
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Runs scripted scenarios headless and reports per-subsystem frame times as JSON.')
+    parser.add_argument('scenarios', nargs='*', help=f'scenarios to run (default : all). Available : {", ".join(SCENARIOS)}')
+    parser.add_argument('--output', default=None, help='file to write the JSON results to (default : stdout)')
+    parser.add_argument('--baseline', default=None, help='JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='allowed slowdown against the baseline, as a fraction')
+    parser.add_argument('--seconds', type=float, default=None, help='override the game time of every scenario')
+    args = parser.parse_args()
+
+    core.LOGGING = False
+    names : list[str] = args.scenarios or list(SCENARIOS)
+    for name in names:
+        if name not in SCENARIOS:
+            parser.error(f"Unknown scenario '{name}'")
+    results : dict = {'python' : sys.version.split()[0], 'pygame' : pygame.version.ver, 'scenarios' : {}}
+    for name in names:
+        scenario : Scenario = dict(SCENARIOS[name])
+        if args.seconds is not None: scenario['seconds'] = args.seconds
+        results['scenarios'][name] = run_scenario(name, scenario)
+
+    output : str = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            baseline : dict = json.load(file)
+        regressions : list[str] = compare(results, baseline, args.tolerance)
+        if regressions:
+            print('Regressions :\n  ' + '\n  '.join(regressions))
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
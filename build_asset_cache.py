@@ -0,0 +1,31 @@
+import argparse
+from time import perf_counter
+from headless import core
+from framework.core.asset_cache import AssetCache
+import src.sprites.bosses
+import src.sprites.upgrade_card
+
+def main():
+    parser = argparse.ArgumentParser(description='Processes every registered image and sound once and stores the results in the asset cache.')
+    parser.add_argument('--path', default=AssetCache.DEFAULT_PATH, help='cache directory')
+    parser.add_argument('--clean', action='store_true', help='remove every existing entry first')
+    args = parser.parse_args()
+
+    core.LOGGING = False
+    cache : AssetCache = AssetCache(args.path)
+    if args.clean: cache.clear()
+    manager = core.assets
+    manager.cache = None
+    start : float = perf_counter()
+    written : int = 0
+    for name, spec in manager.specs.items():
+        if spec['kind'] not in AssetCache.KINDS: continue
+        entry = cache.entries.get(name)
+        if entry is not None and cache.is_fresh(entry, spec): continue
+        cache.write(name, spec, manager.load(name))
+        written += 1
+    cache.save_index()
+    print(f'Wrote {written} entries ({len(cache.entries)} in total) to {args.path} in {perf_counter() - start:0.2f}s')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+import argparse
+import os
+from time import perf_counter
+from framework.core.asset_pack import AssetPack, DEFAULT_PACK_PATH
+
+PACKED_EXTENSIONS : tuple[str, ...] = ('.png', '.jpg', '.ogg', '.wav', '.ttf', '.json')
+
+def find_asset_files(root : str) -> list[str]:
+    files : list[str] = []
+    for directory, _, names in os.walk(root):
+        for name in sorted(names):
+            if name.lower().endswith(PACKED_EXTENSIONS):
+                files.append(os.path.join(directory, name))
+    return sorted(files)
+
+def main():
+    parser = argparse.ArgumentParser(description='Packs the graphics, audio, fonts and data files of the game into one asset pack.')
+    parser.add_argument('--root', default='assets', help='directory to pack')
+    parser.add_argument('--output', default=DEFAULT_PACK_PATH, help='pack file to write')
+    args = parser.parse_args()
+
+    start : float = perf_counter()
+    files : list[str] = find_asset_files(args.root)
+    size : int = AssetPack.write(args.output, files)
+    print(f'Packed {len(files)} files into {args.output} ({size / 1024 / 1024:0.1f} MiB) in {perf_counter() - start:0.2f}s')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+import pygame
+import json
+import os
+from hashlib import sha1
+from typing import Any, TypedDict
+from framework.core.asset_manager import AssetSpec, CachedAsset
+from framework.core.asset_pack import stat_asset
+
+class CacheEntry(TypedDict):
+    key : str
+    source : list[int]
+    size : list[int]
+    mode : str
+    colorkey : list[int]|None
+
+class AssetCache:
+    '''On-disk cache of fully processed images (colorkeyed, rotated, scaled, cropped) and of sounds already resampled
+    to the mixer format, stored as raw buffers. Entries are keyed by a hash of the asset options and, for sounds, the
+    mixer format, and stamped with the size and modification time of the source file, so a stale entry is never used :
+    it is a miss and the asset is decoded normally. Checking an entry never reads the source file.
+    The cache is filled by build_asset_cache.py.'''
+    VERSION : int = 2
+    KINDS : tuple[str, ...] = ('image', 'sound')
+    INDEX_FILE : str = 'index.json'
+    DEFAULT_PATH : str = '.asset_cache'
+    def __init__(self, path : str) -> None:
+        self.path : str = path
+        self.entries : dict[str, CacheEntry] = {}
+        self.hits : int = 0
+        self.misses : int = 0
+        index_path : str = os.path.join(path, self.INDEX_FILE)
+        if os.path.isfile(index_path):
+            with open(index_path, 'r') as file:
+                index : dict = json.load(file)
+            if index.get('version') == self.VERSION:
+                self.entries = index['entries']
+
+    def get_key(self, spec : AssetSpec) -> str:
+        key = sha1(f'{self.VERSION}|{spec["kind"]}|{json.dumps(spec["options"], sort_keys=True)}'.encode())
+        if spec['kind'] == 'sound':
+            key.update(str(pygame.mixer.get_init()).encode())
+        return key.hexdigest()
+
+    def is_fresh(self, entry : CacheEntry, spec : AssetSpec) -> bool:
+        return entry['key'] == self.get_key(spec) and entry['source'] == list(stat_asset(spec['path']))
+
+    def get_data_path(self, name : str) -> str:
+        return os.path.join(self.path, f'{name}.bin')
+
+    def read(self, name : str, spec : AssetSpec) -> CachedAsset|None:
+        '''Returns None on a miss. Safe to call from worker threads.'''
+        if spec['kind'] not in self.KINDS: return None
+        entry : CacheEntry|None = self.entries.get(name)
+        if entry is None or not self.is_fresh(entry, spec):
+            self.misses += 1
+            return None
+        with open(self.get_data_path(name), 'rb') as file:
+            data : bytes = file.read()
+        self.hits += 1
+        if spec['kind'] == 'sound':
+            return CachedAsset(pygame.mixer.Sound(buffer=data))
+        image : pygame.Surface = pygame.image.frombuffer(data, entry['size'], entry['mode'])
+        if entry['colorkey'] is not None: image.set_colorkey(entry['colorkey'])
+        return CachedAsset(image)
+
+    def write(self, name : str, spec : AssetSpec, asset : Any):
+        '''Stores an asset finalized by an AssetManager. Call save_index once done writing.'''
+        if spec['kind'] not in self.KINDS: return
+        os.makedirs(self.path, exist_ok=True)
+        entry : CacheEntry = {'key' : self.get_key(spec), 'source' : list(stat_asset(spec['path'])), 'size' : [0, 0], 'mode' : '', 'colorkey' : None}
+        if spec['kind'] == 'sound':
+            data : bytes = asset.get_raw()
+        else:
+            image : pygame.Surface = asset
+            entry['size'] = list(image.get_size())
+            entry['mode'] = 'RGBA' if image.get_flags() & pygame.SRCALPHA else 'RGB'
+            colorkey = image.get_colorkey()
+            entry['colorkey'] = list(colorkey[:3]) if colorkey is not None else None
+            data = pygame.image.tobytes(image, entry['mode'])
+        with open(self.get_data_path(name), 'wb') as file:
+            file.write(data)
+        self.entries[name] = entry
+
+    def save_index(self):
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, self.INDEX_FILE), 'w') as file:
+            json.dump({'version' : self.VERSION, 'entries' : self.entries}, file, indent=2)
+
+    def clear(self):
+        for name in self.entries:
+            data_path : str = self.get_data_path(name)
+            if os.path.isfile(data_path): os.remove(data_path)
+        self.entries.clear()
+        self.save_index()
@@ -0,0 +1,220 @@
+import pygame
+from typing import Any, Callable, Iterator, TypedDict, TYPE_CHECKING
+from collections.abc import Mapping
+from framework.utils.helpers import alpha_to_colorkey, remove_image_empty, optimize_surface, get_blit_mode, surface_cache, ColorType
+from framework.utils.pivot_2d import Pivot2D
+from framework.core.asset_pack import load_image, load_sound, load_font
+if TYPE_CHECKING:
+    from framework.core.asset_cache import AssetCache
+
+class AssetSpec(TypedDict):
+    kind : str
+    path : str
+    options : dict[str, Any]
+    scenes : tuple[str, ...]
+
+class AssetHandle:
+    '''Named handle to an asset of an AssetManager. Used as a class attribute, it reads as the loaded asset itself,
+    so the asset is only loaded the first time it is accessed.'''
+    def __init__(self, manager : 'AssetManager', name : str) -> None:
+        self.manager : AssetManager = manager
+        self.name : str = name
+
+    def get(self) -> Any:
+        return self.manager.get(self.name)
+
+    def __get__(self, instance : Any, owner : type|None = None) -> Any:
+        return self.manager.get(self.name)
+
+class AssetMap(Mapping):
+    '''Read-only mapping of keys to assets, each loaded the first time it is looked up.'''
+    def __init__(self, manager : 'AssetManager', names : dict[Any, str]) -> None:
+        self.manager : AssetManager = manager
+        self.names : dict[Any, str] = names
+
+    def __getitem__(self, key : Any) -> Any:
+        return self.manager.get(self.names[key])
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+def decode_image(spec : AssetSpec) -> pygame.Surface:
+    return load_image(spec['path'])
+
+def finalize_image(spec : AssetSpec, image : pygame.Surface) -> pygame.Surface:
+    '''Applies, in order : alpha to colorkey conversion, rotation, scaling, cropping to the visible area,
+    then optimize_surface.'''
+    options : dict[str, Any] = spec['options']
+    image = image.convert_alpha()
+    if options.get('colorkey') is not None:
+        image = alpha_to_colorkey(image, options['colorkey'])
+    if options.get('angle'):
+        image = pygame.transform.rotate(image, options['angle'])
+    if options.get('scale', 1) != 1:
+        image = pygame.transform.scale_by(image, options['scale'])
+    if options.get('crop'):
+        image = remove_image_empty(image)
+    return optimize_surface(image)
+
+def decode_sound(spec : AssetSpec) -> pygame.mixer.Sound:
+    return load_sound(spec['path'])
+
+def finalize_sound(spec : AssetSpec, sound : pygame.mixer.Sound) -> pygame.mixer.Sound:
+    sound.set_volume(spec['options'].get('volume', 1))
+    return sound
+
+class CachedAsset:
+    '''An asset read from an AssetCache. It is already processed and only goes through the cached finalizer of its kind.'''
+    def __init__(self, value : Any) -> None:
+        self.value : Any = value
+
+def finalize_cached_image(spec : AssetSpec, image : pygame.Surface) -> pygame.Surface:
+    '''Only converts the image to the display format, keeping its transparency.'''
+    return optimize_surface(image)
+
+def decode_font(spec : AssetSpec) -> pygame.Font:
+    return load_font(spec['path'], spec['options']['size'])
+
+def finalize_font(spec : AssetSpec, font : pygame.Font) -> pygame.Font:
+    return font
+
+class AssetManager:
+    '''Registry of named assets that are loaded on first use.
+    Assets registered with scenes are reference counted : each enter_scene of one of their scenes holds them,
+    and once no scene holding them is entered, they are evicted. Assets without scenes are never evicted.
+    Evicting drops the manager's reference and the derived surfaces in the shared transform caches; sprites still using the
+    asset keep it alive.'''
+    def __init__(self) -> None:
+        self.specs : dict[str, AssetSpec] = {}
+        self.assets : dict[str, Any] = {}
+        self.scene_counts : dict[str, int] = {}
+        self.decoders : dict[str, Callable[[AssetSpec], Any]] = {'image' : decode_image, 'sound' : decode_sound, 'font' : decode_font}
+        self.finalizers : dict[str, Callable[[AssetSpec, Any], Any]] = {'image' : finalize_image, 'sound' : finalize_sound,
+                                                                         'font' : finalize_font}
+        self.cached_finalizers : dict[str, Callable[[AssetSpec, Any], Any]] = {'image' : finalize_cached_image, 'sound' : finalize_sound}
+        self.cache : 'AssetCache|None' = None
+        self.blit_modes : dict[str, str] = {}
+
+    def add(self, name : str, kind : str, path : str, scenes : tuple[str, ...]|list[str] = (), **options) -> AssetHandle:
+        spec : AssetSpec = {'kind' : kind, 'path' : path, 'options' : options, 'scenes' : tuple(scenes)}
+        if self.specs.get(name, spec) != spec:
+            raise ValueError(f"Asset '{name}' is already registered with a different spec")
+        self.specs[name] = spec
+        return AssetHandle(self, name)
+
+    def add_image(self, name : str, path : str, colorkey : ColorType|str|None = None, angle : float = 0, scale : float = 1,
+                  crop : bool = False, scenes : tuple[str, ...]|list[str] = ()) -> AssetHandle:
+        return self.add(name, 'image', path, scenes, colorkey=colorkey, angle=angle, scale=scale, crop=crop)
+
+    def add_sound(self, name : str, path : str, volume : float = 1, scenes : tuple[str, ...]|list[str] = ()) -> AssetHandle:
+        return self.add(name, 'sound', path, scenes, volume=volume)
+
+    def add_font(self, name : str, path : str, size : int, scenes : tuple[str, ...]|list[str] = ()) -> AssetHandle:
+        return self.add(name, 'font', path, scenes, size=size)
+
+    def add_map(self, handles : dict[Any, AssetHandle]) -> AssetMap:
+        return AssetMap(self, {key : handle.name for key, handle in handles.items()})
+
+    def handle(self, name : str) -> AssetHandle:
+        if name not in self.specs:
+            raise KeyError(f"Asset '{name}' is not registered")
+        return AssetHandle(self, name)
+
+    def get(self, name : str) -> Any:
+        asset : Any = self.assets.get(name)
+        if asset is None:
+            asset = self.finalize(name, self.decode(name))
+        return asset
+
+    def load(self, name : str) -> Any:
+        '''Loads the asset without caching it.'''
+        return self._finalize(self.specs[name], self.decode(name))
+
+    def decode(self, name : str) -> Any:
+        '''Only decodes the asset file, or reads it from the cache if there is a valid entry. Safe to call from worker threads.'''
+        spec : AssetSpec = self.specs[name]
+        if self.cache is not None:
+            cached : CachedAsset|None = self.cache.read(name, spec)
+            if cached is not None: return cached
+        return self.decoders[spec['kind']](spec)
+
+    def finalize(self, name : str, decoded : Any) -> Any:
+        '''Finalizes an asset returned by decode and caches it. Must run on the main thread.
+        If the asset got loaded in the meantime, the loaded one is kept.'''
+        if name in self.assets: return self.assets[name]
+        asset : Any = self._finalize(self.specs[name], decoded)
+        self.assets[name] = asset
+        if isinstance(asset, pygame.Surface):
+            self.blit_modes[name] = get_blit_mode(asset)
+        return asset
+
+    def _finalize(self, spec : AssetSpec, decoded : Any) -> Any:
+        if isinstance(decoded, CachedAsset):
+            return self.cached_finalizers[spec['kind']](spec, decoded.value)
+        return self.finalizers[spec['kind']](spec, decoded)
+
+    def is_loaded(self, name : str) -> bool:
+        return name in self.assets
+
+    def get_ref_count(self, name : str) -> int:
+        return sum(self.scene_counts.get(scene, 0) for scene in self.specs[name]['scenes'])
+
+    def get_scene_assets(self, scene : str) -> list[str]:
+        return [name for name, spec in self.specs.items() if scene in spec['scenes']]
+
+    def get_global_assets(self) -> list[str]:
+        '''Assets without scenes, which are never evicted.'''
+        return [name for name, spec in self.specs.items() if not spec['scenes']]
+
+    def enter_scene(self, scene : str, preload : bool = False):
+        '''Holds the assets of scene until the matching exit_scene. With preload, they are all loaded right away.'''
+        self.scene_counts[scene] = self.scene_counts.get(scene, 0) + 1
+        if preload:
+            for name in self.get_scene_assets(scene):
+                self.get(name)
+
+    def exit_scene(self, scene : str):
+        count : int = self.scene_counts.get(scene, 0)
+        if count <= 0: return
+        if count > 1:
+            self.scene_counts[scene] = count - 1
+            return
+        del self.scene_counts[scene]
+        for name in self.get_scene_assets(scene):
+            if self.get_ref_count(name) == 0:
+                self.evict(name)
+
+    def evict(self, name : str) -> bool:
+        '''Also drops the surfaces derived from an evicted image in the shared transform caches, which would keep it alive.'''
+        asset : Any = self.assets.pop(name, None)
+        if asset is None: return False
+        if isinstance(asset, pygame.Surface):
+            derived : list[pygame.Surface] = surface_cache.forget(asset)
+            if Pivot2D.rotation_cache is not None:
+                for surface in [asset] + derived:
+                    Pivot2D.rotation_cache.forget(surface)
+        return True
+
+    def evict_unused(self) -> int:
+        '''Evicts every loaded scene asset that no entered scene holds, such as ones loaded outside of their scenes.'''
+        unused : list[str] = [name for name in self.assets if self.specs[name]['scenes'] and self.get_ref_count(name) == 0]
+        for name in unused:
+            self.evict(name)
+        return len(unused)
+
+    def get_memory_usage(self) -> int:
+        '''Approximate bytes held by loaded images and sounds.'''
+        total : int = 0
+        mixer_init : tuple[int, int, int]|None = pygame.mixer.get_init()
+        for asset in self.assets.values():
+            if isinstance(asset, pygame.Surface):
+                total += asset.get_width() * asset.get_height() * asset.get_bytesize()
+            elif isinstance(asset, pygame.mixer.Sound) and mixer_init:
+                frequency, size, channels = mixer_init
+                total += round(asset.get_length() * frequency) * channels * (abs(size) // 8)
+        return total
+
+asset_manager : AssetManager = AssetManager()
@@ -0,0 +1,170 @@
+import pygame
+import io
+import json
+import mmap
+import os
+import struct
+from typing import Any
+
+class AssetPack:
+    '''Read-only archive of asset files, memory-mapped, so every file is a zero-copy slice of the mapping and
+    the pages are shared by every process that maps the same pack.
+    Layout : MAGIC, then the version and the size of the index (HEADER_FORMAT), then the index as JSON,
+    mapping each path to its offset from the start of the file, its size and the modification time of the source file,
+    then the file contents.'''
+    MAGIC : bytes = b'SBPK'
+    VERSION : int = 2
+    HEADER_FORMAT : str = '<4sHI'
+    ALIGNMENT : int = 64
+    def __init__(self, path : str) -> None:
+        self.path : str = path
+        self._file = open(path, 'rb')
+        self._mmap : mmap.mmap|None = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view : memoryview|None = memoryview(self._mmap)
+        header_size : int = struct.calcsize(self.HEADER_FORMAT)
+        magic, version, index_size = struct.unpack_from(self.HEADER_FORMAT, self._mmap)
+        if magic != self.MAGIC or version != self.VERSION:
+            self.close()
+            raise ValueError(f"'{path}' is not a version {self.VERSION} asset pack")
+        self.index : dict[str, list[int]] = json.loads(bytes(self.view[header_size:header_size + index_size]))
+
+    @staticmethod
+    def normalize_path(path : str) -> str:
+        return os.path.normpath(path).replace('\\', '/')
+
+    def __contains__(self, path : str) -> bool:
+        return self.normalize_path(path) in self.index
+
+    def get_buffer(self, path : str) -> memoryview:
+        '''Zero-copy view of the contents of a packed file.'''
+        offset, size, _ = self.index[self.normalize_path(path)]
+        return self.view[offset:offset + size]
+
+    def stat(self, path : str) -> tuple[int, int]:
+        '''Size and modification time, in nanoseconds, of the file that was packed at path.'''
+        _, size, mtime_ns = self.index[self.normalize_path(path)]
+        return size, mtime_ns
+
+    def open(self, path : str) -> io.BufferedReader:
+        return io.BufferedReader(PackEntryReader(self.get_buffer(path)))
+
+    def close(self):
+        '''Readers still open on the pack, such as the one a Font streams from, keep the mapping alive : it is then
+        unmapped by the garbage collector once the last of them is gone.'''
+        if self.view is None: return
+        try:
+            self.view.release()
+            self._mmap.close()
+        except BufferError:
+            pass
+        self.view = None
+        self._mmap = None
+        self._file.close()
+
+    @classmethod
+    def write(cls, path : str, files : list[str]) -> int:
+        '''Packs files (paths relative to the working directory) into path. Returns the size of the pack.'''
+        names : list[str] = [cls.normalize_path(file_path) for file_path in files]
+        stats : list[os.stat_result] = [os.stat(file_path) for file_path in files]
+        #The index size depends on the offsets, which depend on the index size, so it is laid out until it is stable.
+        index_size : int = 0
+        while True:
+            offset : int = cls._align(struct.calcsize(cls.HEADER_FORMAT) + index_size)
+            index : dict[str, list[int]] = {}
+            for name, stat in zip(names, stats):
+                index[name] = [offset, stat.st_size, stat.st_mtime_ns]
+                offset = cls._align(offset + stat.st_size)
+            index_data : bytes = json.dumps(index, separators=(',', ':')).encode()
+            if len(index_data) <= index_size: break
+            index_size = len(index_data)
+        with open(path, 'wb') as pack:
+            pack.write(struct.pack(cls.HEADER_FORMAT, cls.MAGIC, cls.VERSION, index_size))
+            pack.write(index_data.ljust(index_size))
+            for file_path, name in zip(files, names):
+                pack.write(b'\0' * (index[name][0] - pack.tell()))
+                with open(file_path, 'rb') as file:
+                    pack.write(file.read())
+            return pack.tell()
+
+    @classmethod
+    def _align(cls, offset : int) -> int:
+        return -(-offset // cls.ALIGNMENT) * cls.ALIGNMENT
+
+class PackEntryReader(io.RawIOBase):
+    '''File-like reader over a memoryview, so pygame can stream a packed file without it being copied first.'''
+    def __init__(self, buffer : memoryview) -> None:
+        super().__init__()
+        self.buffer : memoryview = buffer
+        self.position : int = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        size : int = max(0, min(len(target), len(self.buffer) - self.position))
+        target[:size] = self.buffer[self.position:self.position + size]
+        self.position += size
+        return size
+
+    def seek(self, offset : int, whence : int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR: offset += self.position
+        elif whence == io.SEEK_END: offset += len(self.buffer)
+        self.position = max(0, offset)
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+DEFAULT_PACK_PATH : str = 'assets.pack'
+mounted_pack : AssetPack|None = None
+
+def mount_pack(path : str = DEFAULT_PACK_PATH) -> AssetPack|None:
+    '''Makes the loaders below read from the pack at path. Does nothing if there is no pack there.'''
+    global mounted_pack
+    if not os.path.isfile(path): return None
+    if mounted_pack is not None: mounted_pack.close()
+    mounted_pack = AssetPack(path)
+    return mounted_pack
+
+def unmount_pack():
+    global mounted_pack
+    if mounted_pack is None: return
+    mounted_pack.close()
+    mounted_pack = None
+
+def is_packed(path : str) -> bool:
+    return mounted_pack is not None and path in mounted_pack
+
+def open_asset(path : str) -> io.BufferedIOBase:
+    '''Opens path in binary mode, from the mounted pack if it holds it, otherwise from the disk.'''
+    if is_packed(path): return mounted_pack.open(path)
+    return open(path, 'rb')
+
+def stat_asset(path : str) -> tuple[int, int]:
+    '''Size and modification time of path, in nanoseconds, as recorded in the mounted pack if it holds it.'''
+    if is_packed(path): return mounted_pack.stat(path)
+    stat : os.stat_result = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+def load_image(path : str) -> pygame.Surface:
+    if is_packed(path): return pygame.image.load(mounted_pack.open(path), path)
+    return pygame.image.load(path)
+
+def load_sound(path : str) -> pygame.mixer.Sound:
+    if is_packed(path): return pygame.mixer.Sound(file=mounted_pack.open(path))
+    return pygame.mixer.Sound(path)
+
+def load_font(path : str|None, size : int) -> pygame.Font:
+    if path is not None and is_packed(path): return pygame.Font(mounted_pack.open(path), size)
+    return pygame.Font(path, size)
+
+def load_json(path : str, prefer_loose : bool = False) -> Any:
+    '''With prefer_loose, a file on the disk wins over the packed one. Used for data the game writes back, where the
+    packed copy only acts as the default.'''
+    if is_packed(path) and not (prefer_loose and os.path.isfile(path)):
+        return json.loads(bytes(mounted_pack.get_buffer(path)))
+    with open(path, 'r') as file:
+        return json.load(file)
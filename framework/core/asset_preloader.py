@@ -0,0 +1,88 @@
+import pygame
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor, Future
+from os import cpu_count
+from typing import Any
+from framework.core.asset_manager import AssetManager
+
+class AssetPreloader:
+    '''Loads a batch of assets of an AssetManager without freezing the window.
+    Files are decoded on a thread pool (pygame releases the GIL while decoding images and sounds),
+    while the finalization, like the conversion to the display format, happens on the main thread in update,
+    a few milliseconds per call. With 0 workers (the web build has no threads), everything happens in update.'''
+    THREADED_KINDS : tuple[str, ...] = ('image', 'sound')
+    def __init__(self, manager : AssetManager, names : list[str], workers : int|None = None) -> None:
+        self.manager : AssetManager = manager
+        self.names : list[str] = [name for name in dict.fromkeys(names) if not manager.is_loaded(name)]
+        self.workers : int = min(8, cpu_count() or 1) if workers is None else workers
+        self.executor : ThreadPoolExecutor|None = None
+        self.pending : dict[str, Future|None] = {}
+        self.loaded : int = 0
+        self.started : bool = False
+
+    @classmethod
+    def for_scenes(cls, manager : AssetManager, scenes : list[str]|tuple[str, ...] = (), workers : int|None = None) -> 'AssetPreloader':
+        '''Preloads every asset without scenes, then the assets of scenes.'''
+        names : list[str] = manager.get_global_assets()
+        for scene in scenes:
+            names += manager.get_scene_assets(scene)
+        return cls(manager, names, workers)
+
+    @property
+    def total(self) -> int:
+        return len(self.names)
+
+    @property
+    def progress(self) -> float:
+        return self.loaded / self.total if self.names else 1.0
+
+    @property
+    def done(self) -> bool:
+        return self.started and not self.pending
+
+    def start(self):
+        if self.started: return
+        self.started = True
+        if self.workers > 0:
+            self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix='asset_preloader')
+        for name in self.names:
+            if self.executor is not None and self.manager.specs[name]['kind'] in self.THREADED_KINDS:
+                self.pending[name] = self.executor.submit(self.manager.decode, name)
+            else:
+                self.pending[name] = None
+        self._check_done()
+
+    def update(self, time_budget : float = 0.004):
+        '''Finalizes decoded assets until time_budget seconds have passed. Must run on the main thread.'''
+        if not self.started: self.start()
+        start : float = perf_counter()
+        for name, future in list(self.pending.items()):
+            if future is not None and not future.done(): continue
+            self._finalize(name, future)
+            if perf_counter() - start >= time_budget: break
+        self._check_done()
+
+    def wait(self):
+        '''Blocks until every asset is loaded.'''
+        if not self.started: self.start()
+        while self.pending:
+            name, future = next(iter(self.pending.items()))
+            self._finalize(name, future)
+        self._check_done()
+
+    def _finalize(self, name : str, future : Future|None):
+        del self.pending[name]
+        decoded : Any = self.manager.decode(name) if future is None else future.result()
+        self.manager.finalize(name, decoded)
+        self.loaded += 1
+
+    def _check_done(self):
+        if self.pending or self.executor is None: return
+        self.executor.shutdown(wait=False)
+        self.executor = None
+
+    def draw_progress_bar(self, display : pygame.Surface, rect : pygame.Rect, color = 'White', back_color = 'Black'):
+        pygame.draw.rect(display, back_color, rect)
+        inner : pygame.Rect = rect.inflate(-4, -4)
+        inner.width = round(inner.width * self.progress)
+        pygame.draw.rect(display, color, inner)
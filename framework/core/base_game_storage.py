@@ -3,6 +3,7 @@ import json
 import os
 from typing import Any, TypedDict
 from framework.utils.helpers import AnyJson
+from framework.core.asset_pack import load_json
 
 if PLATFORM == 'emscripten':
     from platform import window
@@ -13,6 +14,8 @@ class MockGameData(TypedDict):
 
 class BaseGameStorage:
     """This is the base class for game storage. It must be implemented in game_storage.py."""
+    read_only : bool = False
+
     def __init__(self) -> None:
         """Variables are initialised here."""
         pass
@@ -49,7 +52,9 @@ class BaseGameStorage:
         """
         Function that saves the current game data to file or to web.
             is_web: True if we are currently in a web environnement, else False.
+        Nothing is saved while read_only is set.
         """
+        if self.read_only: return
         self._save_to_file() if not is_web else self._save_to_web()
 
     def _load_from_file(self, file_path : str = 'assets/data/game_info.json') -> bool:
@@ -58,8 +63,7 @@ class BaseGameStorage:
             file_path: The location of the game data file to load from. Defaults to "assets/data/game_info.json".
         Returns --> A boolean that represents the success status of the function.
         """
-        with open(file_path, 'r') as file:
-            data = json.load(file)
+        data = load_json(file_path, prefer_loose=True)
         if data:
             return self._load_data(data)
         return False
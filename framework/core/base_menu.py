@@ -10,6 +10,8 @@ from framework.utils.my_timer import Timer
 from framework.utils.ui.brightness_overlay import BrightnessOverlay
 from math import floor, ceil
 from framework.utils.helpers import ColorType
+from framework.core.asset_manager import asset_manager
+from framework.core.asset_preloader import AssetPreloader
 from typing import Callable
 
 def noop():
@@ -17,11 +19,11 @@ def noop():
 
 class BaseMenu:
     """Base class for the menu."""
-    font_40 = pygame.font.Font(r'assets/fonts/Pixeltype.ttf', 40)
-    font_50 = pygame.font.Font(r'assets/fonts/Pixeltype.ttf', 50)
-    font_60 = pygame.font.Font(r'assets/fonts/Pixeltype.ttf', 60)
-    font_70 = pygame.font.Font(r'assets/fonts/Pixeltype.ttf', 70)
-    font_150 = pygame.font.Font(r'assets/fonts/Pixeltype.ttf', 150)
+    font_40 = asset_manager.add_font('pixeltype_40', r'assets/fonts/Pixeltype.ttf', 40)
+    font_50 = asset_manager.add_font('pixeltype_50', r'assets/fonts/Pixeltype.ttf', 50)
+    font_60 = asset_manager.add_font('pixeltype_60', r'assets/fonts/Pixeltype.ttf', 60)
+    font_70 = asset_manager.add_font('pixeltype_70', r'assets/fonts/Pixeltype.ttf', 70)
+    font_150 = asset_manager.add_font('pixeltype_150', r'assets/fonts/Pixeltype.ttf', 150)
 
     @staticmethod
     def _get_core_object():
@@ -35,6 +37,7 @@ class BaseMenu:
         self.stages : list[list[UiSprite|UiSpriteGroup]|None]
         self.bg_color : ColorType|str
         self.temp : dict[UiSprite|UiSpriteGroup, Timer] = {}
+        self.preloader : AssetPreloader|None = None
         
     def init(self):
         """Initialises a menu object. Must be ran after runtime imports."""
@@ -105,6 +108,13 @@ class BaseMenu:
         Function that renders the menu object.
             display: The surface where the menu gets rendered.
         """
+        for sprite in self.get_render_elements():
+            sprite.draw(display)
+        if self.preloader is not None:
+            self.render_loading_bar(display)
+
+    def get_render_elements(self) -> list[UiSprite]:
+        """Returns the visible sprites of the current stage, in the order they get drawn."""
         sprite_list : list[UiSprite] = []
         for sprite in (self.stages[self.stage] + list(self.temp.keys())):
             if isinstance(sprite, UiSpriteGroup):
@@ -112,8 +122,21 @@ class BaseMenu:
             else:
                 sprite_list.append(sprite)
         sprite_list.sort(key = lambda sprite : sprite.zindex)
-        for sprite in filter(lambda sprite : sprite.visible, sprite_list):
-            sprite.draw(display)
+        return [sprite for sprite in sprite_list if sprite.visible]
+
+    def render_loading_bar(self, display : pygame.Surface):
+        """
+        Function that renders the progress of the preloader over the menu.
+            display: The surface where the loading bar gets rendered.
+        """
+        wx, wy = display.get_size()
+        bar_rect : pygame.Rect = pygame.Rect(0, 0, wx // 3, 16)
+        bar_rect.midbottom = (wx // 2, wy - 90)
+        self.preloader.draw_progress_bar(display, bar_rect)
+        text : pygame.Surface = self.font_40.render(f'Loading... {round(self.preloader.progress * 100)}%', False, 'Black')
+        text_rect : pygame.Rect = text.get_rect(midbottom = (bar_rect.centerx, bar_rect.top - 4))
+        display.blit(text, text_rect)
+        core_object.dirty_display_rects += [bar_rect, text_rect]
         
     
     def update(self, delta : float):
@@ -126,6 +149,30 @@ class BaseMenu:
             if self.temp[item].isover(): to_del.append(item)
         for item in to_del:
             self.temp.pop(item)
+        if self.preloader is not None:
+            self.preloader.update()
+            if self.preloader.done: self.finish_preload()
+
+    def start_preload(self, preloader : AssetPreloader):
+        """
+        Starts loading assets in the background, showing a loading bar until they are all loaded.
+            preloader: The preloader to run. It is advanced by update.
+        """
+        self.preloader = preloader
+        preloader.start()
+        if preloader.done: self.finish_preload()
+
+    def finish_preload(self):
+        """Blocks until the preloader is done, if there is one, then runs on_preload_done."""
+        if self.preloader is None: return
+        self.preloader.wait()
+        self.preloader = None
+        core_object.dirty_renderer.invalidate()
+        self.on_preload_done()
+
+    def on_preload_done(self):
+        """Function that runs once the preloaded assets are all loaded."""
+        pass
     
     def prepare_entry(self, stage : int = 1):
         """
@@ -2,6 +2,7 @@ import json
 from typing import TypedDict, Any
 from sys import platform as PLATFORM
 from framework.utils.helpers import AnyJson
+from framework.core.asset_pack import load_json
 
 if PLATFORM == 'emscripten':
     from platform import window
@@ -58,8 +59,7 @@ class BaseSettings:
         self._save_to_file() if not is_web else self._save_to_web()
 
     def _load_from_file(self, file_path : str = 'assets/data/settings.json') -> bool:
-        with open(file_path, 'r') as file:
-            data = json.load(file)
+        data = load_json(file_path, prefer_loose=True)
         if data:
             return self._load_data(data)
         return False
@@ -22,6 +22,7 @@ class BgManager:
     def play(self, track : pygame.mixer.Sound, volume, loops = -1, maxtime = 0, fade_ms = 0, sound_type : str|None = 'Music'):
         """Used for playing music."""
         channel = track.play(loops, maxtime, fade_ms)
+        if channel is None: return None
         if volume < 1 or volume > 1:
             channel.set_volume(volume * self.global_volume)
             print('hello world')
@@ -31,6 +32,7 @@ class BgManager:
     def play_sfx(self, sfx : pygame.mixer.Sound, volume, loops = 0, maxtime = 0, fade_ms = 0, sound_type : str|None = 'SFX'):
         """Used for playing short sound effects."""
         channel = sfx.play(loops, maxtime, fade_ms)
+        if channel is None: return None
         channel.set_volume(volume * self.global_volume)
         self.current[channel] = TrackInfo(volume, sound_type)
         return channel
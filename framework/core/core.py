@@ -1,7 +1,7 @@
 import pygame
 from time import perf_counter
 from collections import deque
-from framework.utils.my_timer import Timer
+from framework.utils.my_timer import Timer, TimeSource
 from framework.core.event_manger import EventManger
 from framework.networking.networker import Networker
 import framework.game.game_module
@@ -15,6 +15,9 @@ from src.game_storage import GameStorage
 import src.menu
 from framework.game.game_module import Game
 from framework.core.task_scheduler import TaskScheduler
+from framework.core.profiler import Profiler
+from framework.core.dirty_renderer import DirtyRectRenderer
+from framework.core.asset_manager import AssetManager, asset_manager
 from framework.utils.tween_module import TweenTrack, TweenChain
 from framework.utils.animation import AnimationTrack
 import sys
@@ -42,6 +45,8 @@ class Core:
         self.WEBPLATFORM = 'emscripten'
         self.CURRENT_PLATFORM = sys.platform
         self.MIX_UI_AND_SPRITES : bool = False
+        self.DIRTY_RECT_RENDERING : bool = False
+        self.LOGGING : bool = True
         self.main_display : pygame.Surface
         self.brightness_map = pygame.Surface((2000, 2000), pygame.SRCALPHA)
         pygame.draw.rect(self.brightness_map, (255, 255, 255, 0), (0,0, 2000, 2000))
@@ -51,6 +56,11 @@ class Core:
         self.active_fingers : dict[int, tuple[float, float]] = {}
         self.dt : float = 1
         self.last_dt_measurment : float = 0
+        self.FIXED_TIMESTEP : bool = False
+        self.SIMULATION_RATE : int = 60
+        self.MAX_SIMULATION_STEPS : int = 5
+        self.sim_accumulator : float = 0
+        self.render_alpha : float = 1
 
         self.settings = Settings()
         self.bg_manager = BgManager()
@@ -59,10 +69,14 @@ class Core:
         self.game = Game()
         self.storage = GameStorage()
         self.task_scheduler = TaskScheduler()
+        self.profiler = Profiler()
+        self.assets : AssetManager = asset_manager
         self.delta_stream : deque[float] = deque([1 for _ in range(30)])
         self.dirty_display_rects : list[pygame.Rect] = []
+        self.dirty_renderer : DirtyRectRenderer = DirtyRectRenderer()
         self.brightness_map_blend_mode = pygame.BLENDMODE_NONE
 
+        self.time_source : TimeSource = perf_counter
         self.global_timer : Timer = Timer(-1, perf_counter, 1)
         Timer.time_source = self.global_timer.get_time
 
@@ -125,6 +139,7 @@ class Core:
         
         self.menu.prepare_exit()
         self.game.start_game(event)
+        self.dirty_renderer.invalidate()
 
         self.event_manager.bind(pygame.MOUSEBUTTONDOWN, Sprite.handle_mouse_event)
         self.event_manager.bind(pygame.FINGERDOWN, Sprite.handle_touch_event)
@@ -140,6 +155,7 @@ class Core:
     def end_game(self, event : pygame.Event = None):
         self.game.end_game()
         self.menu.prepare_entry(1)
+        self.dirty_renderer.invalidate()
         self.event_manager.unbind(pygame.MOUSEBUTTONDOWN, Sprite.handle_mouse_event)
         self.event_manager.unbind(pygame.FINGERDOWN, Sprite.handle_touch_event)
         self.event_manager.unbind(pygame.KEYDOWN, self.detect_game_over)
@@ -174,12 +190,39 @@ class Core:
     def update_dt(self, target_fps : int|float = 60):
         if self.last_dt_measurment == 0:
             self.dt = 1
-            self.last_dt_measurment = perf_counter()
+            self.last_dt_measurment = self.time_source()
         else:
-            mark = perf_counter()
+            mark = self.time_source()
             self.dt = (mark - self.last_dt_measurment) * target_fps
             self.last_dt_measurment = mark
     
+    def set_time_source(self, time_source : TimeSource):
+        '''Drives dt and the global timer (and so every Timer using the default time source) from time_source instead of perf_counter.
+        Should be called before the game starts, since running timers are not converted.'''
+        self.time_source = time_source
+        self.global_timer.time_source = time_source
+        self.global_timer.restart()
+        self.last_dt_measurment = 0
+
+    @property
+    def sim_dt(self) -> float:
+        '''The delta of one fixed simulation step, in the same 60 fps units as dt.'''
+        return 60 / self.SIMULATION_RATE
+
+    def get_simulation_steps(self) -> int:
+        '''Adds the current dt to the accumulator and returns how many fixed steps of sim_dt are due.
+        render_alpha is set to how far the display is between the last two simulated states.'''
+        step : float = self.sim_dt
+        self.sim_accumulator += self.dt
+        steps : int = int(self.sim_accumulator // step)
+        if steps > self.MAX_SIMULATION_STEPS:
+            steps = self.MAX_SIMULATION_STEPS
+            self.sim_accumulator %= step
+        else:
+            self.sim_accumulator -= steps * step
+        self.render_alpha = self.sim_accumulator / step
+        return steps
+    
     def set_debug_message(self, text : str):
         debug_textsprite : TextSprite = self.main_ui.get_sprite('debug_sprite')
         if not debug_textsprite: return
@@ -194,6 +237,7 @@ class Core:
         else:
             pygame.draw.rect(self.brightness_map, (abs_brightness, abs_brightness, abs_brightness), (0,0, 2000, 2000))
             self.brightness_map_blend_mode = pygame.BLEND_RGB_SUB
+        self.dirty_renderer.invalidate()
     
     def make_connections(self):
         self.event_manager.bound_actions[pygame.QUIT] = [self.close_game]
@@ -206,6 +250,10 @@ class Core:
         self.event_manager.bind(pygame.FINGERDOWN, self.process_touch_event)
         self.event_manager.bind(pygame.FINGERMOTION, self.process_touch_event)
         self.event_manager.bind(pygame.FINGERUP, self.process_touch_event)
+        self.event_manager.bind(pygame.KEYDOWN, self.handle_profiler_key)
+    
+    def handle_profiler_key(self, event : pygame.Event):
+        self.profiler.handle_key_event(event)
     
     def process_touch_event(self, event : pygame.Event):
         if event.type == pygame.FINGERDOWN:
@@ -318,6 +366,7 @@ class Core:
         return platform.eval(code)
     
     def log(self, *args : list[Any], sep=' '):
+        if not self.LOGGING: return
         print(sep.join(str(arg) for arg in args))
         if self.is_web():
             self.log_to_js_console(sep.join(args))
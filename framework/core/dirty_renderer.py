@@ -0,0 +1,108 @@
+import pygame
+from typing import Any, Iterable, TypeAlias
+from framework.game.sprite import Sprite
+from framework.utils.ui.ui_sprite import UiSprite
+from framework.utils.ui.ui_sprite_group import UiSpriteGroup
+
+DrawState : TypeAlias = tuple[tuple[int, int, int, int], pygame.Surface, int|None]
+#screen rect, surface drawn, alpha of the surface (or any value that changes when the drawing does)
+
+class DirtyRectRenderer:
+    '''Tracks what changed on the display between frames, so only those areas get redrawn and pushed by display.update.
+    Every frame, get_dirty_rects is given the elements about to be drawn. An element is damaged when its rect, its surface
+    or the alpha of its surface changed, or when it is marked dirty (see UiSprite.mark_dirty); both its old and its new rect
+    get redrawn. Elements other than sprites and UI sprites provide their own get_draw_state method.
+    Areas drawn outside of elements can be added to Core.dirty_display_rects.
+    When the damage covers more than full_redraw_ratio of the display, or splits into more than max_rects rects,
+    the whole display is redrawn instead.'''
+    MERGE_MARGIN : int = 8
+    def __init__(self, full_redraw_ratio : float = 0.5, max_rects : int = 16) -> None:
+        self.full_redraw_ratio : float = full_redraw_ratio
+        self.max_rects : int = max_rects
+        self.previous : dict[Any, DrawState] = {}
+        self.full_redraw : bool = True
+        self.last_dirty_area : float = 1.0
+
+    def invalidate(self):
+        '''Redraws the whole display next frame.'''
+        self.full_redraw = True
+
+    @staticmethod
+    def get_draw_state(element : Sprite|UiSprite|Any) -> DrawState|None:
+        '''None if the element draws nothing. The rect is the area the surface covers once blitted at the topleft
+        of the element rect, which is not always the size of the element rect.'''
+        if isinstance(element, Sprite):
+            if element.current_camera is True or element.image is None or getattr(element, 'visible', True) is False: return None
+            surface : pygame.Surface = element.image
+            topleft : tuple[int, int] = element.rect.topleft
+            camera = element.current_camera
+            if camera:
+                if camera.zoom != 1.0 or camera.rotation != 0.0:
+                    return ((-10**6, -10**6, 2 * 10**6, 2 * 10**6), surface, surface.get_alpha())
+                #The camera offsets the position before the rect is rounded, so the rect is padded by a pixel
+                offset_rect : pygame.Rect = surface.get_rect(topleft=topleft).move(-round(camera.offset.x), -round(camera.offset.y))
+                return (tuple(offset_rect.inflate(2, 2)), surface, surface.get_alpha())
+        elif isinstance(element, UiSprite):
+            if not element.visible or element.surf is None: return None
+            surface = element.surf
+            topleft = element.rect.topleft
+        else:
+            return element.get_draw_state()
+        return ((*topleft, *surface.get_size()), surface, surface.get_alpha())
+
+    def get_dirty_rects(self, display : pygame.Surface, elements : Iterable[Sprite|UiSprite|UiSpriteGroup|Any],
+                        extra_rects : list[pygame.Rect]|None = None) -> list[pygame.Rect]:
+        '''Returns the areas of display to redraw and update this frame. Consumes extra_rects.'''
+        screen_rect : pygame.Rect = display.get_rect()
+        damage : list[pygame.Rect] = []
+        if extra_rects:
+            damage += extra_rects
+            extra_rects.clear()
+        current : dict[Any, DrawState] = {}
+        for element in self._flatten(elements):
+            state : DrawState|None = self.get_draw_state(element)
+            if state is None: continue
+            current[element] = state
+            previous_state : DrawState|None = self.previous.get(element)
+            if previous_state != state or getattr(element, 'dirty', False):
+                damage.append(pygame.Rect(state[0]))
+                if previous_state is not None: damage.append(pygame.Rect(previous_state[0]))
+            if isinstance(element, UiSprite): element.dirty = False
+        for element, previous_state in self.previous.items():
+            if element not in current: damage.append(pygame.Rect(previous_state[0]))
+        self.previous = current
+
+        if self.full_redraw:
+            self.full_redraw = False
+            return self._full(screen_rect)
+        rects : list[pygame.Rect] = self.merge_rects([rect.clip(screen_rect) for rect in damage if rect.colliderect(screen_rect)])
+        self.last_dirty_area = sum(rect.width * rect.height for rect in rects) / (screen_rect.width * screen_rect.height)
+        if len(rects) > self.max_rects or self.last_dirty_area > self.full_redraw_ratio:
+            return self._full(screen_rect)
+        return rects
+
+    def _full(self, screen_rect : pygame.Rect) -> list[pygame.Rect]:
+        self.last_dirty_area = 1.0
+        return [screen_rect]
+
+    @staticmethod
+    def _flatten(elements : Iterable[Sprite|UiSprite|UiSpriteGroup]) -> Iterable[Sprite|UiSprite]:
+        for element in elements:
+            if isinstance(element, UiSpriteGroup):
+                yield from element.elements
+            else:
+                yield element
+
+    @classmethod
+    def merge_rects(cls, rects : list[pygame.Rect]) -> list[pygame.Rect]:
+        '''Unions rects that overlap or are within MERGE_MARGIN of each other, until none do.'''
+        merged : list[pygame.Rect] = []
+        for rect in sorted(rects, key=lambda rect : rect.width * rect.height, reverse=True):
+            if not rect.width or not rect.height: continue
+            rect = rect.copy()
+            while True:
+                index : int = rect.inflate(cls.MERGE_MARGIN, cls.MERGE_MARGIN).collidelist(merged)
+                if index < 0: break
+                rect.union_ip(merged.pop(index))
+            merged.append(rect)
+        return merged
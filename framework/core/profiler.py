@@ -0,0 +1,129 @@
+import pygame
+from time import perf_counter
+from collections import deque
+
+class Profiler:
+    '''Times the stages of the main loop and the update of every registered sprite class, keeping the last history frames
+    of each in ring buffers. Does nothing while disabled. Toggled in game with TOGGLE_KEY.'''
+    TOGGLE_KEY : int = pygame.K_F3
+    STAGE_COLORS : list[tuple[int, int, int]] = [(230, 80, 80), (240, 170, 60), (230, 230, 80), (110, 220, 110),
+                                                (80, 200, 230), (110, 120, 240), (200, 110, 230), (200, 200, 200)]
+    def __init__(self, history : int = 240) -> None:
+        self.enabled : bool = False
+        self.history : int = history
+        self.stages : dict[str, deque[float]] = {}
+        self.sprite_classes : dict[str, deque[float]] = {}
+        self.current_stages : dict[str, float] = {}
+        self.current_sprite_classes : dict[str, float] = {}
+        self.frame_budget : float = 1000 / 60
+        self.refresh_interval : int = 15
+        self.max_sprite_rows : int = 8
+        self.font : pygame.Font|None = None
+        self._panel : pygame.Surface|None = None
+        self._frames_since_refresh : int = 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.reset()
+
+    def reset(self):
+        self.stages.clear()
+        self.sprite_classes.clear()
+        self.current_stages.clear()
+        self.current_sprite_classes.clear()
+        self._panel = None
+
+    def handle_key_event(self, event : pygame.Event):
+        if event.type == pygame.KEYDOWN and event.key == self.TOGGLE_KEY:
+            self.toggle()
+
+    def begin_frame(self) -> float:
+        '''Returns the time mark to pass to the first lap of the frame.'''
+        return perf_counter()
+
+    def lap(self, name : str, mark : float) -> float:
+        '''Adds the time since mark to the stage name of the current frame and returns a new mark.'''
+        now : float = perf_counter()
+        if self.enabled:
+            self.current_stages[name] = self.current_stages.get(name, 0) + (now - mark) * 1000
+        return now
+
+    def add_sprite_class(self, name : str, seconds : float):
+        self.current_sprite_classes[name] = self.current_sprite_classes.get(name, 0) + seconds * 1000
+
+    def end_frame(self):
+        if not self.enabled: return
+        self._push(self.stages, self.current_stages)
+        self._push(self.sprite_classes, self.current_sprite_classes)
+        self._frames_since_refresh += 1
+
+    def _push(self, buffers : dict[str, deque[float]], current : dict[str, float]):
+        for name in current:
+            if name not in buffers:
+                buffers[name] = deque(maxlen=self.history)
+        for name, buffer in buffers.items():
+            buffer.append(current.get(name, 0))
+        current.clear()
+
+    @staticmethod
+    def get_average(buffer : deque[float]) -> float:
+        return sum(buffer) / len(buffer) if buffer else 0
+
+    def get_frame_times(self) -> list[float]:
+        '''The total time of every stored frame, oldest first.'''
+        if not self.stages: return []
+        return [sum(values) for values in zip(*self.stages.values())]
+
+    def draw(self, display : pygame.Surface):
+        if not self.enabled or not self.stages: return
+        if self._panel is None or self._frames_since_refresh >= self.refresh_interval:
+            self._panel = self._make_panel()
+            self._frames_since_refresh = 0
+        display.blit(self._panel, (display.get_width() - self._panel.get_width() - 10, 10))
+
+    def _make_panel(self) -> pygame.Surface:
+        if self.font is None:
+            self.font = pygame.font.Font(None, 18)
+        width : int = 300
+        row_height : int = 15
+        graph_height : int = 60
+        averages : list[tuple[str, float, float]] = [(name, self.get_average(buffer), max(buffer)) for name, buffer in self.stages.items()]
+        sprite_rows : list[tuple[str, float, float]] = sorted(((name, self.get_average(buffer), max(buffer)) for name, buffer in self.sprite_classes.items()),
+                                                              key=lambda row : row[1], reverse=True)[:self.max_sprite_rows]
+        row_count : int = len(averages) + len(sprite_rows) + 2
+        panel = pygame.Surface((width, graph_height + row_count * row_height + 12), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        budget : float = self.frame_budget
+        total : float = sum(row[1] for row in averages)
+
+        frame_times : list[float] = self.get_frame_times()
+        scale : float = graph_height / (budget * 2)
+        bar_width : float = width / self.history
+        for i, frame_time in enumerate(frame_times):
+            height : int = min(graph_height, round(frame_time * scale))
+            color = (110, 220, 110) if frame_time <= budget else (230, 80, 80)
+            pygame.draw.rect(panel, color, (round(i * bar_width), graph_height - height, max(1, round(bar_width)), height))
+        budget_y : int = graph_height - round(budget * scale)
+        pygame.draw.line(panel, 'White', (0, budget_y), (width, budget_y))
+
+        y : int = graph_height + 4
+        x : int = 0
+        for i, (name, average, _) in enumerate(averages):
+            segment : int = round(average / budget * width)
+            pygame.draw.rect(panel, self.STAGE_COLORS[i % len(self.STAGE_COLORS)], (x, y, segment, row_height - 4))
+            x += segment
+        pygame.draw.line(panel, 'White', (width - 1, y - 2), (width - 1, y + row_height - 2))
+        self._blit_row(panel, y + row_height, 'total', total, max(frame_times), 'White')
+        y += row_height * 2
+        for i, (name, average, peak) in enumerate(averages):
+            self._blit_row(panel, y, name, average, peak, self.STAGE_COLORS[i % len(self.STAGE_COLORS)])
+            y += row_height
+        for name, average, peak in sprite_rows:
+            self._blit_row(panel, y, '  ' + name, average, peak, (170, 170, 170))
+            y += row_height
+        return panel
+
+    def _blit_row(self, panel : pygame.Surface, y : int, name : str, average : float, peak : float, color):
+        percent : float = average / self.frame_budget * 100
+        panel.blit(self.font.render(name, True, color), (4, y))
+        panel.blit(self.font.render(f'{average:6.2f}ms {percent:4.0f}%  max {peak:6.2f}ms', True, color), (130, y))
@@ -2,6 +2,7 @@ import pygame
 from framework.utils.ui.ui_sprite import UiSprite
 from framework.utils.ui.base_ui_elements import BaseUiElements
 from framework.utils.my_timer import Timer
+from framework.utils.render_list import RenderList
 from typing import Callable
 
 class Ui:
@@ -10,6 +11,7 @@ class Ui:
         self.elements : list[UiSprite] = elements
         self.temp_elements : dict[UiSprite, Timer] = {}
         self.complete_list : list[UiSprite] = []
+        self.render_list : RenderList = RenderList()
     
     def get_sprite(self, name : str|None = None, tag : int|None = None) -> UiSprite|None:
         for element in self.complete_list:
@@ -34,9 +36,7 @@ class Ui:
         return return_list
 
     def render(self, display : pygame.Surface):
-        
-        self.complete_list.sort(key = lambda ui_sprite : ui_sprite.zindex)
-        for element in self.complete_list:
+        for element in self.render_list:
             element.draw(display)
         #print(self.complete_list, self.elements, self.temp_elements)
     
@@ -44,6 +44,7 @@ class Ui:
         if element not in self.elements or duplicate == True:
             self.elements.append(element)
             self.complete_list.append(element)
+            self.render_list.add(element)
     
     def add_multiple(self, elements : list[UiSprite], duplicate = False):
         for element in elements:
@@ -55,6 +56,7 @@ class Ui:
                 self.elements.remove(element)
                 if element in self.temp_elements: self.temp_elements.pop(element)
                 if element in self.complete_list: self.complete_list.remove(element)
+                if element not in self.complete_list: self.render_list.discard(element)
         else:
             to_del = []
             for sprite in self.elements:
@@ -63,17 +65,20 @@ class Ui:
                 self.elements.remove(item)
                 if item in self.temp_elements: self.temp_elements.pop(item)
                 if element in self.complete_list: self.complete_list.remove(item)
+            if element not in self.complete_list: self.render_list.discard(element)
     
     def clear_all(self):
         self.elements.clear()
         self.temp_elements.clear()
         self.complete_list.clear()
+        self.render_list.clear()
     
     def add_temp(self, element : UiSprite, time : float|Timer, override = False, time_source : Callable[[], float]|None = None, time_scale : float = 1):
         if element not in self.temp_elements or override == True:
             timer = time if type(time) == Timer else Timer(time, time_source, time_scale)
             self.temp_elements[element] = timer
             self.complete_list.append(element)
+            self.render_list.add(element)
     
     def update(self):
         to_del = []
@@ -82,6 +87,7 @@ class Ui:
         for item in to_del:
             self.temp_elements.pop(item)
             if item in self.complete_list: self.complete_list.remove(item)
+            if item not in self.complete_list: self.render_list.discard(item)
 
     
     
\ No newline at end of file
@@ -0,0 +1,89 @@
+from typing import Callable, Any
+from framework.game.spatial_hash import SpatialHash
+
+CollisionFilter = Callable[[Any], bool]
+PairFilter = Callable[[Any, Any], bool]
+CollisionCallback = Callable[[Any, Any], None]
+
+def default_collision_callback(element : Any, other : Any):
+    element.on_collision(other)
+
+class CollisionRule:
+    '''One cell of the collision matrix : every active element of group_a is tested against every active element of group_b.
+    Filters run before the narrowphase so pairs that would be ignored anyway never get a mask test.'''
+    def __init__(self, group_a : type, group_b : type, filter_a : CollisionFilter|None = None, filter_b : CollisionFilter|None = None,
+                 pair_filter : PairFilter|None = None, callback : CollisionCallback = default_collision_callback, use_mask : bool = True) -> None:
+        self.group_a : type = group_a
+        self.group_b : type = group_b
+        self.filter_a : CollisionFilter|None = filter_a
+        self.filter_b : CollisionFilter|None = filter_b
+        self.pair_filter : PairFilter|None = pair_filter
+        self.callback : CollisionCallback = callback
+        self.use_mask : bool = use_mask
+
+class CollisionMatrix:
+    '''Declarative list of collision rules processed together once per frame.
+    Each unordered pair of sprites goes through the narrowphase at most once per pass, even if several rules match it.'''
+    BRUTE_FORCE_LIMIT : int = 32
+    CELL_SIZE : int = 64
+
+    def __init__(self) -> None:
+        self.rules : list[CollisionRule] = []
+
+    def add_rule(self, rule : CollisionRule) -> CollisionRule:
+        self.rules.append(rule)
+        return rule
+
+    def remove_rule(self, rule : CollisionRule):
+        if rule in self.rules:
+            self.rules.remove(rule)
+
+    def clear(self):
+        self.rules.clear()
+
+    @staticmethod
+    def is_live(element : Any) -> bool:
+        return element._active and not element._zombie
+
+    def process(self):
+        '''Finds every colliding pair allowed by the rules and dispatches the rule callbacks, in rule order.'''
+        tested_pairs : dict[tuple[Any, Any, bool], bool] = {}
+        is_live : Callable[[Any], bool] = CollisionMatrix.is_live
+        for rule in self.rules:
+            elements_a : list[Any] = CollisionMatrix.get_elements(rule.group_a, rule.filter_a)
+            if not elements_a: continue
+            elements_b : list[Any] = [element for element in CollisionMatrix.get_elements(rule.group_b, rule.filter_b) if element.rect is not None]
+            if not elements_b: continue
+            get_candidates : Callable[[Any], list[Any]] = CollisionMatrix.get_candidate_finder(elements_b)
+            for element in elements_a:
+                if not is_live(element): continue
+                for other in get_candidates(element):
+                    if other is element or not is_live(other): continue
+                    if rule.pair_filter is not None and not rule.pair_filter(element, other): continue
+                    key : tuple[Any, Any, bool] = (element, other, rule.use_mask) if id(element) < id(other) else (other, element, rule.use_mask)
+                    result : bool|None = tested_pairs.get(key)
+                    if result is None:
+                        result = element.is_colliding(other) if rule.use_mask else element.is_collding_rect(other)
+                        tested_pairs[key] = result
+                    if not result: continue
+                    rule.callback(element, other)
+                    if not is_live(element): break
+
+    @staticmethod
+    def get_elements(group : type, element_filter : CollisionFilter|None) -> list[Any]:
+        '''The live elements of group that pass element_filter, each filtered once per rule.'''
+        is_live : Callable[[Any], bool] = CollisionMatrix.is_live
+        if element_filter is None:
+            return [element for element in group.active_elements if is_live(element)]
+        return [element for element in group.active_elements if is_live(element) and element_filter(element)]
+
+    @staticmethod
+    def get_candidate_finder(elements_b : list[Any]) -> Callable[[Any], list[Any]]:
+        '''Broadphase over the already filtered side of a rule : a rect test against every element when there are few of them,
+        a spatial hash built from them only otherwise. Rects are current here, so the hash needs no padding.'''
+        if len(elements_b) <= CollisionMatrix.BRUTE_FORCE_LIMIT:
+            rects : list[Any] = [element.rect for element in elements_b]
+            return lambda element : [elements_b[index] for index in element.rect.collidelistall(rects)]
+        spatial_hash : SpatialHash = SpatialHash(CollisionMatrix.CELL_SIZE, 0)
+        spatial_hash.rebuild(elements_b)
+        return lambda element : spatial_hash.query(element.rect)
@@ -12,21 +12,23 @@ from framework.utils.ui.base_ui_elements import BaseUiElements
 import framework.utils.interpolation as interpolation
 from framework.utils.my_timer import Timer
 from framework.game.sprite import Sprite
+from framework.core.asset_manager import asset_manager
 from framework.utils.helpers import average, random_float
 from framework.utils.ui.brightness_overlay import BrightnessOverlay
 from framework.game.sprite_renderer import SpriteCamera
+from framework.game.scrolling_layer import ScrollingLayer
 from src.game_states import GameState, GameStates, initialise_game
 import framework.utils.particle_effects
 
 class Game:
-    font_20 = pygame.Font('assets/fonts/Pixeltype.ttf', 20)
-    font_25 = pygame.Font('assets/fonts/Pixeltype.ttf', 25)
-    font_28 = pygame.Font('assets/fonts/Pixeltype.ttf', 28)
-    font_30 = pygame.Font('assets/fonts/Pixeltype.ttf', 30)
-    font_40 = pygame.Font('assets/fonts/Pixeltype.ttf', 40)
-    font_50 = pygame.Font('assets/fonts/Pixeltype.ttf', 50)
-    font_60 = pygame.Font('assets/fonts/Pixeltype.ttf', 60)
-    font_70 = pygame.Font('assets/fonts/Pixeltype.ttf', 70)
+    font_20 = asset_manager.add_font('pixeltype_20', 'assets/fonts/Pixeltype.ttf', 20)
+    font_25 = asset_manager.add_font('pixeltype_25', 'assets/fonts/Pixeltype.ttf', 25)
+    font_28 = asset_manager.add_font('pixeltype_28', 'assets/fonts/Pixeltype.ttf', 28)
+    font_30 = asset_manager.add_font('pixeltype_30', 'assets/fonts/Pixeltype.ttf', 30)
+    font_40 = asset_manager.add_font('pixeltype_40', 'assets/fonts/Pixeltype.ttf', 40)
+    font_50 = asset_manager.add_font('pixeltype_50', 'assets/fonts/Pixeltype.ttf', 50)
+    font_60 = asset_manager.add_font('pixeltype_60', 'assets/fonts/Pixeltype.ttf', 60)
+    font_70 = asset_manager.add_font('pixeltype_70', 'assets/fonts/Pixeltype.ttf', 70)
     
     def __init__(self) -> None:
         self.STATES = GameStates
@@ -44,6 +46,7 @@ class Game:
         self.game_data = {}
         self.main_camera : SpriteCamera = SpriteCamera()
         self.make_connections()
+        asset_manager.enter_scene('game')
         initialise_game(self, event)
 
         
@@ -126,10 +129,13 @@ class Game:
         self.game_timer = None
         self.main_camera = None
         self.game_data.clear()
+        asset_manager.exit_scene('game')
 
         #Cleanup ingame object
         Sprite.kill_all_sprites()
+        ScrollingLayer.stop_all()
         framework.utils.particle_effects.ParticleEffect.elements.clear()
+        framework.utils.particle_effects.ParticleBatch.clear_all()
         core_object.main_ui.clear_all()
 
         #Clear game varaibles
@@ -0,0 +1,78 @@
+import pygame
+from typing import Any
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def is_available() -> bool:
+    return np is not None
+
+class KinematicsBatch:
+    '''Structure-of-arrays storage for the positions, velocities, accelerations and drags of a sprite pool.
+    step integrates every attached element at once with the same velocity-verlet-with-drag scheme the sprites use on their own.
+    Requires numpy; check is_available() first.'''
+    def __init__(self, capacity : int) -> None:
+        self.capacity : int = capacity
+        self.position = np.zeros((capacity, 2), dtype=np.float64)
+        self.velocity = np.zeros((capacity, 2), dtype=np.float64)
+        self.acceleration = np.zeros((capacity, 2), dtype=np.float64)
+        self.drag = np.zeros(capacity, dtype=np.float64)
+        self.extent = np.zeros(capacity, dtype=np.float64)
+        self.used = np.zeros(capacity, dtype=np.bool_)
+        self.elements : list[Any|None] = [None] * capacity
+        self.free_slots : list[int] = list(range(capacity - 1, -1, -1))
+
+    def __len__(self) -> int:
+        return self.capacity - len(self.free_slots)
+
+    def grow(self, extra : int):
+        new_capacity : int = self.capacity + extra
+        for name in ('position', 'velocity', 'acceleration', 'drag', 'extent', 'used'):
+            old = getattr(self, name)
+            new = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.capacity] = old
+            setattr(self, name, new)
+        self.elements.extend([None] * extra)
+        self.free_slots = list(range(new_capacity - 1, self.capacity - 1, -1)) + self.free_slots
+        self.capacity = new_capacity
+
+    def attach(self, element : Any, position : pygame.Vector2, velocity : pygame.Vector2, acceleration : pygame.Vector2,
+               drag : float, extent : float) -> int:
+        '''Takes a slot for element and returns its index. extent is the distance from the position to the farthest edge of the element.'''
+        if not self.free_slots:
+            self.grow(max(16, self.capacity // 2))
+        slot : int = self.free_slots.pop()
+        self.position[slot] = position
+        self.velocity[slot] = velocity
+        self.acceleration[slot] = acceleration
+        self.drag[slot] = drag
+        self.extent[slot] = extent
+        self.used[slot] = True
+        self.elements[slot] = element
+        return slot
+
+    def detach(self, slot : int):
+        self.used[slot] = False
+        self.elements[slot] = None
+        self.free_slots.append(slot)
+
+    def step(self, delta : float):
+        slots = np.flatnonzero(self.used)
+        if not len(slots): return slots
+        drag_factor = (((1 - self.drag[slots]) ** delta) ** 0.5)[:, None]
+        half_accel = self.acceleration[slots] * (0.5 * delta)
+        velocity = self.velocity[slots] * drag_factor
+        velocity += half_accel
+        self.position[slots] += velocity * delta
+        velocity += half_accel
+        velocity *= drag_factor
+        self.velocity[slots] = velocity
+        return slots
+
+    def get_onscreen(self, slots, bounds : pygame.Rect):
+        '''Returns, for each slot, whether the element may still overlap bounds. Uses extent, so it errs on the side of onscreen.'''
+        position = self.position[slots]
+        extent = self.extent[slots]
+        return ((position[:, 0] + extent > bounds.left) & (position[:, 0] - extent < bounds.right) &
+                (position[:, 1] + extent > bounds.top) & (position[:, 1] - extent < bounds.bottom))
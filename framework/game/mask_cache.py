@@ -0,0 +1,23 @@
+import pygame
+from weakref import WeakKeyDictionary
+
+_masks : WeakKeyDictionary[pygame.Surface, pygame.Mask] = WeakKeyDictionary()
+
+def get_mask(surface : pygame.Surface) -> pygame.Mask:
+    '''Returns the mask of surface, creating it the first time the surface is seen.
+    Masks are shared between every sprite using the same surface, so they must not be modified.
+    An entry lives as long as its surface does. Call forget_mask if a surface is drawn on after its mask was made.'''
+    mask : pygame.Mask|None = _masks.get(surface)
+    if mask is None:
+        mask = pygame.mask.from_surface(surface)
+        _masks[surface] = mask
+    return mask
+
+def forget_mask(surface : pygame.Surface):
+    _masks.pop(surface, None)
+
+def clear():
+    _masks.clear()
+
+def get_cached_count() -> int:
+    return len(_masks)
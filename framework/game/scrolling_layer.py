@@ -0,0 +1,100 @@
+import pygame
+from math import ceil
+from framework.game.sprite import Sprite
+from framework.game.sprite_renderer import SpriteCamera
+from framework.utils.render_list import RenderList
+from framework.core.dirty_renderer import DrawState
+
+class ScrollingLayer:
+    '''An endless, vertically scrolling layer, such as a background, without any sprite behind it.
+    The tile is composed once into an opaque strip at least as tall as the display, so each frame is drawn
+    with at most two blits of that strip, whatever the scroll. Started layers are drawn by Sprite.render_list,
+    ordered by zindex like sprites, and only follow the offset of their camera.'''
+    active_layers : list['ScrollingLayer'] = []
+    render_alpha : float = 1.0
+
+    def __init__(self, tile : pygame.Surface, display_size : tuple[int, int], speed : float,
+                 fill_color : tuple[int, int, int], zindex : int = -1000) -> None:
+        self.strip : pygame.Surface = self.compose_strip(tile, display_size, fill_color)
+        self.display_size : tuple[int, int] = display_size
+        self.speed : float = speed
+        self.scroll : float = 0
+        self.previous_scroll : float = 0
+        self.zindex : int = zindex
+        self.camera : SpriteCamera|None = None
+        self._render_lists : list[RenderList] = []
+
+    @staticmethod
+    def compose_strip(tile : pygame.Surface, display_size : tuple[int, int], fill_color : tuple[int, int, int]) -> pygame.Surface:
+        '''Stacks the tile, centered horizontally over fill_color, until it covers the display height.'''
+        width, height = display_size
+        tile_count : int = max(1, ceil(height / tile.get_height()))
+        strip : pygame.Surface = pygame.Surface((width, tile.get_height() * tile_count)).convert()
+        strip.fill(fill_color)
+        tile_x : int = width // 2 - tile.get_width() // 2
+        strip.blits([(tile, (tile_x, tile.get_height() * i)) for i in range(tile_count)], doreturn=False)
+        return strip
+
+    def start(self):
+        if self in ScrollingLayer.active_layers: return
+        ScrollingLayer.active_layers.append(self)
+        Sprite.render_list.add(self)
+
+    def stop(self):
+        if self not in ScrollingLayer.active_layers: return
+        ScrollingLayer.active_layers.remove(self)
+        Sprite.render_list.discard(self)
+
+    def update(self, delta : float):
+        self.scroll += self.speed * delta
+        height : int = self.strip.get_height()
+        if self.scroll >= height:
+            self.scroll -= height
+            self.previous_scroll -= height
+
+    def get_screen_top(self) -> int:
+        '''Where the top of the strip lands on the display this frame.'''
+        scroll : float = self.previous_scroll + (self.scroll - self.previous_scroll) * ScrollingLayer.render_alpha
+        if self.camera: scroll -= self.camera.offset.y
+        return int(scroll) % self.strip.get_height()
+
+    def get_screen_left(self) -> int:
+        return -round(self.camera.offset.x) if self.camera else 0
+
+    def get_draw_state(self) -> DrawState:
+        '''For DirtyRectRenderer : any scroll damages the whole layer.'''
+        return ((self.get_screen_left(), 0, self.strip.get_width(), self.display_size[1]), self.strip, self.get_screen_top())
+
+    def draw(self, display : pygame.Surface):
+        top : int = self.get_screen_top()
+        left : int = self.get_screen_left()
+        width, height = self.strip.get_size()
+        if top > 0:
+            display.blit(self.strip, (left, 0), (0, height - top, width, top))
+        if top < self.display_size[1]:
+            display.blit(self.strip, (left, top), (0, 0, width, self.display_size[1] - top))
+
+    @classmethod
+    def update_all(cls, delta : float):
+        for layer in cls.active_layers:
+            layer.update(delta)
+
+    @classmethod
+    def store_previous_scrolls(cls):
+        '''Same as Sprite.store_previous_centers, for layers.'''
+        for layer in cls.active_layers:
+            layer.previous_scroll = layer.scroll
+
+    @classmethod
+    def interpolate(cls, alpha : float):
+        '''Draws layers between their previous and current scroll until restore is called.'''
+        cls.render_alpha = alpha
+
+    @classmethod
+    def restore(cls):
+        cls.render_alpha = 1.0
+
+    @classmethod
+    def stop_all(cls):
+        for layer in cls.active_layers[:]:
+            layer.stop()
@@ -0,0 +1,48 @@
+import pygame
+from typing import Iterable, Any
+
+class SpatialHash:
+    '''Uniform grid that buckets sprites by the cells their rect overlaps.
+    Queries are padded so sprites that moved less than padding pixels since they were inserted are still found.'''
+    def __init__(self, cell_size : int = 64, padding : int = 32) -> None:
+        self.cell_size : int = cell_size
+        self.padding : int = padding
+        self.cells : dict[tuple[int, int], list[Any]] = {}
+
+    def get_cell_range(self, rect : pygame.Rect, padding : int = 0) -> tuple[int, int, int, int]:
+        size : int = self.cell_size
+        return ((rect.left - padding) // size, (rect.top - padding) // size,
+                (rect.right + padding - 1) // size, (rect.bottom + padding - 1) // size)
+
+    def clear(self):
+        self.cells.clear()
+
+    def insert(self, element : Any, rect : pygame.Rect):
+        left, top, right, bottom = self.get_cell_range(rect)
+        cells : dict[tuple[int, int], list[Any]] = self.cells
+        for x in range(left, right + 1):
+            for y in range(top, bottom + 1):
+                cell : list[Any]|None = cells.get((x, y))
+                if cell is None:
+                    cells[(x, y)] = [element]
+                else:
+                    cell.append(element)
+
+    def rebuild(self, elements : Iterable[Any]):
+        '''Clears the grid and inserts every element that currently has a rect.'''
+        self.cells.clear()
+        for element in elements:
+            if element.rect is None: continue
+            self.insert(element, element.rect)
+
+    def query(self, rect : pygame.Rect) -> list[Any]:
+        '''Returns every element sharing a cell with rect (grown by padding), without duplicates. Elements may be stale.'''
+        left, top, right, bottom = self.get_cell_range(rect, self.padding)
+        cells : dict[tuple[int, int], list[Any]] = self.cells
+        found : dict[Any, None] = {}
+        for x in range(left, right + 1):
+            for y in range(top, bottom + 1):
+                cell : list[Any]|None = cells.get((x, y))
+                if cell is not None:
+                    found.update(dict.fromkeys(cell))
+        return list(found)
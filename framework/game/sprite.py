@@ -1,19 +1,42 @@
 import pygame
 from framework.utils.animation import AnimationTrack, Animation
-from typing import Any
+from typing import Any, Callable
 from framework.utils.helpers import is_sorted
 from framework.utils.pivot_2d import Pivot2D
 from framework.game.sprite_renderer import SpriteCamera
+from framework.game.sprite_pool import SpritePool
+from framework.game.spatial_hash import SpatialHash
+from framework.game.collision_matrix import CollisionMatrix
+import framework.game.mask_cache as mask_cache
+from framework.utils.render_list import RenderList
 from inspect import isclass
+from time import perf_counter
+from math import ceil
 
 class Sprite:
     '''Base class for all game objects.'''
-    active_elements : list['Sprite'] = []
-    inactive_elements : list['Sprite']  = []
+    active_elements : list['Sprite'] = SpritePool()
+    inactive_elements : list['Sprite']  = SpritePool()
     linked_classes : list['Sprite'] = []
 
     ordered_sprites : list['Sprite'] = []
     registered_classes : list['Sprite'] = []
+    spatial_hashes : dict[type['Sprite'], SpatialHash] = {}
+    spatial_hash_speeds : dict[type['Sprite'], float] = {}
+    collision_matrix : CollisionMatrix = CollisionMatrix()
+    render_list : RenderList = RenderList()
+    batch_classes : list[type['Sprite']] = []
+    INTERPOLATION_SNAP_DISTANCE : int = 100
+    _interpolated : list[tuple['Sprite', tuple[int, int]]] = []
+    _profiled_names : dict[type['Sprite'], str] = {}
+    clickable : bool = False
+    clickable_elements : list['Sprite'] = SpritePool()
+    clickable_hash : SpatialHash = SpatialHash(128, 0)
+    _clickable_hash_dirty : bool = True
+    POOL_GROWTH_CHUNK : int = 16
+    pool_targets : dict[type['Sprite'], int] = {}
+    pool_high_water : dict[type['Sprite'], int] = {}
+    pool_growths : dict[type['Sprite'], int] = {}
     SPRITE_CLICKED : int = pygame.event.custom_type()
     
     def __init__(self) -> None:
@@ -22,12 +45,22 @@ class Sprite:
         self.current_camera : bool|SpriteCamera = False
         self._image : pygame.Surface
         self.rect : pygame.Rect
-        self.mask : pygame.Mask
+        self._mask : pygame.Mask|None = None
+        self._mask_surface : pygame.Surface|None = None
         self.dynamic_mask : bool = False
-        self.zindex : int
+        self._zindex : int|None = None
+        self._render_lists : list[RenderList] = []
         self.animation_tracks : dict[str, AnimationTrack]
         Sprite.inactive_elements.append(self)
         self._zombie : bool = False
+        self._active : bool = False
+        self._previous_center : tuple[int, int]|None = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for pool_name in ('active_elements', 'inactive_elements'):
+            if pool_name in cls.__dict__ and not isinstance(cls.__dict__[pool_name], SpritePool):
+                setattr(cls, pool_name, SpritePool(cls.__dict__[pool_name]))
     
     @property
     def image(self) -> pygame.Surface:
@@ -36,11 +69,35 @@ class Sprite:
     @image.setter
     def image(self, new_surf : pygame.Surface):
         self._image = new_surf
-        if self.dynamic_mask:
-            if new_surf is None:
-                self.mask = None
-            else:
-                self.mask = pygame.mask.from_surface(new_surf)
+        if self.dynamic_mask and new_surf is not self._mask_surface:
+            self._mask = None
+            self._mask_surface = new_surf
+
+    @property
+    def zindex(self) -> int|None:
+        return self._zindex
+
+    @zindex.setter
+    def zindex(self, new_val : int|None):
+        self._zindex = new_val
+        for render_list in self._render_lists:
+            render_list.refresh(self)
+
+    @property
+    def mask(self) -> pygame.Mask|None:
+        if self._mask is None and self._mask_surface is not None:
+            self._mask = mask_cache.get_mask(self._mask_surface)
+        return self._mask
+
+    @mask.setter
+    def mask(self, new_mask : pygame.Mask|None):
+        self._mask = new_mask
+        self._mask_surface = None
+
+    def use_image_mask(self):
+        '''Makes the mask follow the current image. The mask is only fetched from the shared cache on the first collision query.'''
+        self._mask = None
+        self._mask_surface = self._image
     
     def align_rect(self):
         self.rect.center = round(self.true_position)
@@ -107,31 +164,71 @@ class Sprite:
     def register_class(cls, class_to_register : 'Sprite'):
         if class_to_register not in cls.registered_classes:
             cls.registered_classes.append(class_to_register)
+
+    @classmethod
+    def enable_spatial_hash(cls, cell_size : int = 64, max_speed : float = 16):
+        '''Makes collision queries against this class go through a uniform grid rebuilt once per frame.
+        max_speed is the fastest an element of this class moves, in pixels per 60 fps frame. Queries are padded by the
+        distance it covers in the step being taken, so a long step only makes the queries wider.'''
+        Sprite.spatial_hashes[cls] = SpatialHash(cell_size, ceil(max_speed))
+        Sprite.spatial_hash_speeds[cls] = max_speed
+        Sprite.spatial_hashes[cls].rebuild(cls.active_elements)
+
+    @classmethod
+    def disable_spatial_hash(cls):
+        Sprite.spatial_hashes.pop(cls, None)
+        Sprite.spatial_hash_speeds.pop(cls, None)
+
+    @staticmethod
+    def rebuild_spatial_hashes(delta : float = 1):
+        '''Pads each grid by how far its elements can move during a step of delta.'''
+        for sprite_class, spatial_hash in Sprite.spatial_hashes.items():
+            spatial_hash.padding = ceil(Sprite.spatial_hash_speeds[sprite_class] * max(delta, 1))
+            spatial_hash.rebuild(sprite_class.active_elements)
     
     @property
-    def active(self):
-        return (self in self.__class__.active_elements) or (self in Sprite.active_elements)
+    def active(self) -> bool:
+        return self._active
 
     @classmethod
     def pool(cls, element):
         '''Transfers an element from active to inactive state. Nothing changes if the element is already inactive.'''
-
         for linked_class in cls.linked_classes + [cls]:
-            if element in linked_class.active_elements:
-                linked_class.active_elements.remove(element)         
-            
-            if element not in linked_class.inactive_elements:
-                linked_class.inactive_elements.append(element)
+            linked_class.active_elements.discard(element)
+            linked_class.inactive_elements.append(element)
+        Sprite.render_list.discard(element)
+        if element in Sprite.clickable_elements:
+            Sprite.clickable_elements.discard(element)
+            Sprite._clickable_hash_dirty = True
+        element._active = False
     
     @classmethod
     def unpool(cls, element):
         '''Transfers an element from inactive to active state. Nothing changes if the element is already active.'''
         for linked_class in cls.linked_classes + [cls]:
-            if element not in linked_class.active_elements:
-                linked_class.active_elements.append(element)
+            linked_class.active_elements.append(element)
+            linked_class.inactive_elements.discard(element)
+            if linked_class in Sprite.spatial_hashes and element.rect is not None:
+                Sprite.spatial_hashes[linked_class].insert(element, element.rect)
+        Sprite.render_list.add(element)
+        active_count : int = len(cls.active_elements)
+        if active_count > Sprite.pool_high_water.get(cls, 0):
+            Sprite.pool_high_water[cls] = active_count
+        if element.clickable:
+            Sprite.clickable_elements.append(element)
+            Sprite._clickable_hash_dirty = True
+        element._previous_center = None
+        element._active = True
 
-            if element in linked_class.inactive_elements:
-                linked_class.inactive_elements.remove(element)
+    def set_clickable(self, value : bool):
+        '''Overrides the class-level clickable flag for this element. Only clickable sprites can be hit by clicks and taps.'''
+        self.clickable = value
+        if not self._active: return
+        if value:
+            Sprite.clickable_elements.append(self)
+        else:
+            Sprite.clickable_elements.discard(self)
+        Sprite._clickable_hash_dirty = True
 
 
     
@@ -149,6 +246,67 @@ class Sprite:
             cls.pool(element)
 
 
+    @classmethod
+    def get_pool_size(cls) -> int:
+        return len(cls.active_elements) + len(cls.inactive_elements)
+
+    @classmethod
+    def configure_pool(cls, target_size : int, growth_chunk : int|None = None):
+        '''Creates elements until the class has target_size of them. shrink_pools trims the class back to target_size.
+        growth_chunk is how many elements are created at once when the pool runs out.'''
+        Sprite.pool_targets[cls] = target_size
+        if growth_chunk is not None:
+            cls.POOL_GROWTH_CHUNK = growth_chunk
+        cls.grow_pool(target_size - cls.get_pool_size())
+
+    @classmethod
+    def grow_pool(cls, count : int):
+        for _ in range(count):
+            cls()
+
+    @classmethod
+    def get_inactive(cls) -> 'Sprite':
+        '''Returns the next element to spawn, growing the pool by POOL_GROWTH_CHUNK elements if every element is in use.'''
+        if not cls.inactive_elements:
+            Sprite.pool_targets.setdefault(cls, cls.get_pool_size())
+            Sprite.pool_growths[cls] = Sprite.pool_growths.get(cls, 0) + 1
+            cls.grow_pool(max(1, cls.POOL_GROWTH_CHUNK))
+        return cls.inactive_elements[0]
+
+    @staticmethod
+    def shrink_pools(max_removals : int|None = None) -> int:
+        '''Drops inactive elements of classes that grew past their target size. Returns how many were dropped.
+        max_removals spreads the work over several calls, for use during quiet periods.'''
+        removed : int = 0
+        for sprite_class, target in Sprite.pool_targets.items():
+            excess : int = min(sprite_class.get_pool_size() - target, len(sprite_class.inactive_elements))
+            while excess > 0:
+                if max_removals is not None and removed >= max_removals: return removed
+                element : Sprite = sprite_class.inactive_elements[-1]
+                for linked_class in sprite_class.linked_classes + [sprite_class]:
+                    linked_class.inactive_elements.discard(element)
+                excess -= 1
+                removed += 1
+        return removed
+
+    @staticmethod
+    def get_pool_telemetry() -> dict[str, dict[str, int]]:
+        '''Size, target, high-water mark and number of growths of every pool that has been used, keyed by class name.'''
+        telemetry : dict[str, dict[str, int]] = {}
+        for sprite_class in {**Sprite.pool_targets, **Sprite.pool_high_water}:
+            telemetry[sprite_class.__name__] = {
+                'size' : sprite_class.get_pool_size(),
+                'target' : Sprite.pool_targets.get(sprite_class, sprite_class.get_pool_size()),
+                'high_water' : Sprite.pool_high_water.get(sprite_class, 0),
+                'growths' : Sprite.pool_growths.get(sprite_class, 0),
+            }
+        return telemetry
+
+    @staticmethod
+    def reset_pool_telemetry():
+        Sprite.pool_high_water.clear()
+        Sprite.pool_growths.clear()
+
     @classmethod
     def spawn(cls):
         pass
@@ -198,6 +356,16 @@ class Sprite:
     def update_class(cls, delta : float):
         pass
 
+    @classmethod
+    def update_batch(cls, delta : float):
+        '''Called once per frame for classes in Sprite.batch_classes, before any sprite is updated.'''
+        pass
+
+    @classmethod
+    def register_batch_class(cls, class_to_register : type['Sprite']):
+        if class_to_register not in cls.batch_classes:
+            cls.batch_classes.append(class_to_register)
+
     def self_destruct(self):
         cls = self.__class__
         cls.pool(self)
@@ -221,16 +389,57 @@ class Sprite:
     
     @classmethod
     def update_all_sprites(cls, delta : float):
+        Sprite._clickable_hash_dirty = True
+        profiled : bool = core_object.profiler.enabled
+        lap : Callable[[type['Sprite']|str, float], float] = Sprite._profiler_lap if profiled else Sprite._no_lap
+        mark : float = perf_counter()
+        Sprite.rebuild_spatial_hashes(delta)
+        mark = lap('spatial hashes', mark)
+        for sprite_class in Sprite.batch_classes:
+            sprite_class.update_batch(delta)
+            mark = lap(sprite_class, mark)
         element : Sprite
-        for element in Sprite.active_elements:
-            element.update(delta)
+        if profiled:
+            for element in Sprite.active_elements:
+                element.update(delta)
+                mark = lap(type(element), mark)
+        else:
+            for element in Sprite.active_elements:
+                element.update(delta)
+        Sprite.collision_matrix.process()
         Sprite.clear_zombies(Sprite.active_elements)
-    
+        lap('collisions', mark)
+
+    @staticmethod
+    def _profiler_lap(key : type['Sprite']|str, mark : float) -> float:
+        '''Reports the time since mark to the profiler, under key or the registered class it derives from. Returns the new mark.'''
+        now : float = perf_counter()
+        core_object.profiler.add_sprite_class(key if isinstance(key, str) else Sprite._get_profiled_name(key), now - mark)
+        return now
+
+    @staticmethod
+    def _no_lap(key : type['Sprite']|str, mark : float) -> float:
+        '''Stands in for _profiler_lap around the per-class and per-frame steps while the profiler is off.
+        The per-sprite loop skips laps entirely instead.'''
+        return mark
+
+    @staticmethod
+    def _get_profiled_name(sprite_class : type['Sprite']) -> str:
+        '''The name of the closest registered class sprite_class derives from.'''
+        name : str|None = Sprite._profiled_names.get(sprite_class)
+        if name is None:
+            registered : list[type] = [base for base in sprite_class.__mro__ if base in Sprite.registered_classes]
+            name = Sprite._profiled_names[sprite_class] = (registered[0] if registered else sprite_class).__name__
+        return name
+
     @classmethod
     def update_all_registered_classes(cls, delta : float):
+        lap : Callable[[type['Sprite']|str, float], float] = Sprite._profiler_lap if core_object.profiler.enabled else Sprite._no_lap
+        mark : float = perf_counter()
         sprite_subclass : Sprite
         for sprite_subclass in Sprite.registered_classes:
             sprite_subclass.update_class(delta)
+            mark = lap(sprite_subclass.__name__, mark)
     
     def play_animation(self, animation : Animation, time_scale = 1):
         track = animation.load(self)
@@ -264,13 +473,13 @@ class Sprite:
        return self.position.x
     @x.setter
     def x(self, value):
-        self.position.x = value
+        self.position = pygame.Vector2(value, self.position.y)
     @property
     def y(self):
         return self.position.y
     @y.setter
     def y(self, value):
-        self.position.y = value
+        self.position = pygame.Vector2(self.position.x, value)
 
 
     def is_colliding(self, other : 'Sprite'):
@@ -283,68 +492,98 @@ class Sprite:
     def is_collding_rect(self, other : 'Sprite'):
         return self.rect.colliderect(other.rect)
 
-    def get_colliding(self, collision_groups : list[list['Sprite']]):
-        '''Returns the first sprite colliding this sprite within collision_group or None if there arent any. Uses mask collision.'''
+    @staticmethod
+    def _get_collision_groups(collision_groups : list[list['Sprite']]) -> list[list['Sprite']]:
         try:
             collision_groups[0]
         except TypeError:
             collision_groups = [collision_groups]
-        for collision_group in collision_groups:
-            actual_group = collision_group.active_elements if isclass(collision_group) else collision_group
-            for element in actual_group:
+        return collision_groups
+
+    def _get_collision_candidates(self, collision_group : list['Sprite']|type['Sprite']) -> list['Sprite']:
+        if not isclass(collision_group):
+            return collision_group
+        spatial_hash : SpatialHash|None = Sprite.spatial_hashes.get(collision_group)
+        if spatial_hash is None:
+            return collision_group.active_elements
+        return [element for element in spatial_hash.query(self.rect) if element._active]
+
+    def get_colliding(self, collision_groups : list[list['Sprite']]):
+        '''Returns the first sprite colliding this sprite within collision_group or None if there arent any. Uses mask collision.'''
+        for collision_group in Sprite._get_collision_groups(collision_groups):
+            for element in self._get_collision_candidates(collision_group):
                 if self.is_colliding(element) and not element._zombie: return element     
         return None
     
     def get_rect_colliding(self, collision_groups : list[list['Sprite']]):
         '''Returns the first sprite colliding this sprite within collision_group or None if there arent any. Uses a bounding box check.'''
-        try:
-            collision_groups[0]
-        except TypeError:
-            collision_groups = [collision_groups]
-        for collision_group in collision_groups:
-            actual_group = collision_group.active_elements if isclass(collision_group) else collision_group
-            for element in actual_group:
+        for collision_group in Sprite._get_collision_groups(collision_groups):
+            for element in self._get_collision_candidates(collision_group):
                 if self.is_collding_rect(element) and not element._zombie: return element
         return None
     
     def get_all_colliding(self, collision_groups : list[list['Sprite']]) -> list['Sprite']:
         '''Returns all entities colliding this sprite within collision_group. Uses mask collision.'''
-        try:
-            collision_groups[0]
-        except TypeError:
-            collision_groups = [collision_groups]
         return_val = []
-        for collision_group in collision_groups:
-            actual_group = collision_group.active_elements if isclass(collision_group) else collision_group
-            for element in actual_group:
+        for collision_group in Sprite._get_collision_groups(collision_groups):
+            for element in self._get_collision_candidates(collision_group):
                 if self.is_colliding(element) and not element._zombie:
                     return_val.append(element)
         return return_val
 
     def get_all_rect_colliding(self, collision_groups : list[list['Sprite']]):
         '''Returns all entities colliding this sprite within collision_group. Uses a bounding box check.'''
-        try:
-            collision_groups[0]
-        except TypeError:
-            collision_groups = [collision_groups]
         return_val = []
-        for collision_group in collision_groups:
-            actual_group = collision_group.active_elements if isclass(collision_group) else collision_group
-            for element in actual_group:
+        for collision_group in Sprite._get_collision_groups(collision_groups):
+            for element in self._get_collision_candidates(collision_group):
                 if self.is_collding_rect(element) and not element._zombie: return_val.append(element)
         return return_val
 
     def on_collision(self, other : 'Sprite'):
         pass
 
-    def is_active(self):
-        return self in self.__class__.active_elements
+    def is_active(self) -> bool:
+        return self._active
     
+    @staticmethod
+    def store_previous_centers():
+        '''Remembers where every active sprite is before a fixed simulation step, for interpolate_rects.'''
+        element : Sprite
+        for element in Sprite.active_elements:
+            element._previous_center = element.rect.center if element.rect is not None else None
+
+    @staticmethod
+    def interpolate_rects(alpha : float):
+        '''Moves every sprite rect between its previous and current simulated position. restore_rects must be called once drawing is done.
+        Sprites that moved more than INTERPOLATION_SNAP_DISTANCE in one step are treated as teleported and drawn where they are.'''
+        interpolated : list[tuple[Sprite, tuple[int, int]]] = Sprite._interpolated
+        snap_distance : int = Sprite.INTERPOLATION_SNAP_DISTANCE
+        element : Sprite
+        for element in Sprite.active_elements:
+            previous : tuple[int, int]|None = element._previous_center
+            if previous is None or element.rect is None: continue
+            current : tuple[int, int] = element.rect.center
+            if current == previous: continue
+            dx : int = current[0] - previous[0]
+            dy : int = current[1] - previous[1]
+            if abs(dx) > snap_distance or abs(dy) > snap_distance: continue
+            interpolated.append((element, current))
+            element.rect.center = (round(previous[0] + dx * alpha), round(previous[1] + dy * alpha))
+
+    @staticmethod
+    def restore_rects():
+        for element, center in Sprite._interpolated:
+            if element.rect is not None: element.rect.center = center
+        Sprite._interpolated.clear()
+
     @classmethod
     def draw_all_sprites(cls, display):
-        #if not is_sorted(cls.active_elements, key=lambda sprite : sprite.zindex):
-        cls.active_elements.sort(key=lambda sprite : sprite.zindex)
         element : Sprite
+        if cls is Sprite:
+            for element in Sprite.render_list:
+                element.draw(display)
+            return
+        cls.active_elements.sort(key=lambda sprite : sprite.zindex)
         for element in cls.active_elements:
             element.draw(display)
 
@@ -356,14 +595,25 @@ class Sprite:
                 return sprite_class
         return None
     
+    @staticmethod
+    def get_clicked_sprites(pos : tuple[int, int]) -> list['Sprite']:
+        '''Returns the clickable sprites whose rect contains pos, topmost last.
+        The grid of clickable sprites is only rebuilt on the first query after sprites moved, so bursts of taps share it.'''
+        if Sprite._clickable_hash_dirty:
+            Sprite.clickable_hash.rebuild(Sprite.clickable_elements)
+            Sprite._clickable_hash_dirty = False
+        hit : list[Sprite] = [sprite for sprite in Sprite.clickable_hash.query(pygame.Rect(pos, (1, 1)))
+                              if sprite._active and sprite.rect.collidepoint(pos)]
+        if len(hit) > 1: hit.sort(key = lambda sprite : sprite.zindex)
+        return hit
+
     @classmethod
     def handle_mouse_event(cls, event : pygame.Event):
         if event.type == pygame.MOUSEBUTTONDOWN:
             if event.touch: return
             press_pos : tuple = event.pos
-            hit = [sprite for sprite in Sprite.active_elements if sprite.rect.collidepoint(press_pos)]
+            hit = Sprite.get_clicked_sprites(press_pos)
             if len(hit) == 0: return
-            hit.sort(key = lambda sprite : sprite.zindex)
             new_event = pygame.event.Event(Sprite.SPRITE_CLICKED, {'main_hit' : hit[-1], 'all_hit' : hit, 'pos' : press_pos,
                                                                    'finger_id' : -1})
             pygame.event.post(new_event)
@@ -374,9 +624,8 @@ class Sprite:
             x = event.x * core_object.main_display.get_width()
             y = event.y * core_object.main_display.get_height()
             press_pos : tuple[int, int] = (round(x), round(y))
-            hit = [sprite for sprite in Sprite.active_elements if sprite.rect.collidepoint(press_pos)]
+            hit = Sprite.get_clicked_sprites(press_pos)
             if len(hit) == 0: return
-            hit.sort(key = lambda sprite : sprite.zindex)
             new_event = pygame.event.Event(Sprite.SPRITE_CLICKED, {'main_hit' : hit[-1], 'all_hit' : hit, 'pos' : press_pos,
                                                                    'finger_id' : event.finger_id})
             pygame.event.post(new_event)
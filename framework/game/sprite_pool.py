@@ -0,0 +1,84 @@
+from typing import Iterable, SupportsIndex, Any
+
+class SpritePool(list):
+    '''A list of sprites with O(1) membership tests, appends and removals.
+    Every element remembers its slot index. Removing an element moves the last element into the freed slot,
+    so the order of the elements is not preserved. An element can only be in the pool once.'''
+
+    def __init__(self, elements : Iterable[Any] = ()) -> None:
+        super().__init__()
+        self._slots : dict[Any, int] = {}
+        for element in elements:
+            self.append(element)
+
+    def __contains__(self, element : Any) -> bool:
+        return element in self._slots
+
+    def index(self, element : Any, *args) -> int:
+        if element not in self._slots:
+            raise ValueError(f'{element} is not in the pool')
+        return self._slots[element]
+
+    def count(self, element : Any) -> int:
+        return 1 if element in self._slots else 0
+
+    def append(self, element : Any) -> None:
+        '''Adds an element at the end of the pool. Nothing changes if the element is already in the pool.'''
+        if element in self._slots: return
+        self._slots[element] = len(self)
+        super().append(element)
+
+    def extend(self, elements : Iterable[Any]) -> None:
+        for element in elements:
+            self.append(element)
+
+    def __iadd__(self, elements : Iterable[Any]) -> 'SpritePool':
+        self.extend(elements)
+        return self
+
+    def discard(self, element : Any) -> bool:
+        '''Removes an element in O(1) by swapping the last element into its slot. Returns False if the element was not in the pool.'''
+        slot : int|None = self._slots.pop(element, None)
+        if slot is None: return False
+        last = super().pop()
+        if slot < len(self):
+            super().__setitem__(slot, last)
+            self._slots[last] = slot
+        return True
+
+    def remove(self, element : Any) -> None:
+        if not self.discard(element):
+            raise ValueError(f'{element} is not in the pool')
+
+    def pop(self, index : SupportsIndex = -1) -> Any:
+        element = self[index]
+        self.discard(element)
+        return element
+
+    def clear(self) -> None:
+        super().clear()
+        self._slots.clear()
+
+    def _reindex(self):
+        self._slots = {element : slot for slot, element in enumerate(self)}
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self._reindex()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._reindex()
+
+    def insert(self, index : SupportsIndex, element : Any) -> None:
+        if element in self._slots: return
+        super().insert(index, element)
+        self._reindex()
+
+    def __setitem__(self, index, value) -> None:
+        super().__setitem__(index, value)
+        self._reindex()
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self._reindex()
@@ -60,13 +60,21 @@ class SpriteCamera():
             self._add_to_cache(sprite, transformed)
             # TODO : Find a way to not have to create two surfaces each time
         
-        origin : pygame.Vector2 = (self.origin or pygame.Vector2(display.get_size()) // 2)
-        origin_to_sprite : pygame.Vector2 = pygame.Vector2((sprite.true_position - self.offset) - origin)
-        scaled_origin_to_sprite : pygame.Vector2 = origin_to_sprite * self.zoom
-        sprite_final_position : pygame.Vector2 = origin + scaled_origin_to_sprite.rotate(-self.rotation)
+        sprite_final_position : pygame.Vector2 = self.to_screen(sprite.true_position, display)
         transformed_rect : pygame.Surface = transformed.get_rect(center = sprite_final_position)
         display.blit(transformed, transformed_rect)
 
+    def is_transformed(self) -> bool:
+        '''Whether the camera zooms or rotates, instead of only offsetting.'''
+        return self.zoom != 1.0 or self.rotation != 0.0
+
+    def to_screen(self, position : pygame.Vector2, display : pygame.Surface) -> pygame.Vector2:
+        '''Where a point of the world lands on display once offset, zoomed and rotated.'''
+        origin : pygame.Vector2 = (self.origin or pygame.Vector2(display.get_size()) // 2)
+        origin_to_sprite : pygame.Vector2 = pygame.Vector2((position - self.offset) - origin)
+        scaled_origin_to_sprite : pygame.Vector2 = origin_to_sprite * self.zoom
+        return origin + scaled_origin_to_sprite.rotate(-self.rotation)
+
     def clear_cache(self):
         self.sprite_cache.clear()
     
@@ -3,6 +3,7 @@ from math import copysign
 from typing import Callable, Any, Union, TypeAlias
 from random import random
 from collections import OrderedDict
+from framework.core.asset_pack import load_image
 
 AnyJson : TypeAlias = Union[int, float, str, None, bool, list["AnyJson"], dict[str, "AnyJson"]]
 EasingFunc : TypeAlias = Callable[[float], float]
@@ -149,7 +150,9 @@ def make_circle(radius : int, color : ColorType|str, colorkey : ColorType|str =
 
 
 def load_alpha_to_colorkey(path : str, colorkey : ColorType|str):
-    image = pygame.image.load(path).convert_alpha()
+    return alpha_to_colorkey(load_image(path).convert_alpha(), colorkey)
+
+def alpha_to_colorkey(image : pygame.Surface, colorkey : ColorType|str) -> pygame.Surface:
     new_surf = pygame.surface.Surface(image.get_size())
     new_surf.set_colorkey(colorkey)
     new_surf.fill(colorkey)
@@ -196,4 +199,103 @@ def remove_image_empty(img : pygame.Surface) -> pygame.Surface:
         new_surf.set_colorkey(colorkey)
         new_surf.fill(colorkey)
     new_surf.blit(img, (0, 0), area = bounding_box)
-    return new_surf
\ No newline at end of file
+    return new_surf
+
+COLORKEY_CANDIDATES : list[tuple[int, int, int]] = [(0, 255, 0), (255, 0, 255), (0, 255, 255), (1, 2, 3)]
+
+def optimize_surface(img : pygame.Surface) -> pygame.Surface:
+    '''Returns img converted to the display format with the fastest way to blit it :
+    no transparency if every pixel is opaque, colorkey with RLEACCEL if every pixel is fully opaque or fully transparent
+    and one of COLORKEY_CANDIDATES is free (used by no visible pixel), per-pixel alpha otherwise. See get_blit_mode for
+    the choice made. The result should not be drawn on, as RLE surfaces are slow to modify.'''
+    if pygame.display.get_surface() is None: return img
+    pixel_count : int = img.get_width() * img.get_height()
+    if img.get_flags() & pygame.SRCALPHA:
+        visible_mask : pygame.Mask = pygame.mask.from_surface(img, 0)
+        visible : int = visible_mask.count()
+        if visible != pygame.mask.from_surface(img, 254).count():
+            return img.convert_alpha()
+        if visible == pixel_count:
+            return img.convert()
+        colorkey : tuple[int, int, int]|None = next((color for color in COLORKEY_CANDIDATES
+                                                    if not visible_mask.overlap_area(pygame.mask.from_threshold(img, color, (1, 1, 1, 255)), (0, 0))),
+                                                    None)
+        if colorkey is None:
+            return img.convert_alpha()
+        new_surf : pygame.Surface = pygame.Surface(img.get_size()).convert()
+        new_surf.fill(colorkey)
+        new_surf.blit(img, (0, 0))
+        new_surf.set_colorkey(colorkey, pygame.RLEACCEL)
+        return new_surf
+    colorkey = img.get_colorkey()
+    new_surf = img.convert()
+    if colorkey is not None and pygame.mask.from_surface(img).count() != pixel_count:
+        new_surf.set_colorkey(colorkey, pygame.RLEACCEL)
+    else:
+        new_surf.set_colorkey(None)
+    return new_surf
+
+def enable_rle(img : pygame.Surface) -> pygame.Surface:
+    '''Turns on RLEACCEL for a colorkeyed surface, in place. The encoding itself happens on the first blit.'''
+    colorkey = img.get_colorkey()
+    if colorkey is not None and not img.get_flags() & pygame.SRCALPHA:
+        img.set_colorkey(colorkey, pygame.RLEACCEL)
+    return img
+
+def get_blit_mode(img : pygame.Surface) -> str:
+    '''One of 'alpha', 'colorkey_rle', 'colorkey' or 'opaque'.'''
+    flags : int = img.get_flags()
+    if flags & pygame.SRCALPHA: return 'alpha'
+    if img.get_colorkey() is None: return 'opaque'
+    return 'colorkey_rle' if flags & pygame.RLEACCELOK else 'colorkey'
+
+class SurfaceCache:
+    '''LRU memo of surfaces derived from other surfaces, keyed by the transform, the source surface and the parameters.
+    Returned surfaces are shared, so they must not be drawn on. Use the uncached functions to get a private copy.'''
+    def __init__(self, max_entries : int = 256) -> None:
+        self.max_entries : int = max_entries
+        self.entries : OrderedDict[tuple, pygame.Surface] = OrderedDict()
+
+    def get(self, transform : Callable[..., pygame.Surface], surf : pygame.Surface, *params) -> pygame.Surface:
+        key : tuple = (transform, surf, *params)
+        result : pygame.Surface|None = self.entries.get(key)
+        if result is not None:
+            self.entries.move_to_end(key)
+            return result
+        result = enable_rle(transform(surf, *params))
+        self.entries[key] = result
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return result
+
+    def forget(self, surf : pygame.Surface) -> list[pygame.Surface]:
+        '''Drops every entry derived from surf, directly or through other entries. Returns the dropped surfaces.'''
+        forgotten : list[pygame.Surface] = []
+        sources : list[pygame.Surface] = [surf]
+        while sources:
+            source : pygame.Surface = sources.pop()
+            for key in [key for key in self.entries if key[1] is source]:
+                derived : pygame.Surface = self.entries.pop(key)
+                forgotten.append(derived)
+                sources.append(derived)
+        return forgotten
+
+    def clear(self):
+        self.entries.clear()
+
+surface_cache : SurfaceCache = SurfaceCache()
+
+def _recolor_image_keyed(img : pygame.Surface, color_key : tuple[int, int, int, int]) -> pygame.Surface:
+    return optimize_surface(recolor_image(img, color_key))
+
+def cached_recolor_image(img : pygame.Surface, new_color : ColorType) -> pygame.Surface:
+    return surface_cache.get(_recolor_image_keyed, img, tuple(pygame.Color(new_color)))
+
+def cached_remove_image_empty(img : pygame.Surface) -> pygame.Surface:
+    return surface_cache.get(remove_image_empty, img)
+
+def cached_scale_by(img : pygame.Surface, scale : float|tuple[float, float]) -> pygame.Surface:
+    return surface_cache.get(pygame.transform.scale_by, img, scale if isinstance(scale, (int, float)) else tuple(scale))
+
+def cached_rotate(img : pygame.Surface, angle : float) -> pygame.Surface:
+    return surface_cache.get(pygame.transform.rotate, img, angle)
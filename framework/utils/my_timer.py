@@ -79,3 +79,13 @@ class Timer:
         return False
 
 
+class VirtualClock:
+    '''A time source that only moves when advanced. Lets the game run faster (or slower) than real time, e.g. when headless.'''
+    def __init__(self, start_time : float = 0) -> None:
+        self.time : float = start_time
+
+    def advance(self, seconds : float):
+        self.time += seconds
+
+    def get_time(self) -> float:
+        return self.time
@@ -5,9 +5,16 @@ import framework.utils.interpolation as interpolation
 from random import random
 from math import sin, radians, cos, atan2
 from framework.game.sprite import Sprite
+from framework.game.sprite_renderer import SpriteCamera
 from framework.utils.pivot_2d import Pivot2D
-from framework.utils.helpers import load_alpha_to_colorkey
-from typing import TypedDict, Literal, Union, TypeAlias
+from framework.core.asset_manager import asset_manager
+from framework.core.dirty_renderer import DrawState
+from framework.utils.render_list import RenderList
+from typing import TypedDict, Literal, Union, TypeAlias, Callable, Any
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 def __random_float(a, b):
     return random() * (b-a) + a
@@ -60,7 +67,7 @@ class Particle(Sprite):
 
     test_image = pygame.surface.Surface((4,4))
     pygame.draw.rect(test_image, 'White', (0, 0, 4, 4))
-    spark_particle_image : pygame.Surface = load_alpha_to_colorkey("assets/graphics/projectiles/fire_particle.png", (0, 255, 0))
+    spark_particle_image : pygame.Surface = asset_manager.add_image('fire_particle', "assets/graphics/projectiles/fire_particle.png", (0, 255, 0))
     bounding_box = pygame.Rect(0, 0, 960, 540)
 
     def __init__(self) -> None:
@@ -74,6 +81,7 @@ class Particle(Sprite):
 
         self.update_method : UpdateMethod = 'simulated'
         self.textures : list[pygame.Surface]
+        self.flipbook : AlphaFlipbook|None = None
         self.kill_offscreen = True
         Particle.inactive_elements.append(self)
     
@@ -83,7 +91,13 @@ class Particle(Sprite):
         self.zindex = 100
         self._position = pos
         self.update_method = update_method
-        if copy_surf is False:
+        self.flipbook = AlphaFlipbook.get(main_texture, anim)
+        if self.flipbook is not None:
+            #Fading particles share the frames of the flipbook, so there is nothing to copy
+            self.image = self.flipbook.frames[0]
+            self.textures = alt_textures or []
+            anim = None
+        elif copy_surf is False:
             self.image = main_texture
             self.textures = alt_textures or []
         else:
@@ -151,14 +165,17 @@ class Particle(Sprite):
             if self.anim_track is not None:
                 self.anim_track.update()
         
-        elif self.update_method == 'animated':
+        elif self.update_method == 'animated' and self.anim_track is not None:
             self.anim_track.update()
+        if self.flipbook is not None:
+            self.image = self.flipbook.get_frame(self.lifetime_timer.get_time())
 
     def clean_instance(self):
         self._position = None
         self.lifetime = None
         self.lifetime_timer = None
         self.pivot = None
+        self.flipbook = None
 
         self.velocity = None
         self.acceleration = None
@@ -170,8 +187,332 @@ class Particle(Sprite):
         self.textures = None
         self.kill_offscreen = None
 
-for _ in range(250):
-    Particle()
+Particle.configure_pool(250 if np is None else 25, growth_chunk=50)
+
+AlphaSegment : TypeAlias = tuple[float, float, float, float, Callable[[float], float]]
+#start age, duration, start alpha, end alpha, easing style
+
+def get_alpha_curve(animation : Animation|None, start_alpha : float = 255) -> list[AlphaSegment]|None:
+    '''Turns an animation made only of waits and alpha instructions into alpha segments over the age of a particle.
+    None if the animation does anything else.'''
+    if animation is None: return []
+    curve : list[AlphaSegment] = []
+    time : float = 0
+    alpha : float = start_alpha
+    for instruction in animation.data:
+        if instruction['type'] == 'wait':
+            time += instruction['time']
+        elif instruction['type'] == 'set_alpha':
+            curve.append((time, 0, alpha, instruction['target'], interpolation.linear))
+            alpha = instruction['target']
+        elif instruction['type'] == 'alpha_gradient':
+            easing_style = instruction['easing_style']
+            if type(easing_style) == str: easing_style = getattr(interpolation, easing_style)
+            curve.append((time, instruction['time'], alpha, instruction['target'], easing_style))
+            alpha = instruction['target']
+        else:
+            return None
+    return curve
+
+def get_curve_alpha(curve : list[AlphaSegment], age : float, start_alpha : float = 255) -> int:
+    '''The alpha a particle fading along curve has at age, truncated like AlphaGradientInstruction does.'''
+    alpha : float = start_alpha
+    for start, duration, segment_start_alpha, end_alpha, easing_style in curve:
+        if age < start: continue
+        progress : float = min(1, (age - start) / duration) if duration > 0 else 1
+        alpha = interpolation.lerp(segment_start_alpha, end_alpha, easing_style(progress))
+    return int(alpha)
+
+class AlphaFlipbook:
+    '''Alpha-faded variants of a texture, one per FRAME_TIME of age along an alpha curve, shared by every particle fading
+    along that curve. Particles pick their frame by age instead of copying the texture and calling set_alpha on it every frame.
+    The alpha is baked into per pixel alpha frames, and frames with the same alpha are the same surface.'''
+    FRAME_TIME : float = 1 / 60
+    flipbooks : dict[tuple[pygame.Surface, str], 'AlphaFlipbook'] = {}
+
+    def __init__(self, texture : pygame.Surface, curve : list[AlphaSegment]) -> None:
+        duration : float = max((start + duration for start, duration, *_ in curve), default=0)
+        start_alpha : int = texture.get_alpha() if texture.get_alpha() is not None else 255
+        self.alphas : list[int] = [get_curve_alpha(curve, index * self.FRAME_TIME, start_alpha)
+                                   for index in range(int(duration / self.FRAME_TIME) + 2)]
+        frames_by_alpha : dict[int, pygame.Surface] = {}
+        for alpha in self.alphas:
+            if alpha in frames_by_alpha: continue
+            frame : pygame.Surface = texture.convert_alpha()
+            if alpha < 255: frame.fill((255, 255, 255, max(0, alpha)), special_flags=pygame.BLEND_RGBA_MULT)
+            frames_by_alpha[alpha] = frame
+        self.frames : list[pygame.Surface] = [frames_by_alpha[alpha] for alpha in self.alphas]
+
+    @classmethod
+    def get(cls, texture : pygame.Surface, animation : Animation|None) -> 'AlphaFlipbook|None':
+        '''None if the animation is not only a fade (see get_alpha_curve).'''
+        if animation is None: return None
+        flipbook : AlphaFlipbook|None = cls.flipbooks.get((texture, animation.name))
+        if flipbook is None:
+            curve : list[AlphaSegment]|None = get_alpha_curve(animation)
+            if not curve: return None
+            flipbook = cls.flipbooks[(texture, animation.name)] = cls(texture, curve)
+        return flipbook
+
+    def get_index(self, age : float) -> int:
+        return min(max(0, int(age / self.FRAME_TIME)), len(self.frames) - 1)
+
+    def get_frame(self, age : float) -> pygame.Surface:
+        return self.frames[self.get_index(age)]
+
+    @classmethod
+    def prepare_effects(cls, effects_data : dict[str, EffectData]):
+        '''Builds the flipbooks of every fading effect up front.'''
+        for data in effects_data.values():
+            cls.get(data['main_texture'], data['animation'])
+
+class ParticleBatch:
+    '''Every particle of one EffectData (and time source), stored as numpy arrays instead of Particle sprites.
+    Spawning, integrating the 'simulated' and 'spiral' update methods, fading, culling and drawing each take a handful
+    of array operations over the whole batch, and drawing is one Surface.blits call, fading particles using AlphaFlipbook frames.
+    The batch is drawn through Sprite.render_list at the zindex particles use, following the main camera like particles do.
+    While the camera zooms or rotates, each particle is placed through SpriteCamera.to_screen instead.
+    Requires numpy; without it, or for effects it cannot run, get returns None and Particle sprites are used.'''
+    batches : dict[tuple[int, TimeSource|None], 'ParticleBatch'] = {}
+    unbatchable : set[int] = set()
+    UPDATE_METHODS : tuple[str, ...] = ('simulated', 'spiral')
+    FIELDS : tuple[str, ...] = ('position', 'previous_position', 'velocity', 'acceleration', 'drag', 'origin', 'offset',
+                                'spawn_time', 'lifetime', 'track_id')
+    render_alpha : float = 1.0
+    rng = None
+
+    def __init__(self, data : EffectData, time_source : TimeSource|None, flipbook : AlphaFlipbook|None) -> None:
+        self.data : EffectData = data
+        self.time_source : TimeSource|None = time_source
+        #Per pixel alpha blits faster than a colorkey does
+        self.texture : pygame.Surface = data['main_texture'].convert_alpha()
+        self.half_size = np.array(self.texture.get_size()) // 2
+        self.flipbook : AlphaFlipbook|None = flipbook
+        self.flipbook_alphas = np.array(flipbook.alphas) if flipbook is not None else None
+        self.spiral : bool = data['update_method'] == 'spiral'
+        self.kill_offscreen : bool = data.get('destroy_offscreen', True)
+        self.tracks : dict[int, ParticleEffectTrack] = {}
+        self.version : int = 0
+        self.zindex : int = 100
+        self._render_lists : list[RenderList] = []
+        for name in self.FIELDS:
+            setattr(self, name, self._empty(name, 0))
+        Sprite.render_list.add(self)
+
+    @staticmethod
+    def _empty(name : str, count : int):
+        if name in ('drag', 'spawn_time', 'lifetime'): return np.zeros(count, dtype=np.float64)
+        if name == 'track_id': return np.zeros(count, dtype=np.int64)
+        return np.zeros((count, 2), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.lifetime)
+
+    @classmethod
+    def get(cls, data : EffectData, time_source : TimeSource|None) -> 'ParticleBatch|None':
+        if np is None or data['update_method'] not in cls.UPDATE_METHODS or id(data) in cls.unbatchable: return None
+        batch : ParticleBatch|None = cls.batches.get((id(data), time_source))
+        if batch is None:
+            flipbook : AlphaFlipbook|None = AlphaFlipbook.get(data['main_texture'], data['animation'])
+            if flipbook is None and data['animation'] is not None:
+                cls.unbatchable.add(id(data))
+                return None
+            batch = cls.batches[(id(data), time_source)] = cls(data, time_source, flipbook)
+        return batch
+
+    @classmethod
+    def random_array(cls, value : NumberRange|None, count : int):
+        '''Same as rand_float, for count values at once.'''
+        if value is None: return None
+        if type(value) == int or type(value) == float: return np.full(count, float(value))
+        if cls.rng is None: cls.rng = np.random.default_rng(int(random() * 2**63))
+        return value[0] + cls.rng.random(count) * (value[1] - value[0])
+
+    def spawn(self, track : 'ParticleEffectTrack', origin : pygame.Vector2, count : int):
+        if count <= 0: return
+        data : EffectData = self.data
+        new : dict[str, Any] = {name : self._empty(name, count) for name in self.FIELDS}
+        new['position'][:, 0] = origin.x + self.random_array(data['offset_x'], count)
+        new['position'][:, 1] = origin.y + self.random_array(data['offset_y'], count)
+        new['lifetime'][:] = self.random_array(data['lifetime'], count)
+        if data['velocity_x'] is not None and data['velocity_y'] is not None:
+            new['velocity'][:, 0] = self.random_array(data['velocity_x'], count)
+            new['velocity'][:, 1] = self.random_array(data['velocity_y'], count)
+        if data['drag'] is not None: new['drag'][:] = self.random_array(data['drag'], count)
+        new['acceleration'][:, 0] = self.random_array(data['accel_x'], count)
+        new['acceleration'][:, 1] = self.random_array(data['accel_y'], count)
+        angle = self.random_array(data['angle'], count)
+        magnitude = self.random_array(data['speed'], count)
+        if magnitude is None: magnitude = np.ones(count)
+        if self.spiral:
+            angle = np.radians(angle if angle is not None else np.zeros(count))
+            new['origin'][:] = new['position']
+            new['offset'][:, 0] = magnitude * np.cos(angle)
+            new['offset'][:, 1] = -magnitude * np.sin(angle)
+            new['position'] -= new['offset']
+        elif angle is not None:
+            angle = np.radians(angle)
+            new['velocity'][:, 0] += magnitude * np.cos(angle)
+            new['velocity'][:, 1] -= magnitude * np.sin(angle)
+        new['previous_position'][:] = new['position']
+        new['spawn_time'][:] = self.get_time()
+        new['track_id'][:] = id(track)
+        for name in self.FIELDS:
+            setattr(self, name, np.concatenate((getattr(self, name), new[name])))
+        self.tracks[id(track)] = track
+        track.batch = self
+        track.batched_count += count
+        self.version += 1
+
+    def remove(self, dead):
+        '''Removes the particles where the boolean array dead is True.'''
+        track_ids, counts = np.unique(self.track_id[dead], return_counts=True)
+        for track_id, count in zip(track_ids.tolist(), counts.tolist()):
+            track : ParticleEffectTrack = self.tracks[track_id]
+            track.batched_count -= count
+            if track.batched_count <= 0: del self.tracks[track_id]
+        alive = ~dead
+        for name in self.FIELDS:
+            setattr(self, name, getattr(self, name)[alive])
+        self.version += 1
+
+    def remove_track(self, track : 'ParticleEffectTrack'):
+        if id(track) in self.tracks: self.remove(self.track_id == id(track))
+
+    def get_time(self) -> float:
+        '''Without a time source of its own, the batch follows Timer.time_source, even if it is replaced later.'''
+        return (self.time_source or Timer.time_source)()
+
+    def get_topleft(self, position):
+        '''Where particles centered on position get blitted, rounded the way Rect.center is.'''
+        return np.trunc(position).astype(np.int64) - self.half_size
+
+    def step(self, delta : float):
+        '''Same as Particle.update, for the whole batch.'''
+        if not len(self): return
+        dead = (self.get_time() - self.spawn_time) > self.lifetime
+        if self.kill_offscreen:
+            topleft = self.get_topleft(self.position)
+            bounds : pygame.Rect = Particle.bounding_box
+            width, height = self.texture.get_size()
+            dead |= ~((topleft[:, 0] < bounds.right) & (topleft[:, 0] + width > bounds.left) &
+                      (topleft[:, 1] < bounds.bottom) & (topleft[:, 1] + height > bounds.top))
+        if dead.any():
+            self.remove(dead)
+            if not len(self): return
+        drag_factor = (((1 - self.drag) ** delta) ** 0.5)[:, None]
+        half_accel = self.acceleration * (0.5 * delta)
+        velocity = self.velocity * drag_factor
+        velocity += half_accel
+        if self.spiral:
+            offset = self.offset
+            distance = np.hypot(offset[:, 0], offset[:, 1])
+            angle = np.radians(-velocity[:, 0] * delta)
+            cos, sin = np.cos(angle), np.sin(angle)
+            rotated = np.column_stack((offset[:, 0] * cos - offset[:, 1] * sin, offset[:, 0] * sin + offset[:, 1] * cos))
+            moving = distance != 0
+            scale = np.where(moving, (distance + velocity[:, 1] * delta) / np.where(moving, distance, 1), 1)
+            self.offset = np.where(moving[:, None], rotated * scale[:, None], offset)
+            self.position = self.origin - self.offset
+        else:
+            self.position += velocity * delta
+        velocity += half_accel
+        velocity *= drag_factor
+        self.velocity = velocity
+        self.version += 1
+
+    def get_frame_indexes(self):
+        '''Same as AlphaFlipbook.get_index, for every particle.'''
+        age = self.get_time() - self.spawn_time
+        return np.clip((age / AlphaFlipbook.FRAME_TIME).astype(np.int64), 0, len(self.flipbook.frames) - 1)
+
+    @staticmethod
+    def get_camera() -> SpriteCamera|None:
+        return core_object.game.main_camera if core_object.game.active else None
+
+    def get_render_position(self):
+        if ParticleBatch.render_alpha == 1.0: return self.position
+        return self.previous_position + (self.position - self.previous_position) * ParticleBatch.render_alpha
+
+    def get_screen_topleft(self):
+        '''For an untransformed camera only.'''
+        position = self.get_render_position()
+        camera : SpriteCamera|None = self.get_camera()
+        if camera: position = position - (camera.offset.x, camera.offset.y)
+        return self.get_topleft(position)
+
+    def get_draw_state(self) -> DrawState|None:
+        '''For DirtyRectRenderer : the area covering every particle, which is damaged whenever the batch changes.'''
+        if not len(self): return None
+        camera : SpriteCamera|None = self.get_camera()
+        if camera and camera.is_transformed():
+            return ((-10**6, -10**6, 2 * 10**6, 2 * 10**6), self.texture, self.version)
+        topleft = self.get_screen_topleft()
+        left, top = topleft.min(axis=0).tolist()
+        right, bottom = (topleft.max(axis=0) + self.texture.get_size()).tolist()
+        return ((left, top, right - left, bottom - top), self.texture, self.version)
+
+    def draw(self, display : pygame.Surface):
+        if not len(self): return
+        camera : SpriteCamera|None = self.get_camera()
+        if camera and camera.is_transformed():
+            self.draw_transformed(display, camera)
+            return
+        topleft = self.get_screen_topleft()
+        if self.flipbook is None:
+            display.blits([(self.texture, position) for position in topleft.tolist()], doreturn=False)
+            return
+        indexes = self.get_frame_indexes()
+        visible = self.flipbook_alphas[indexes] > 0
+        frames : list[pygame.Surface] = self.flipbook.frames
+        display.blits([(frames[index], position) for index, position in zip(indexes[visible].tolist(), topleft[visible].tolist())],
+                      doreturn=False)
+
+    def draw_transformed(self, display : pygame.Surface, camera : SpriteCamera):
+        '''Same as draw, through a zooming or rotating camera. Each texture or flipbook frame is transformed once per call.'''
+        if self.flipbook is None:
+            indexes : list[int] = [0] * len(self)
+            images : list[pygame.Surface] = [self.texture]
+        else:
+            indexes = self.get_frame_indexes().tolist()
+            images = self.flipbook.frames
+        transformed : dict[int, pygame.Surface] = {}
+        blits : list[tuple[pygame.Surface, pygame.Rect]] = []
+        for index, position in zip(indexes, self.get_render_position().tolist()):
+            if self.flipbook is not None and self.flipbook.alphas[index] <= 0: continue
+            image : pygame.Surface|None = transformed.get(index)
+            if image is None:
+                image = transformed[index] = pygame.transform.rotozoom(images[index], camera.rotation, camera.zoom)
+            blits.append((image, image.get_rect(center=camera.to_screen(pygame.Vector2(position), display))))
+        display.blits(blits, doreturn=False)
+
+    @classmethod
+    def update_all(cls, delta : float):
+        for batch in cls.batches.values():
+            batch.step(delta)
+
+    @classmethod
+    def store_previous_positions(cls):
+        '''Same as Sprite.store_previous_centers, for batches.'''
+        for batch in cls.batches.values():
+            batch.previous_position = batch.position.copy()
+
+    @classmethod
+    def interpolate(cls, alpha : float):
+        '''Draws batches between their previous and current positions until restore is called.'''
+        cls.render_alpha = alpha
+
+    @classmethod
+    def restore(cls):
+        cls.render_alpha = 1.0
+
+    @classmethod
+    def clear_all(cls):
+        '''Also drops the generator, so the next game derives it again from the (possibly reseeded) random module.'''
+        for batch in cls.batches.values():
+            Sprite.render_list.discard(batch)
+        cls.batches.clear()
+        cls.rng = None
 
 class ParticleEffect:
     elements : list['ParticleEffect'] = []
@@ -202,7 +543,7 @@ class ParticleEffect:
         return special_effect_class(effect_data, persistance, dynamic_origin)
     
     def emit(self, track : 'ParticleEffectTrack'):
-        new_particle : Particle = Particle.inactive_elements[0]
+        new_particle : Particle = Particle.get_inactive()
 
         offset = pygame.Vector2(rand_float(self.data['offset_x']), rand_float(self.data['offset_y']))
         if not self.dynamic_origin:
@@ -228,12 +569,21 @@ class ParticleEffect:
         track.active.append(new_particle)
         track.total_count += 1
     
+    def emit_wave(self, track : 'ParticleEffectTrack', count : int):
+        '''Emits count particles, all at once into a ParticleBatch when the effect can use one.'''
+        batch : ParticleBatch|None = ParticleBatch.get(self.data, track.time_source)
+        if batch is None:
+            for _ in range(count):
+                self.emit(track)
+            return
+        batch.spawn(track, self.position if self.dynamic_origin else track.origin, count)
+        track.total_count += count
+
     def play(self, pos : pygame.Vector2, time_source : TimeSource|None = None) -> 'ParticleEffectTrack':
         self.started_playing_once = True
         new_track = ParticleEffectTrack(pos, self.data['cooldown'], time_source=time_source)
         self.tracks.append(new_track)
-        for _ in range(self.data['init_spawn_count']):
-            self.emit(new_track)
+        self.emit_wave(new_track, self.data['init_spawn_count'])
         return new_track
 
     def update(self):
@@ -255,23 +605,17 @@ class ParticleEffect:
             track.timer.restart()
             if track.can_emit:
                 for _ in range(round(count)):
-                    for _ in range(self.data['part_per_wave']):
-                        self.emit(track)
-                        if track.total_count >= self.data['target_spawn_count']: break
+                    #A wave stops at the target, but always emits at least one particle
+                    remaining : int = max(1, self.data['target_spawn_count'] - track.total_count)
+                    self.emit_wave(track, min(self.data['part_per_wave'], remaining))
             track.timer.start_time -= remainder
 
             
 
-        if (len(track.active) == 0) and ((track.total_count >= self.data['target_spawn_count']) or (track.can_emit == False)):
+        if (track.get_active_count() == 0) and ((track.total_count >= self.data['target_spawn_count']) or (track.can_emit == False)):
             track.ended = True
         
-        to_del = []
-        for part in track.active:
-            if part.is_active() == False:
-                to_del.append(part)
-
-        for part in to_del:
-            track.active.remove(part)
+        track.active = [part for part in track.active if part.active]
 
     def stop(self):
         for track in self.tracks:
@@ -325,11 +669,17 @@ class ParticleEffectTrack:
         self.ended = False
         self.can_emit = True
         self.time_source : TimeSource|None = time_source
+        self.batch : ParticleBatch|None = None
+        self.batched_count : int = 0
     
+    def get_active_count(self) -> int:
+        return len(self.active) + self.batched_count
+
     def cleanup(self):
         for part in self.active:
             part.kill_instance_safe()
         self.active.clear()
+        if self.batch is not None: self.batch.remove_track(self)
     
     def stop_emission(self):
         self.can_emit = False
@@ -403,3 +753,4 @@ def runtime_imports():
     global core_object
     from framework.core.core import core_object
     Particle.bounding_box = pygame.Rect(0, 0, *core_object.main_display.get_size())
+    AlphaFlipbook.prepare_effects(ParticleEffect.effects_data)
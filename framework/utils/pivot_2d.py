@@ -1,5 +1,6 @@
 import pygame
 from typing import Any
+from framework.utils.rotation_cache import RotationCache
 def rotate_around_pivot_accurate(image : pygame.Surface, pos : pygame.Vector2, angle : float,
                         offset : pygame.Vector2 = None, debug = False, colorkey : pygame.Color|None = None):
     
@@ -22,6 +23,8 @@ def rotate_around_pivot_pos_only(pos : pygame.Vector2, angle : float, offset : p
 
 
 class Pivot2D:
+    rotation_cache : RotationCache|None = RotationCache(1, 2048)
+
     def __init__(self, pos : pygame.Vector2, og_image : pygame.Surface|None = None, colorkey : pygame.Color|None = None) -> None:
         self._origin : pygame.Vector2 = pos
         self._pivot_offset : pygame.Vector2 = pygame.Vector2(0,0)
@@ -74,7 +77,13 @@ class Pivot2D:
         return rotate_around_pivot_accurate(image, self._origin, self._angle, self._pivot_offset, debug=False, colorkey=self.img_colorkey)
     
     def rotate_og_image(self):
-        return self.rotate_image(self.original_image)
+        '''Rotates the original image through Pivot2D.rotation_cache so pivots sharing an image and heading share one surface.
+        Set rotation_cache to None to rotate at the exact angle every time.'''
+        if Pivot2D.rotation_cache is None:
+            return self.rotate_image(self.original_image)
+        new_image : pygame.Surface = Pivot2D.rotation_cache.get_rotated(self.original_image, self._angle, self.img_colorkey)
+        new_pos : pygame.Vector2 = rotate_around_pivot_pos_only(self._origin, self._angle, self._pivot_offset)
+        return new_image, new_image.get_rect(center = round(new_pos)), new_pos
     
     def rotate_image_debug(self, image : pygame.Surface) -> tuple[pygame.Surface, pygame.Rect, pygame.Vector2, Any]:
         return rotate_around_pivot_accurate(image, self._origin, self._angle, self._pivot_offset, debug=True, colorkey=self.img_colorkey)
\ No newline at end of file
@@ -0,0 +1,74 @@
+from bisect import insort
+from heapq import merge
+from typing import Any, Iterator
+
+class RenderList:
+    '''Drawables bucketed by zindex, kept in order as they are added, removed or change zindex, so drawing never sorts.
+    Items must have a zindex attribute and a _render_lists list, which their zindex setter walks to call refresh.
+    Within a bucket, items are drawn in the order they were added. Items with a zindex of None are kept but not drawn.'''
+    def __init__(self) -> None:
+        self.buckets : dict[Any, dict[Any, None]] = {}
+        self.keys : list[Any] = []
+        self.item_keys : dict[Any, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.item_keys)
+
+    def __contains__(self, item : Any) -> bool:
+        return item in self.item_keys
+
+    def __iter__(self) -> Iterator[Any]:
+        buckets : dict[Any, dict[Any, None]] = self.buckets
+        for key in self.keys:
+            yield from buckets[key]
+
+    def _insert(self, item : Any):
+        key = item.zindex
+        self.item_keys[item] = key
+        if key is None: return
+        bucket : dict[Any, None]|None = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = {}
+            insort(self.keys, key)
+        bucket[item] = None
+
+    def _extract(self, item : Any):
+        key = self.item_keys.pop(item)
+        if key is None: return
+        bucket : dict[Any, None] = self.buckets[key]
+        del bucket[item]
+        if not bucket:
+            del self.buckets[key]
+            self.keys.remove(key)
+
+    def add(self, item : Any):
+        if item in self.item_keys: return
+        self._insert(item)
+        item._render_lists.append(self)
+
+    def discard(self, item : Any):
+        if item not in self.item_keys: return
+        self._extract(item)
+        item._render_lists.remove(self)
+
+    def refresh(self, item : Any):
+        '''Moves item to the bucket of its current zindex. Called by the zindex setter of the item.'''
+        if item not in self.item_keys or self.item_keys[item] == item.zindex: return
+        self._extract(item)
+        self._insert(item)
+
+    def clear(self):
+        for item in self.item_keys:
+            item._render_lists.remove(self)
+        self.buckets.clear()
+        self.keys.clear()
+        self.item_keys.clear()
+
+    @staticmethod
+    def merged(*render_lists : 'RenderList') -> Iterator[Any]:
+        '''Walks several render lists as if they were one. On equal zindex, items of earlier lists come first.'''
+        for key in dict.fromkeys(merge(*(render_list.keys for render_list in render_lists))):
+            for render_list in render_lists:
+                bucket : dict[Any, None]|None = render_list.buckets.get(key)
+                if bucket is not None:
+                    yield from bucket
@@ -0,0 +1,61 @@
+import pygame
+from collections import OrderedDict
+from typing import Any
+
+class RotationCache:
+    '''Shares rotated copies of source images between everything that rotates them.
+    Angles are snapped to multiples of resolution degrees, and at most max_entries rotated surfaces are kept (least recently used ones are dropped first).
+    Source images must not be drawn on after they were rotated through the cache.'''
+    def __init__(self, resolution : float = 1, max_entries : int = 2048) -> None:
+        self.resolution : float
+        self.steps : int
+        self.max_entries : int = max_entries
+        self.entries : OrderedDict[tuple[pygame.Surface, int, Any], pygame.Surface] = OrderedDict()
+        self.hits : int = 0
+        self.misses : int = 0
+        self.set_resolution(resolution)
+
+    def set_resolution(self, resolution : float):
+        self.resolution = resolution
+        self.steps = max(1, round(360 / resolution))
+        self.clear()
+
+    def set_max_entries(self, max_entries : int):
+        self.max_entries = max_entries
+        self.trim()
+
+    def quantize(self, angle : float) -> int:
+        return round(angle / self.resolution) % self.steps
+
+    def get_rotated(self, image : pygame.Surface, angle : float, colorkey : pygame.Color|None = None) -> pygame.Surface:
+        '''Returns image rotated clockwise by angle (snapped to the resolution). The returned surface is shared and must not be modified.'''
+        step : int = self.quantize(angle)
+        key : tuple[pygame.Surface, int, Any] = (image, step, None if colorkey is None else tuple(colorkey))
+        rotated : pygame.Surface|None = self.entries.get(key)
+        if rotated is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return rotated
+        self.misses += 1
+        if colorkey is not None:
+            prev_colorkey = image.get_colorkey()
+            image.set_colorkey(colorkey)
+        rotated = pygame.transform.rotate(image, -step * self.resolution)
+        if colorkey is not None: image.set_colorkey(prev_colorkey)
+        self.entries[key] = rotated
+        self.trim()
+        return rotated
+
+    def trim(self):
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def forget(self, image : pygame.Surface):
+        '''Drops every rotated copy of image.'''
+        for key in [key for key in self.entries if key[0] is image]:
+            del self.entries[key]
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -1,9 +1,10 @@
 import pygame
 from framework.utils.ui.ui_sprite import UiSprite
 import framework.utils.ui.button_templates as button_templates
+from framework.core.asset_manager import asset_manager
 
 class BaseUiElements:
-    font_40 = pygame.font.Font("assets/fonts/Pixeltype.ttf", 40)
+    font_40 = asset_manager.add_font('pixeltype_40', "assets/fonts/Pixeltype.ttf", 40)
     tag_event = pygame.event.custom_type() 
     image_dict : dict[str, pygame.Surface] = button_templates.image_dict
 
@@ -2,10 +2,12 @@ import pygame
 from math import floor
 from framework.utils.ui.ui_sprite import UiSprite
 from framework.utils.helpers import rotate_around_pivot_accurate
+from framework.core.asset_pack import load_image
+from framework.core.asset_manager import asset_manager
 class TextBox(UiSprite):
-    main_image = pygame.image.load('assets/graphics/button_templates/textbox_green_colorkey.png').convert()
+    main_image = load_image('assets/graphics/button_templates/textbox_green_colorkey.png').convert()
     main_image.set_colorkey((0, 255, 0))
-    main_font = pygame.font.Font(r'assets/fonts/Pixeltype.ttf', 40)
+    main_font = asset_manager.add_font('pixeltype_40', r'assets/fonts/Pixeltype.ttf', 40)
     def __init__(self, surf: pygame.Surface, rect: pygame.Rect, tag: int, text : str, name: str | None = None, keep_og_surf=False, 
                  attributes: dict = None, data: dict = None, forced_og_surf: pygame.Surface = None, zindex: int = 0, 
                  text_settings : tuple[pygame.Font, pygame.Color, bool]|None = None, text_alingment : tuple[pygame.Vector2, int, int]|None = None):
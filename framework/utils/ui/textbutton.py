@@ -2,10 +2,11 @@ import pygame
 from math import floor
 from framework.utils.ui.ui_sprite import UiSprite
 from framework.utils.helpers import rotate_around_pivot_accurate
+from framework.core.asset_manager import asset_manager
 import button_templates
 
 class TextButton(UiSprite):
-    main_font = pygame.font.Font(r'assets/fonts/Pixeltype.ttf', 40)
+    main_font = asset_manager.add_font('pixeltype_40', r'assets/fonts/Pixeltype.ttf', 40)
     main_image = button_templates.blue_button_surf
     def __init__(self, surf: pygame.Surface, rect: pygame.Rect, tag: int, text : str, name: str | None = None, keep_og_surf=False, 
                  attributes: dict = None, data: dict = None, forced_og_surf: pygame.Surface = None, zindex: int = 0, 
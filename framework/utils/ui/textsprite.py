@@ -2,8 +2,9 @@ import pygame
 from math import floor
 from framework.utils.ui.ui_sprite import UiSprite
 from framework.utils.helpers import rotate_around_pivot_accurate, vector_xmax_ysum
+from framework.core.asset_manager import asset_manager
 class TextSprite(UiSprite):
-    main_font = pygame.font.Font(r'assets/fonts/Pixeltype.ttf', 40)
+    main_font = asset_manager.add_font('pixeltype_40', r'assets/fonts/Pixeltype.ttf', 40)
     def __init__(self, position : pygame.Vector2|tuple, rect_alignment : str|None, tag: int, text : str, name: str | None = None, attributes: dict = None, 
                  data: dict = None, zindex: int = 0, text_settings : tuple[pygame.Font, pygame.Color, bool]|None = None, 
                  text_stroke_settings : tuple[pygame.Color, int]|None = None, text_alingment : tuple[int, int]|None = None,       
@@ -98,11 +99,12 @@ class TextSprite(UiSprite):
             final_surf.blit(first_text_sprite, (self._text_stroke_width, self._text_stroke_width))            
             self.surf = final_surf
             if self.colorkey:
-                self.surf.set_colorkey(self.colorkey)
+                self.surf.set_colorkey(self.colorkey, pygame.RLEACCEL)
         else:
             self.surf = font.render(self._true_text, AA_enabled, color, wraplength=self.max_line_lentgh, bgcolor=self.colorkey)
             if self.colorkey:
-                self.surf.set_colorkey(self.colorkey)
+                self.surf = self.surf.convert()
+                self.surf.set_colorkey(self.colorkey, pygame.RLEACCEL)
     
     @property
     def text(self):
@@ -1,6 +1,7 @@
 import pygame
 from framework.utils.helpers import rotate_around_pivot_accurate, ColorType
 from framework.utils.pivot_2d import Pivot2D
+from framework.utils.render_list import RenderList
 
 
 
@@ -22,6 +23,7 @@ class UiSprite:
     def __init__(self, surf : pygame.Surface, rect : pygame.Rect, tag : int, name : str|None = None, keep_og_surf = False, 
                  attributes : dict = None, data : dict = None, forced_og_surf : pygame.Surface = None, zindex : int = 0,
                  colorkey : ColorType|str|None = None):
+        self._render_lists : list[RenderList] = []
         self.surf : pygame.Surface = surf
         if colorkey and (surf is not None):
             self.surf.set_colorkey(colorkey)
@@ -38,6 +40,7 @@ class UiSprite:
         self.zindex : int = zindex
         
         self.visible : bool = True
+        self.dirty : bool = False
         self.interactible : bool = True
         self.clickable : bool = True if self.tag != 0 else False
         self.use_pivot : bool = False
@@ -105,6 +108,16 @@ class UiSprite:
             if not has_modified: self.surf = self.og_surf.copy()
             filter.apply(self.surf)
 
+    @property
+    def zindex(self) -> int:
+        return self._zindex
+
+    @zindex.setter
+    def zindex(self, new_val : int):
+        self._zindex = new_val
+        for render_list in self._render_lists:
+            render_list.refresh(self)
+
     @property
     def opacity(self):
         return self._opacity
@@ -172,6 +185,10 @@ class UiSprite:
     def draw(self, display : pygame.Surface):
         if self.visible:
             display.blit(self.surf, self.rect)
+
+    def mark_dirty(self):
+        '''Call after drawing on surf in place, so the dirty rect renderer redraws it.'''
+        self.dirty = True
     
     def on_click(self):
         if not self.clickable: return
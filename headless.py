@@ -0,0 +1,124 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+import pygame
+import argparse
+import random
+from time import perf_counter
+pygame.init()
+from framework.core.asset_pack import mount_pack
+mount_pack()
+
+window_size = (960, 540)
+window = pygame.display.set_mode(window_size)
+
+pygame.mixer.set_num_channels(64)
+
+from framework.core.core import core_object
+from framework.utils.my_timer import VirtualClock
+from framework.core.asset_cache import AssetCache
+import src.settings as settings_module
+core = core_object
+virtual_clock : VirtualClock = VirtualClock()
+core.set_time_source(virtual_clock.get_time)
+core.init(window)
+core.assets.cache = AssetCache(AssetCache.DEFAULT_PATH)
+
+from framework.game.sprite import Sprite
+Sprite._core_hint()
+
+from framework.utils.animation import _sprite_hint
+_sprite_hint()
+
+from framework.utils.particle_effects import ParticleEffect
+import framework.utils.particle_effects
+framework.utils.particle_effects.runtime_imports()
+
+import src.game_states as game_states
+from src.sprites.player import Player
+
+core.storage.load(is_web=False)
+core.storage.read_only = True
+core.settings.load(is_web=False)
+settings_module.the_runtime_imports()
+core.settings.apply()
+
+core.menu.init()
+core.game.init()
+game_states.runtime_imports()
+
+class HeadlessRunner:
+    '''Runs the game without a display, audio or frame cap. Time only moves when step is called, by one simulation step each time.'''
+    def __init__(self, simulation_rate : int = 60, autofire : bool = False, invincible : bool = False) -> None:
+        self.simulation_rate : int = simulation_rate
+        self.autofire : bool = autofire
+        self.invincible : bool = invincible
+        self.frames : int = 0
+
+    @property
+    def virtual_time(self) -> float:
+        return virtual_clock.get_time()
+
+    def start_game(self, wave : int = 1):
+        pygame.event.post(pygame.Event(core.START_GAME, {'mode' : 'normal', 'wave' : wave}))
+        self.process_events()
+
+    def process_events(self):
+        for event in pygame.event.get():
+            core.event_manager.process_event(event)
+
+    def control_player(self):
+        if not Player.active_elements: return
+        player : Player = Player.active_elements[0]
+        if self.invincible: player.invincible = True
+        if self.autofire and player.can_shoot: player.shoot(False)
+
+    def step(self):
+        virtual_clock.advance(1 / self.simulation_rate)
+        core.update_dt(60)
+        self.process_events()
+        if core.game.active:
+            self.control_player()
+            core.game.state.main_logic(core.dt)
+            ParticleEffect.update_all()
+            core.main_ui.update()
+        core.update()
+        self.frames += 1
+
+    def get_wave(self) -> int|None:
+        state = core.game.state if core.game.active else None
+        return getattr(state, 'wave_number', None)
+
+    def get_score(self) -> int|None:
+        state = core.game.state if core.game.active else None
+        return getattr(state, '_score', None)
+
+def main():
+    parser = argparse.ArgumentParser(description='Runs the game headless and faster than real time.')
+    parser.add_argument('--wave', type=int, default=1, help='wave to start at')
+    parser.add_argument('--until-wave', type=int, default=None, help='stop once this wave is reached')
+    parser.add_argument('--seconds', type=float, default=120, help='maximum amount of game time to simulate')
+    parser.add_argument('--rate', type=int, default=60, help='simulation steps per game second')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--autofire', action='store_true', help='make the player shoot whenever possible')
+    parser.add_argument('--invincible', action='store_true', help='make the player unable to take damage')
+    parser.add_argument('--quiet', action='store_true', help='silence core.log')
+    args = parser.parse_args()
+
+    if args.quiet: core.LOGGING = False
+    if args.seed is not None: random.seed(args.seed)
+    runner : HeadlessRunner = HeadlessRunner(args.rate, args.autofire, args.invincible)
+    runner.start_game(args.wave)
+    start : float = perf_counter()
+    while core.game.active and runner.virtual_time < args.seconds:
+        runner.step()
+        wave : int|None = runner.get_wave()
+        if args.until_wave is not None and wave is not None and wave >= args.until_wave:
+            break
+    elapsed : float = perf_counter() - start
+    print(f'Simulated {runner.virtual_time:0.1f}s ({runner.frames} steps) in {elapsed:0.2f}s, '
+          f'{runner.virtual_time / max(elapsed, 1e-9):0.1f}x real time. '
+          f'State : {type(core.game.state).__name__ if core.game.active else None}, wave : {runner.get_wave()}, score : {runner.get_score()}')
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,10 @@ import asyncio
 import traceback
 pygame.init()
 
-GAME_ICON = pygame.image.load('assets/graphics/icon.png')
+from framework.core.asset_pack import mount_pack, load_image
+mount_pack()
+
+GAME_ICON = load_image('assets/graphics/icon.png')
 GAME_TITLE : str = "Space Brawl"
 pygame.display.set_icon(GAME_ICON)
 
@@ -13,24 +16,34 @@ window = pygame.display.set_mode(window_size)
 pygame.mixer.set_num_channels(64)
 
 from framework.core.core import Core, core_object
+from framework.core.asset_preloader import AssetPreloader
+from framework.core.asset_cache import AssetCache
 import src.settings as settings_module
 core = core_object
 core.init(window)
+if not core.is_web(): core.assets.cache = AssetCache(AssetCache.DEFAULT_PATH)
 core.FPS = 120
+core.FIXED_TIMESTEP = True
+#Only the menu is drawn through dirty rects : in game the scrolling background damages the whole window every frame
+core.DIRTY_RECT_RENDERING = True
+core.SIMULATION_RATE = 60
+core.profiler.frame_budget = 1000 / core.FPS
 if core.is_web(): core.setup_web(method=2)
 
 pygame.display.set_caption(GAME_TITLE)
 
 from framework.game.sprite import Sprite
+from framework.utils.render_list import RenderList
+from framework.game.scrolling_layer import ScrollingLayer
 Sprite._core_hint()
 
 from framework.utils.animation import Animation, AnimationTrack, _sprite_hint
 _sprite_hint()
 
-from framework.utils.ui.base_ui_elements import BaseUiElements, UiSprite
+from framework.utils.ui.base_ui_elements import BaseUiElements
 from framework.utils.ui.textsprite import TextSprite
 from framework.utils.helpers import rotate_around_pivot_accurate, copysign
-from framework.utils.particle_effects import ParticleEffect, Particle
+from framework.utils.particle_effects import ParticleEffect, Particle, ParticleBatch
 import framework.utils.particle_effects
 framework.utils.particle_effects.runtime_imports()
 from framework.utils.my_timer import Timer
@@ -49,38 +62,99 @@ core.menu.init()
 core.game.init()
 game_states.runtime_imports()
 
+#The menu can start a new game at any time, so it holds the game scene : ending a game then keeps its assets loaded.
+core.assets.enter_scene('game')
+core.menu.start_preload(AssetPreloader.for_scenes(core.assets, ['game'], workers=0 if core.is_web() else None))
+
+def draw_menu():
+    window.fill(core.menu.bg_color)
+    core.menu.render(window)
+
+def draw_game():
+    window.fill((94,129,162))
+    if core.MIX_UI_AND_SPRITES:
+        for element in RenderList.merged(Sprite.render_list, core.main_ui.render_list):
+            element.draw(window)
+    else:
+        Sprite.draw_all_sprites(window)
+        core.main_ui.render(window)
+
+def draw_frame(draw_function) -> list[pygame.Rect]|None:
+    '''Runs draw_function, clipped to the dirty rects of the frame when DIRTY_RECT_RENDERING is on and the menu is drawn.
+    Returns the areas of the window to update, or None for the whole window.
+    The game is always redrawn whole; core invalidates the dirty renderer when a game starts or ends.'''
+    if not core.DIRTY_RECT_RENDERING or draw_function is not draw_menu:
+        draw_function()
+        return None
+    elements = core.menu.get_render_elements()
+    rects : list[pygame.Rect] = core.dirty_renderer.get_dirty_rects(window, elements, core.dirty_display_rects)
+    for rect in rects:
+        window.set_clip(rect)
+        draw_function()
+    window.set_clip(None)
+    return rects
+
 clock = pygame.Clock()
-core.menu.menu_theme.play(-1)
 async def main():
     try:
         while 1:
+            profiler = core.profiler
+            mark : float = profiler.begin_frame()
             core.update_dt(60)
             for event in pygame.event.get():
                 core.event_manager.process_event(event)
+            mark = profiler.lap('events', mark)
 
             if core.game.active == False:
-                window.fill(core.menu.bg_color)
                 core.menu.update(core.dt)
-                core.menu.render(window)
+                mark = profiler.lap('menu', mark)
+                update_rects = draw_frame(draw_menu)
+                mark = profiler.lap('draw', mark)
             else:
-                core.game.state.main_logic(core.dt)
-                ParticleEffect.update_all()
-                window.fill((94,129,162))    
-                core.main_ui.update()
-                if core.MIX_UI_AND_SPRITES:
-                    element_list : list[Sprite|UiSprite] = Sprite.active_elements + core.main_ui.complete_list
-                    element_list.sort(key = lambda sprite : sprite.zindex)
-                    for element in element_list:
-                        element.draw(window)
+                if core.FIXED_TIMESTEP:
+                    for _ in range(core.get_simulation_steps()):
+                        if not core.game.active: break
+                        Sprite.store_previous_centers()
+                        ScrollingLayer.store_previous_scrolls()
+                        ParticleBatch.store_previous_positions()
+                        core.game.state.main_logic(core.sim_dt)
+                        mark = profiler.lap('main_logic', mark)
+                        ParticleEffect.update_all()
+                        mark = profiler.lap('particles', mark)
+                    Sprite.interpolate_rects(core.render_alpha)
+                    ScrollingLayer.interpolate(core.render_alpha)
+                    ParticleBatch.interpolate(core.render_alpha)
                 else:
-                    Sprite.draw_all_sprites(window)
-                    core.main_ui.render(window)
+                    core.game.state.main_logic(core.dt)
+                    mark = profiler.lap('main_logic', mark)
+                    ParticleEffect.update_all()
+                    mark = profiler.lap('particles', mark)
+                core.main_ui.update()
+                mark = profiler.lap('ui_update', mark)
+                update_rects = draw_frame(draw_game)
+                if core.FIXED_TIMESTEP:
+                    Sprite.restore_rects()
+                    ScrollingLayer.restore()
+                    ParticleBatch.restore()
+                mark = profiler.lap('draw', mark)
 
             core.update()
+            mark = profiler.lap('core_update', mark)
             if core.settings.brightness != 0:
-                window.blit(core.brightness_map, (0,0), special_flags=core.brightness_map_blend_mode)
+                for rect in (update_rects or [None]):
+                    window.set_clip(rect)
+                    window.blit(core.brightness_map, (0,0), special_flags=core.brightness_map_blend_mode)
+                window.set_clip(None)
+                mark = profiler.lap('brightness', mark)
+            profiler.end_frame()
+            profiler.draw(window)
+            if profiler.enabled and core.DIRTY_RECT_RENDERING:
+                #The overlay is drawn outside of the dirty rects, so it is pushed whole and erased by a full redraw once hidden
+                core.dirty_renderer.invalidate()
+                update_rects = None
                 
-            pygame.display.update()
+            if update_rects is None: pygame.display.update()
+            else: pygame.display.update(update_rects)
             core.frame_counter += 1
             clock.tick(core.FPS)
             await asyncio.sleep(0)
@@ -0,0 +1,28 @@
+import argparse
+import sys
+from headless import core
+from src.pool_planner import PoolPlanner, PoolPlan
+
+def main():
+    parser = argparse.ArgumentParser(description='Prints the pool sizes WAVE_DATA needs and flags pools configured too small for them.')
+    parser.add_argument('--wave', type=int, default=None, help='only plan this wave')
+    parser.add_argument('--telemetry', action='append', default=[], help='pool telemetry or benchmark.py results to merge in')
+    parser.add_argument('--enemy-lifetime', type=float, default=None, help='assumed seconds an enemy lives (default : forever)')
+    parser.add_argument('--summon-rounds', type=int, default=2, help='summon rounds a boss gets through before dying')
+    parser.add_argument('--strict', action='store_true', help='exit with code 1 if any pool is configured too small')
+    args = parser.parse_args()
+
+    core.LOGGING = False
+    planner : PoolPlanner = PoolPlanner(args.summon_rounds, args.enemy_lifetime)
+    for file_path in args.telemetry:
+        planner.load_telemetry(file_path)
+    plan : PoolPlan = planner.plan_wave(args.wave) if args.wave is not None else planner.plan_game()
+    for name, size in sorted(plan.items()):
+        print(f'{name:20} {size:6} (configured : {planner.base_capacity.get(name, 0)})')
+    over_capacity : list[str] = planner.get_over_capacity(plan)
+    if over_capacity:
+        print('Over capacity :\n  ' + '\n  '.join(over_capacity))
+        if args.strict: sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -14,9 +14,11 @@ from framework.utils.ui.base_ui_elements import BaseUiElements
 import framework.utils.interpolation as interpolation
 from framework.utils.my_timer import Timer, TimeSource
 from framework.game.sprite import Sprite
+from framework.game.scrolling_layer import ScrollingLayer
+from framework.core.asset_manager import asset_manager
 from framework.utils.helpers import average, random_float, ColorType
 from framework.utils.ui.brightness_overlay import BrightnessOverlay
-from framework.utils.particle_effects import ParticleEffect, Particle
+from framework.utils.particle_effects import ParticleEffect, Particle, ParticleBatch
 
 class GameState:
     def __init__(self, game_object : 'Game'):
@@ -44,6 +46,8 @@ class NormalGameState(GameState):
     def main_logic(self, delta : float):
         Sprite.update_all_sprites(delta)
         Sprite.update_all_registered_classes(delta)
+        ScrollingLayer.update_all(delta)
+        ParticleBatch.update_all(delta)
 
     def pause(self):
         if not self.game.active: return
@@ -328,11 +332,8 @@ WAVE_DATA : dict[int, WaveData] = {
 SCORE_EVENT = pygame.event.custom_type()
 
 class MainGameState(NormalGameState):
-    main_theme : pygame.mixer.Sound = pygame.mixer.Sound("assets/audio/music/theme2_trimmed_good.ogg")
-    main_theme.set_volume(0.2)
-
-    boss_theme : pygame.mixer.Sound = pygame.mixer.Sound("assets/audio/music/theme1.ogg")
-    boss_theme.set_volume(0.2)
+    main_theme : pygame.mixer.Sound = asset_manager.add_sound('main_theme', "assets/audio/music/theme2_trimmed_good.ogg", 0.2, scenes=['game'])
+    boss_theme : pygame.mixer.Sound = asset_manager.add_sound('boss_theme', "assets/audio/music/theme1.ogg", 0.2, scenes=['boss'])
 
     @property
     def score(self):
@@ -350,6 +351,7 @@ class MainGameState(NormalGameState):
         self.score_sprite : TextSprite
         self._score : int
         if prev_main_state is None:
+            pool_planner.prepare_game(wave_num)
             self.spawn_background()
             core_object.fps_sprite.visible = False
             self.player = Player.spawn("midbottom", pygame.Vector2(480, 520))
@@ -374,6 +376,9 @@ class MainGameState(NormalGameState):
         core_object.event_manager.bind(SCORE_EVENT, self.handle_score_event)
 
         self.wave_number : int = wave_num
+        self.in_boss_scene : bool = self.has_bosses(WAVE_DATA[wave_num])
+        if self.in_boss_scene:
+            asset_manager.enter_scene('boss', preload=True)
         self.game.alert_player(f"Wave {self.wave_number} start")
         if not core_object.bg_manager.get_all_type("Music"):
             core_object.bg_manager.play(self.main_theme, 1.0, fade_ms=2000)
@@ -382,17 +387,23 @@ class MainGameState(NormalGameState):
         if event.type == SCORE_EVENT:
             self.score += event.score
 
+    @staticmethod
+    def has_bosses(wave_data : WaveData) -> bool:
+        return bool(wave_data['bosses']) or any(wave_data['enemies'].get(boss_type.value, 0) > 0 for boss_type in BossTypes)
+
+    def exit_boss_scene(self):
+        if not self.in_boss_scene: return
+        self.in_boss_scene = False
+        asset_manager.exit_scene('boss')
+
     def spawn_background(self):
-        bg = Background.spawn(core_object.main_display.get_size()[1])
-        while True:
-            if bg.rect.top > 0:
-                bg = Background.spawn(bg.rect.top)
-            else:
-                break
+        Background.spawn()
 
     def main_logic(self, delta : float):
         Sprite.update_all_sprites(delta)
         Sprite.update_all_registered_classes(delta)
+        ScrollingLayer.update_all(delta)
+        ParticleBatch.update_all(delta)
         self.control_script.process_frame(delta)
         if self.player.current_hp <= 0:
             self.transition_to_gameover()
@@ -410,6 +421,7 @@ class MainGameState(NormalGameState):
         self.game.state = GameOverGameState(self.game, "You win!", prev_state=self)
     
     def transition_to_shop(self):
+        self.exit_boss_scene()
         self.game.state = ShopGameState(self.game, self.wave_number, self)
     
 
@@ -418,6 +430,7 @@ class MainGameState(NormalGameState):
             core_object.storage.high_score = self.score
             core_object.storage.save(core_object.is_web())
         super().cleanup()
+        self.exit_boss_scene()
         src.sprites.player.remove_connections()
         core_object.bg_manager.stop_all_music()
         core_object.event_manager.unbind(SCORE_EVENT, self.handle_score_event)
@@ -701,9 +714,13 @@ class ShopGameState(NormalGameState):
         core_object.log(f"Applied upgrade - {upgrade_type}: {upgrade_value}")
             
     
+    POOL_SHRINK_RATE : int = 8
     def main_logic(self, delta : float):
         Sprite.update_all_sprites(delta)
         Sprite.update_all_registered_classes(delta)
+        ScrollingLayer.update_all(delta)
+        ParticleBatch.update_all(delta)
+        Sprite.shrink_pools(self.POOL_SHRINK_RATE)
         self.control_script.process_frame(delta)
         if self.control_script.is_over:
             self.transition_to_main()
@@ -966,6 +983,7 @@ class GameOverGameState(GameState):
 
     def main_logic(self, delta : float):
         Particle.update_all(delta)
+        ParticleBatch.update_all(delta)
         self.control_script.process_frame(delta)
         if self.control_script.is_over:
             pygame.event.post(pygame.Event(core_object.END_GAME, {}))
@@ -1062,6 +1080,10 @@ def runtime_imports():
     from src.sprites.projectiles import BaseProjectile
     src.sprites.projectiles.runtime_imports()
 
+    global pool_planner
+    import src.pool_planner
+    from src.pool_planner import pool_planner
+
 class NetworkTestGameState(NormalGameState):
     def __init__(self, game_object : 'Game'):
         self.game = game_object
@@ -1214,4 +1236,4 @@ def initialise_game(game_object : 'Game', event : pygame.Event):
     if event.mode == 'test' and (not True):
         game_object.state = game_object.STATES.NetworkTestGameState(game_object)
     else:
-        game_object.state = MainGameState(game_object)
+        game_object.state = MainGameState(game_object, wave_num=event.dict.get('wave', 1))
@@ -1,6 +1,7 @@
 import pygame
 import random
 from framework.core.base_menu import BaseMenu
+from framework.core.asset_manager import asset_manager
 from framework.utils.ui.ui_sprite import UiSprite
 from framework.utils.ui.ui_sprite_group import UiSpriteGroup
 from framework.utils.ui.textsprite import TextSprite
@@ -42,14 +43,13 @@ class TipUiGroup(UiSpriteGroup):
 
 class Menu(BaseMenu):
     """Implementation of the menu class."""
-    font_40 = pygame.font.Font(r'assets/fonts/Pixeltype.ttf', 40)
-    font_50 = pygame.font.Font(r'assets/fonts/Pixeltype.ttf', 50)
-    font_60 = pygame.font.Font(r'assets/fonts/Pixeltype.ttf', 60)
-    font_70 = pygame.font.Font(r'assets/fonts/Pixeltype.ttf', 70)
-    font_150 = pygame.font.Font(r'assets/fonts/Pixeltype.ttf', 150)
+    font_40 = asset_manager.add_font('pixeltype_40', r'assets/fonts/Pixeltype.ttf', 40)
+    font_50 = asset_manager.add_font('pixeltype_50', r'assets/fonts/Pixeltype.ttf', 50)
+    font_60 = asset_manager.add_font('pixeltype_60', r'assets/fonts/Pixeltype.ttf', 60)
+    font_70 = asset_manager.add_font('pixeltype_70', r'assets/fonts/Pixeltype.ttf', 70)
+    font_150 = asset_manager.add_font('pixeltype_150', r'assets/fonts/Pixeltype.ttf', 150)
 
-    menu_theme : pygame.mixer.Sound = pygame.mixer.Sound("assets/audio/music/menu1_trimmed.ogg")
-    menu_theme.set_volume(0.2)
+    menu_theme : pygame.mixer.Sound = asset_manager.add_sound('menu_theme', "assets/audio/music/menu1_trimmed.ogg", 0.2)
     @staticmethod
     def _get_core_object():
         """Function that imports the core object at runtime."""
@@ -67,6 +67,9 @@ class Menu(BaseMenu):
         self.menu_theme.play()
         self.update_high_score()
     
+    def on_preload_done(self):
+        self.menu_theme.play(-1)
+
     def init(self):
         """Initialises a menu object. Must be ran after runtime imports."""
         self._get_core_object()
@@ -158,6 +161,7 @@ class Menu(BaseMenu):
         match self.stage:
             case 1:
                 if name == "play_button":
+                    self.finish_preload()
                     self.menu_theme.stop()
                     pygame.event.post(pygame.Event(core_object.START_GAME, {'mode' : 'test'}))
                 elif name == 'reset_button':
@@ -0,0 +1,145 @@
+import json
+from math import ceil, hypot
+from typing import TypeAlias
+from framework.game.sprite import Sprite
+from framework.core.core import core_object
+from src.game_states import WAVE_DATA, WaveData
+from src.sprites.projectiles import FirePattern
+from src.sprites.enemy import BasicEnemy, EliteEnemy, GunnerEnemy, RunnerEnemy
+from src.sprites.bosses import BasicBoss, GoldenBoss, SpaceshipBoss, FinalBoss
+from src.sprites.player import Player
+
+PoolPlan : TypeAlias = dict[str, int]
+PoolTelemetry : TypeAlias = dict[str, dict[str, int]]
+
+NORMAL_ENEMY_CLASSES : dict[str, type[Sprite]] = {'basic' : BasicEnemy, 'elite' : EliteEnemy, 'gunner' : GunnerEnemy, 'runner' : RunnerEnemy}
+BOSS_CLASSES : dict[str, type[Sprite]] = {'basic_boss' : BasicBoss, 'golden_boss' : GoldenBoss,
+                                          'spaceship_boss' : SpaceshipBoss, 'final_boss' : FinalBoss}
+#Mirrors BasicWaveControlScript.spawn_enemy, which spawns a SpaceshipBoss for 'final_boss' entries.
+WAVE_ENEMY_CLASSES : dict[str, type[Sprite]] = {**NORMAL_ENEMY_CLASSES, **BOSS_CLASSES, 'final_boss' : SpaceshipBoss}
+FIRST_SPAWN_DELAY : float = 1.5
+
+class PoolPlanner:
+    '''Works out how many elements of each sprite class a wave can need at once, from WAVE_DATA and the FIRE_PATTERNS
+    and SUMMONS of the units in it. Recorded pool telemetry (see Sprite.get_pool_telemetry) can be merged in for classes,
+    like particles, that have no static model.
+    The estimates are upper bounds: unless enemy_lifetime is given, enemies are assumed to never die.'''
+    def __init__(self, summon_rounds : int = 2, enemy_lifetime : float|None = None, headroom : float = 1.1) -> None:
+        self.summon_rounds : int = summon_rounds
+        self.enemy_lifetime : float|None = enemy_lifetime
+        self.headroom : float = headroom
+        self.telemetry_plan : PoolPlan = {}
+        self.base_capacity : PoolPlan = {sprite_class.__name__ : size for sprite_class, size in Sprite.pool_targets.items()}
+        self._unit_demands : dict[type[Sprite], PoolPlan] = {}
+
+    @staticmethod
+    def get_live_projectiles(pattern : FirePattern) -> int:
+        '''How many projectiles of one pattern can be alive at once, if each crosses the whole screen diagonally.'''
+        distance : float = hypot(*core_object.main_display.get_size())
+        lifetime : float = distance / (pattern['speed'] * 60)
+        return ceil(pattern['volleys_per_second'] * pattern['projectiles_per_volley'] * lifetime)
+
+    def get_unit_demand(self, unit_class : type[Sprite]) -> PoolPlan:
+        '''Peak sprites one unit of unit_class keeps alive at once: itself, its projectiles and its summons.'''
+        if unit_class in self._unit_demands:
+            return self._unit_demands[unit_class]
+        demand : PoolPlan = {unit_class.__name__ : 1}
+        for pattern in getattr(unit_class, 'FIRE_PATTERNS', []):
+            demand[pattern['projectile']] = demand.get(pattern['projectile'], 0) + self.get_live_projectiles(pattern)
+        for count, candidates in getattr(unit_class, 'SUMMONS', []):
+            summoned : PoolPlan = {}
+            for candidate in candidates:
+                for name, amount in self.get_unit_demand(WAVE_ENEMY_CLASSES[candidate]).items():
+                    summoned[name] = max(summoned.get(name, 0), amount * count * self.summon_rounds)
+            add_plans(demand, summoned)
+        self._unit_demands[unit_class] = demand
+        return demand
+
+    def get_peak_enemy_count(self, wave_data : WaveData) -> int:
+        '''Replays the spawn timer of BasicWaveControlScript. Without an enemy_lifetime, every enemy of the wave can be alive at once.'''
+        total : int = sum(wave_data['enemies'].values())
+        if self.enemy_lifetime is None: return total
+        time : float = FIRST_SPAWN_DELAY
+        deaths : list[float] = []
+        peak : int = 0
+        for _ in range(total):
+            deaths = [death for death in deaths if death > time]
+            interval : float = wave_data['spawn_cooldown'] + wave_data['spawn_rate_penalty_per_enemy'] * len(deaths)
+            deaths.append(time + self.enemy_lifetime)
+            peak = max(peak, len(deaths))
+            time += interval
+        return peak
+
+    def plan_wave(self, wave_number : int) -> PoolPlan:
+        wave_data : WaveData = WAVE_DATA[wave_number]
+        peak : int = self.get_peak_enemy_count(wave_data)
+        unit_demands : list[tuple[int, PoolPlan]] = [(count, self.get_unit_demand(WAVE_ENEMY_CLASSES[enemy_type]))
+                                                     for enemy_type, count in wave_data['enemies'].items() if count > 0]
+        plan : PoolPlan = {}
+        for name in {name for _, demand in unit_demands for name in demand}:
+            remaining : int = peak
+            needed : int = 0
+            for count, demand in sorted(unit_demands, key=lambda entry : entry[1].get(name, 0), reverse=True):
+                if remaining <= 0 or name not in demand: break
+                taken : int = min(count, remaining)
+                needed += taken * demand[name]
+                remaining -= taken
+            plan[name] = needed
+        for boss_type in wave_data['bosses']:
+            max_plans(plan, self.get_unit_demand(BOSS_CLASSES[boss_type]))
+        add_plans(plan, self.get_unit_demand(Player))
+        max_plans(plan, self.telemetry_plan)
+        return plan
+
+    def plan_game(self, start_wave : int = 1) -> PoolPlan:
+        plan : PoolPlan = {}
+        for wave_number in WAVE_DATA:
+            if wave_number < start_wave: continue
+            max_plans(plan, self.plan_wave(wave_number))
+        return plan
+
+    def merge_telemetry(self, telemetry : PoolTelemetry):
+        for name, stats in telemetry.items():
+            needed : int = ceil(stats['high_water'] * self.headroom)
+            self.telemetry_plan[name] = max(self.telemetry_plan.get(name, 0), needed)
+
+    def load_telemetry(self, file_path : str):
+        '''Accepts either the output of Sprite.get_pool_telemetry or a benchmark.py result file.'''
+        with open(file_path, 'r') as file:
+            data : dict = json.load(file)
+        if 'scenarios' in data:
+            for scenario in data['scenarios'].values():
+                self.merge_telemetry(scenario.get('pools', {}))
+        else:
+            self.merge_telemetry(data)
+
+    def get_over_capacity(self, plan : PoolPlan) -> list[str]:
+        '''One line per class whose planned size is above the size it is configured with at import.'''
+        return [f'{name} needs {size} but is configured for {self.base_capacity.get(name, 0)}'
+                for name, size in plan.items() if size > self.base_capacity.get(name, 0)]
+
+    def prepare(self, plan : PoolPlan):
+        '''Grows every planned pool to its planned size, so none has to grow while the plan holds.'''
+        classes : dict[str, type[Sprite]] = {sprite_class.__name__ : sprite_class for sprite_class in Sprite.registered_classes}
+        for name, size in plan.items():
+            sprite_class : type[Sprite]|None = classes.get(name)
+            if sprite_class is None: continue
+            if size > Sprite.pool_targets.get(sprite_class, 0):
+                sprite_class.configure_pool(size)
+
+    def prepare_game(self, start_wave : int = 1):
+        plan : PoolPlan = self.plan_game(start_wave)
+        if core_object.IS_DEBUG:
+            for line in self.get_over_capacity(plan):
+                core_object.log(f'Pool planner : {line}')
+        self.prepare(plan)
+
+def add_plans(plan : PoolPlan, other : PoolPlan):
+    for name, size in other.items():
+        plan[name] = plan.get(name, 0) + size
+
+def max_plans(plan : PoolPlan, other : PoolPlan):
+    for name, size in other.items():
+        plan[name] = max(plan.get(name, 0), size)
+
+pool_planner : PoolPlanner = PoolPlanner()
@@ -1,12 +1,13 @@
 import pygame
 from typing import Generator, TypeAlias, Literal
 from framework.game.sprite import Sprite
-from framework.utils.helpers import load_alpha_to_colorkey, recolor_image, remove_image_empty
+from framework.utils.helpers import cached_recolor_image
 from framework.utils.my_timer import Timer, TimeSource
 from framework.core.core import core_object
+from framework.core.asset_manager import asset_manager
 from framework.game.coroutine_scripts import CoroutineScript
 import src.sprites.projectiles
-from src.sprites.projectiles import NormalProjectile, BaseProjectile, HomingProjectile, Teams
+from src.sprites.projectiles import NormalProjectile, BaseProjectile, HomingProjectile, Teams, FirePattern
 import src.sprites.enemy
 from src.sprites.enemy import BaseEnemy, EnemyType, BasicEnemy, GunnerEnemy, EliteEnemy, BaseNormalEnemy
 import random
@@ -58,10 +59,10 @@ class BasicBoss(BaseBoss):
     active_elements : list['BasicBoss'] = []
     inactive_elements : list['BasicBoss'] = []
     linked_classes : list['Sprite'] = [Sprite, BaseEnemy, BaseBoss]
+    FIRE_PATTERNS : list[FirePattern] = [{'projectile' : 'NormalProjectile', 'volleys_per_second' : 4, 'projectiles_per_volley' : 3, 'speed' : 8}]
 
-    basic_boss_image : pygame.Surface = pygame.transform.scale_by(load_alpha_to_colorkey('assets/graphics/enemy/alien.png', 
-                                                                                         (0, 255, 0)), 2)
-    basic_boss_image = remove_image_empty(basic_boss_image)
+    basic_boss_image : pygame.Surface = asset_manager.add_image('basic_boss', 'assets/graphics/enemy/alien.png', (0, 255, 0), scale=2, crop=True,
+                                                                scenes=['boss'])
     def __init__(self):
         super().__init__()
         self.control_script : BasicBossControlScript
@@ -71,10 +72,10 @@ class BasicBoss(BaseBoss):
 
     @classmethod
     def spawn(cls):
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
 
         element.image = BasicBoss.basic_boss_image
-        element.mask = pygame.mask.from_surface(element.image)
+        element.use_image_mask()
         element.rect = element.image.get_rect()
 
         element.position = pygame.Vector2(0, 0)
@@ -122,6 +123,7 @@ class BasicBoss(BaseBoss):
         self.health_bar.surf.fill((90, 90, 90))
         pygame.draw.rect(self.health_bar.surf, self.get_healthbar_color(health_percentage), (0, 0, bar_width, bar_height))
         self.health_bar.rect.midbottom = self.rect.midtop + pygame.Vector2(0, -2)
+        self.health_bar.mark_dirty()
     
     def update(self, delta: float):
         next_script = self.control_script.process_frame(delta)
@@ -131,7 +133,6 @@ class BasicBoss(BaseBoss):
         elif self.control_script.is_over:
             self.kill_instance_safe()
             return
-        self.check_collisions()
         self.update_healthbar_visual()
     
     def fire_homing_projectile(self, angle : float = 0) -> HomingProjectile:
@@ -143,7 +144,7 @@ class BasicBoss(BaseBoss):
     def fire_normal_projectile(self, angle : float = 0) -> NormalProjectile:
         return NormalProjectile.spawn(self.position + pygame.Vector2(0, self.rect.height // 2 - 10), pygame.Vector2(0, 8).rotate(angle), 
                                       None, None, angle,
-        recolor_image(BaseProjectile.normal_image3, "Red"),  team=Teams.ENEMY)
+        cached_recolor_image(BaseProjectile.normal_image3, "Red"),  team=Teams.ENEMY)
     
     def clean_instance(self):
         super().clean_instance()
@@ -385,10 +386,11 @@ class GoldenBoss(BaseBoss):
     active_elements : list['GoldenBoss'] = []
     inactive_elements : list['GoldenBoss'] = []
     linked_classes : list['Sprite'] = [Sprite, BaseEnemy, BaseBoss]
+    FIRE_PATTERNS : list[FirePattern] = [{'projectile' : 'NormalProjectile', 'volleys_per_second' : 4, 'projectiles_per_volley' : 1, 'speed' : 8},
+                                         {'projectile' : 'HomingProjectile', 'volleys_per_second' : 4, 'projectiles_per_volley' : 2, 'speed' : 8}]
 
-    golden_boss_image : pygame.Surface = pygame.transform.scale_by(load_alpha_to_colorkey('assets/graphics/enemy/elite_enemy.png', 
-                                                                                         (0, 255, 0)), 2)
-    golden_boss_image = remove_image_empty(golden_boss_image)
+    golden_boss_image : pygame.Surface = asset_manager.add_image('golden_boss', 'assets/graphics/enemy/elite_enemy.png', (0, 255, 0), scale=2, crop=True,
+                                                                 scenes=['boss'])
     def __init__(self):
         super().__init__()
         self.control_script : GoldenBossControlScript
@@ -398,10 +400,10 @@ class GoldenBoss(BaseBoss):
 
     @classmethod
     def spawn(cls):
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
 
         element.image = GoldenBoss.golden_boss_image
-        element.mask = pygame.mask.from_surface(element.image)
+        element.use_image_mask()
         element.rect = element.image.get_rect()
 
         element.position = pygame.Vector2(0, 0)
@@ -449,6 +451,7 @@ class GoldenBoss(BaseBoss):
         self.health_bar.surf.fill((90, 90, 90))
         pygame.draw.rect(self.health_bar.surf, self.get_healthbar_color(health_percentage), (0, 0, bar_width, bar_height))
         self.health_bar.rect.midbottom = self.rect.midtop + pygame.Vector2(0, -2)
+        self.health_bar.mark_dirty()
     
     def update(self, delta: float):
         next_script = self.control_script.process_frame(delta)
@@ -458,7 +461,6 @@ class GoldenBoss(BaseBoss):
         elif self.control_script.is_over:
             self.kill_instance_safe()
             return
-        self.check_collisions()
         self.update_healthbar_visual()
     
     def fire_homing_projectile(self, angle : float = 0, speed : float = 4.5, rate : float = 0.8, h_range : float = 300) -> HomingProjectile:
@@ -471,7 +473,7 @@ class GoldenBoss(BaseBoss):
     def fire_normal_projectile(self, angle : float = 0) -> NormalProjectile:
         return NormalProjectile.spawn(self.position + pygame.Vector2(0, self.rect.height // 2 - 10), pygame.Vector2(0, 8).rotate(angle), 
                                       None, None, 0,
-        recolor_image(BaseProjectile.normal_image3, "Red"),  team=Teams.ENEMY)
+        cached_recolor_image(BaseProjectile.normal_image3, "Red"),  team=Teams.ENEMY)
     
     def clean_instance(self):
         super().clean_instance()
@@ -762,13 +764,15 @@ class SpaceshipBoss(BaseBoss):
     active_elements : list['SpaceshipBoss'] = []
     inactive_elements : list['SpaceshipBoss'] = []
     linked_classes : list['Sprite'] = [Sprite, BaseEnemy, BaseBoss]
-
-    spaceship_boss_image : pygame.Surface = pygame.transform.scale_by(load_alpha_to_colorkey('assets/graphics/bosses/spaceship-normal.png', 
-                                                                                         (0, 255, 0)), 1.5)
-    spaceship_boss_image = remove_image_empty(spaceship_boss_image)
-    spaceship_boss_active_image : pygame.Surface = pygame.transform.scale_by(load_alpha_to_colorkey('assets/graphics/bosses/spaceship-hot.png', 
-                                                                                         (0, 255, 0)), 1.5)
-    spaceship_boss_active_image = remove_image_empty(spaceship_boss_active_image)
+    FIRE_PATTERNS : list[FirePattern] = [{'projectile' : 'NormalProjectile', 'volleys_per_second' : 4, 'projectiles_per_volley' : 1, 'speed' : 8},
+                                         {'projectile' : 'NormalProjectile', 'volleys_per_second' : 4, 'projectiles_per_volley' : 3, 'speed' : 8},
+                                         {'projectile' : 'HomingProjectile', 'volleys_per_second' : 4, 'projectiles_per_volley' : 2, 'speed' : 8}]
+    SUMMONS : list[tuple[int, list[str]]] = [(7, ['basic', 'elite', 'gunner'])]
+
+    spaceship_boss_image : pygame.Surface = asset_manager.add_image('spaceship_boss', 'assets/graphics/bosses/spaceship-normal.png', (0, 255, 0), scale=1.5, crop=True,
+                                                                    scenes=['boss'])
+    spaceship_boss_active_image : pygame.Surface = asset_manager.add_image('spaceship_boss_active', 'assets/graphics/bosses/spaceship-hot.png', (0, 255, 0), scale=1.5, crop=True,
+                                                                           scenes=['boss'])
     def __init__(self):
         super().__init__()
         self.control_script : SpaceshipBossControlScript
@@ -778,10 +782,10 @@ class SpaceshipBoss(BaseBoss):
 
     @classmethod
     def spawn(cls):
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
 
         element.image = SpaceshipBoss.spaceship_boss_image
-        element.mask = pygame.mask.from_surface(element.image)
+        element.use_image_mask()
         element.rect = element.image.get_rect()
 
         element.position = pygame.Vector2(0, 0)
@@ -829,6 +833,7 @@ class SpaceshipBoss(BaseBoss):
         self.health_bar.surf.fill((90, 90, 90))
         pygame.draw.rect(self.health_bar.surf, self.get_healthbar_color(health_percentage), (0, 0, bar_width, bar_height))
         self.health_bar.rect.midbottom = self.rect.midtop + pygame.Vector2(0, -2)
+        self.health_bar.mark_dirty()
     
     def update(self, delta: float):
         next_script = self.control_script.process_frame(delta)
@@ -838,7 +843,6 @@ class SpaceshipBoss(BaseBoss):
         elif self.control_script.is_over:
             self.kill_instance_safe()
             return
-        self.check_collisions()
         self.update_healthbar_visual()
     
     def fire_homing_projectile(self, angle : float = 0, speed : float = 4.5, rate : float = 0.8, h_range : float = 300) -> HomingProjectile:
@@ -851,7 +855,7 @@ class SpaceshipBoss(BaseBoss):
     def fire_normal_projectile(self, angle : float = 0) -> NormalProjectile:
         return NormalProjectile.spawn(self.position + pygame.Vector2(0, self.rect.height // 2 + 10), pygame.Vector2(0, 8).rotate(angle), 
                                       None, None, angle,
-        recolor_image(BaseProjectile.normal_image3, "Red"),  team=Teams.ENEMY)
+        cached_recolor_image(BaseProjectile.normal_image3, "Red"),  team=Teams.ENEMY)
     
     def clean_instance(self):
         super().clean_instance()
@@ -1277,13 +1281,15 @@ class FinalBoss(BaseBoss):
     active_elements : list['FinalBoss'] = []
     inactive_elements : list['FinalBoss'] = []
     linked_classes : list['Sprite'] = [Sprite, BaseEnemy, BaseBoss]
-
-    final_boss_image : pygame.Surface = pygame.transform.scale_by(load_alpha_to_colorkey('assets/graphics/bosses/final_boss.png', 
-                                                                                         (0, 255, 0)), 1.5)
-    final_boss_image = remove_image_empty(final_boss_image)
-    final_boss_active_image : pygame.Surface = pygame.transform.scale_by(load_alpha_to_colorkey('assets/graphics/bosses/final_boss-hot.png', 
-                                                                                         (0, 255, 0)), 1.5)
-    final_boss_active_image = remove_image_empty(final_boss_active_image)
+    FIRE_PATTERNS : list[FirePattern] = [{'projectile' : 'NormalProjectile', 'volleys_per_second' : 4, 'projectiles_per_volley' : 1, 'speed' : 8},
+                                         {'projectile' : 'NormalProjectile', 'volleys_per_second' : 4, 'projectiles_per_volley' : 3, 'speed' : 8},
+                                         {'projectile' : 'HomingProjectile', 'volleys_per_second' : 4, 'projectiles_per_volley' : 2, 'speed' : 8}]
+    SUMMONS : list[tuple[int, list[str]]] = [(8, ['basic', 'elite', 'gunner']), (1, ['basic_boss']), (1, ['golden_boss'])]
+
+    final_boss_image : pygame.Surface = asset_manager.add_image('final_boss', 'assets/graphics/bosses/final_boss.png', (0, 255, 0), scale=1.5, crop=True,
+                                                                scenes=['boss'])
+    final_boss_active_image : pygame.Surface = asset_manager.add_image('final_boss_active', 'assets/graphics/bosses/final_boss-hot.png', (0, 255, 0), scale=1.5, crop=True,
+                                                                       scenes=['boss'])
     def __init__(self):
         super().__init__()
         self.control_script : FinalBossControlScript
@@ -1293,10 +1299,10 @@ class FinalBoss(BaseBoss):
 
     @classmethod
     def spawn(cls):
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
 
         element.image = FinalBoss.final_boss_image
-        element.mask = pygame.mask.from_surface(element.image)
+        element.use_image_mask()
         element.rect = element.image.get_rect()
 
         element.position = pygame.Vector2(0, 0)
@@ -1344,6 +1350,7 @@ class FinalBoss(BaseBoss):
         self.health_bar.surf.fill((90, 90, 90))
         pygame.draw.rect(self.health_bar.surf, self.get_healthbar_color(health_percentage), (0, 0, bar_width, bar_height))
         self.health_bar.rect.midbottom = self.rect.midtop + pygame.Vector2(0, -2)
+        self.health_bar.mark_dirty()
     
     def update(self, delta: float):
         next_script = self.control_script.process_frame(delta)
@@ -1353,7 +1360,6 @@ class FinalBoss(BaseBoss):
         elif self.control_script.is_over:
             self.kill_instance_safe()
             return
-        self.check_collisions()
         self.update_healthbar_visual()
     
     def fire_homing_projectile(self, angle : float = 0, speed : float = 4.5, rate : float = 0.8, h_range : float = 300) -> HomingProjectile:
@@ -1366,7 +1372,7 @@ class FinalBoss(BaseBoss):
     def fire_normal_projectile(self, angle : float = 0) -> NormalProjectile:
         return NormalProjectile.spawn(self.position + pygame.Vector2(0, self.rect.height // 2 + 10), pygame.Vector2(0, 8).rotate(angle), 
                                       None, None, angle,
-        recolor_image(BaseProjectile.normal_image3, "Red"),  team=Teams.ENEMY)
+        cached_recolor_image(BaseProjectile.normal_image3, "Red"),  team=Teams.ENEMY)
     
     def clean_instance(self):
         super().clean_instance()
@@ -1806,7 +1812,7 @@ Sprite.register_class(BasicBoss)
 Sprite.register_class(GoldenBoss)
 Sprite.register_class(SpaceshipBoss)
 Sprite.register_class(FinalBoss)
-for _ in range(5) : BasicBoss()
-for _ in range(5) : GoldenBoss()
-for _ in range(2) : SpaceshipBoss()
-for _ in range(2) : FinalBoss()
\ No newline at end of file
+BasicBoss.configure_pool(5, growth_chunk=1)
+GoldenBoss.configure_pool(5, growth_chunk=1)
+SpaceshipBoss.configure_pool(2, growth_chunk=1)
+FinalBoss.configure_pool(2, growth_chunk=1)
\ No newline at end of file
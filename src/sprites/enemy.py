@@ -1,13 +1,15 @@
 import pygame
 from typing import Generator, TypeAlias, Literal
 from framework.game.sprite import Sprite
-from framework.utils.helpers import load_alpha_to_colorkey, recolor_image
+from framework.game.collision_matrix import CollisionRule
+from framework.utils.helpers import cached_recolor_image
 from framework.utils.my_timer import Timer, TimeSource
 from framework.core.core import core_object
+from framework.core.asset_manager import asset_manager
 from framework.game.coroutine_scripts import CoroutineScript
 import src.sprites.projectiles
 from src.game_states import SCORE_EVENT
-from src.sprites.projectiles import NormalProjectile, BaseProjectile, HomingProjectile, Teams, ScatterProjectile
+from src.sprites.projectiles import NormalProjectile, BaseProjectile, HomingProjectile, Teams, ScatterProjectile, FirePattern
 import random
 from enum import Enum
 from framework.utils.particle_effects import ParticleEffect
@@ -17,16 +19,14 @@ class BaseEnemy(Sprite):
     active_elements : list['BaseEnemy'] = []
     inactive_elements : list['BaseEnemy'] = []
     linked_classes : list['Sprite'] = [Sprite]
+    FIRE_PATTERNS : list[FirePattern] = []
+    SUMMONS : list[tuple[int, list[str]]] = []
 
-    default_image : pygame.Surface = pygame.transform.rotate(
-        load_alpha_to_colorkey("assets/graphics/enemy/enemy_v1-1.png", (0, 255, 0)),
-        180)
-    default_image2 : pygame.Surface = load_alpha_to_colorkey("assets/graphics/enemy/alien.png", (0, 255, 0))
+    default_image : pygame.Surface = asset_manager.add_image('enemy_v1', "assets/graphics/enemy/enemy_v1-1.png", (0, 255, 0), angle=180)
+    default_image2 : pygame.Surface = asset_manager.add_image('alien', "assets/graphics/enemy/alien.png", (0, 255, 0))
     display_size : tuple[int, int] = core_object.main_display.get_size()
-    enemy_hit_sfx : pygame.mixer.Sound = pygame.mixer.Sound("assets/audio/sfx/enemy_hit.ogg")
-    enemy_hit_sfx.set_volume(0.41)
-    enemy_killed_sfx : pygame.mixer.Sound = pygame.mixer.Sound("assets/audio/sfx/enemy_killed2.ogg")
-    enemy_killed_sfx.set_volume(0.50)
+    enemy_hit_sfx : pygame.mixer.Sound = asset_manager.add_sound('enemy_hit', "assets/audio/sfx/enemy_hit.ogg", 0.41)
+    enemy_killed_sfx : pygame.mixer.Sound = asset_manager.add_sound('enemy_killed', "assets/audio/sfx/enemy_killed2.ogg", 0.50)
     KILL_SCORE : int = 5
 
     health_epsilon : float = 0.01
@@ -41,10 +41,10 @@ class BaseEnemy(Sprite):
     @classmethod
     def spawn(cls, position_anchor : str, position : int|pygame.Vector2):
         raise NotImplementedError("Cannot instanciate base-class BaseEnemy; sub-class must implement this method")
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
 
         element.image = element.default_image
-        element.mask = pygame.mask.from_surface(element.image)
+        element.use_image_mask()
         element.rect = element.image.get_rect()
 
         element.position = pygame.Vector2(0, 0)
@@ -81,22 +81,19 @@ class BaseEnemy(Sprite):
             self.give_score(1)
 
 
-    def check_collisions(self):
-        colliding_projectiles : list[BaseProjectile] = [elem for elem in self.get_all_colliding(BaseProjectile) if elem.team in (Teams.ALLIED, Teams.FFA)]
-        if colliding_projectiles:
-            for elem in colliding_projectiles:
-                if isinstance(elem, ScatterProjectile):
-                    if self in elem.ignore:
-                        continue
-                self.when_hit(elem)
-                if isinstance(elem, HomingProjectile):
-                    if elem.explosive_range:
-                        elem.explode(self)
-                elif isinstance(elem, ScatterProjectile):
-                    elem.scatter(self)
-                elem.kill_instance()
-                if self._zombie:
-                    break
+    def can_be_hit_by(self, projectile : BaseProjectile) -> bool:
+        if isinstance(projectile, ScatterProjectile):
+            return self not in projectile.ignore
+        return True
+
+    def on_collision(self, other : BaseProjectile):
+        self.when_hit(other)
+        if isinstance(other, HomingProjectile):
+            if other.explosive_range:
+                other.explode(self)
+        elif isinstance(other, ScatterProjectile):
+            other.scatter(self)
+        other.kill_instance()
 
     def clean_instance(self):
         super().clean_instance()
@@ -121,6 +118,7 @@ class BasicEnemy(BaseNormalEnemy):
     active_elements : list['BasicEnemy'] = []
     inactive_elements : list['BasicEnemy'] = []
     linked_classes : list['Sprite'] = [Sprite, BaseEnemy, BaseNormalEnemy]
+    FIRE_PATTERNS : list[FirePattern] = [{'projectile' : 'NormalProjectile', 'volleys_per_second' : 0.34, 'projectiles_per_volley' : 1, 'speed' : 5}]
     BASE_SPEED : float = 4.0
     APPROCH_RATE : int = 100
     KILL_SCORE : int = 5
@@ -132,10 +130,10 @@ class BasicEnemy(BaseNormalEnemy):
     
     @classmethod
     def spawn(cls, position_anchor : str, position : int|pygame.Vector2, target_anchor : str = "top", target_pos : pygame.Vector2|int = 20):
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
 
         element.image = BaseEnemy.default_image2
-        element.mask = pygame.mask.from_surface(element.image)
+        element.use_image_mask()
         element.rect = element.image.get_rect()
 
         element.position = pygame.Vector2(0, 0)
@@ -157,7 +155,6 @@ class BasicEnemy(BaseNormalEnemy):
     
     def update(self, delta: float):
         self.control_script.process_frame(delta)
-        self.check_collisions()
     
     def fire_homing_projectile(self) -> HomingProjectile:
         return HomingProjectile.spawn(self.position + pygame.Vector2(0, 30), pygame.Vector2(0, 5), None, None, 0,
@@ -166,7 +163,7 @@ class BasicEnemy(BaseNormalEnemy):
     
     def fire_normal_projectile(self) -> NormalProjectile:
         return NormalProjectile.spawn(self.position + pygame.Vector2(0, 30), pygame.Vector2(0, 5), None, None, 0,
-        recolor_image(BaseProjectile.normal_image3, "Red"),  team=Teams.ENEMY)
+        cached_recolor_image(BaseProjectile.normal_image3, "Red"),  team=Teams.ENEMY)
     
     def clean_instance(self):
         super().clean_instance()
@@ -233,10 +230,11 @@ class EliteEnemy(BaseNormalEnemy):
     active_elements : list['EliteEnemy'] = []
     inactive_elements : list['EliteEnemy'] = []
     linked_classes : list['Sprite'] = [Sprite, BaseEnemy, BaseNormalEnemy]
+    FIRE_PATTERNS : list[FirePattern] = [{'projectile' : 'NormalProjectile', 'volleys_per_second' : 1, 'projectiles_per_volley' : 1, 'speed' : 8}]
     BASE_SPEED : float = 6.0
     APPROCH_RATE : int = 100
 
-    elite_image : pygame.Surface = load_alpha_to_colorkey("assets/graphics/enemy/elite_enemy.png", (0, 255, 0))
+    elite_image : pygame.Surface = asset_manager.add_image('elite_enemy', "assets/graphics/enemy/elite_enemy.png", (0, 255, 0))
 
     KILL_SCORE : int = 10
 
@@ -248,10 +246,10 @@ class EliteEnemy(BaseNormalEnemy):
     
     @classmethod
     def spawn(cls, position_anchor : str, position : int|pygame.Vector2, target_anchor : str = "top", target_pos : pygame.Vector2|int = 20):
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
 
         element.image = EliteEnemy.elite_image
-        element.mask = pygame.mask.from_surface(element.image)
+        element.use_image_mask()
         element.rect = element.image.get_rect()
 
         element.position = pygame.Vector2(0, 0)
@@ -271,7 +269,6 @@ class EliteEnemy(BaseNormalEnemy):
     
     def update(self, delta: float):
         self.control_script.process_frame(delta)
-        self.check_collisions()
     
     def fire_homing_projectile(self) -> HomingProjectile:
         return HomingProjectile.spawn(self.position + pygame.Vector2(0, 30), pygame.Vector2(0, 8), None, None, 0,
@@ -280,7 +277,7 @@ class EliteEnemy(BaseNormalEnemy):
     
     def fire_normal_projectile(self) -> NormalProjectile:
         return NormalProjectile.spawn(self.position + pygame.Vector2(0, 30), pygame.Vector2(0, 8), None, None, 0,
-        recolor_image(BaseProjectile.normal_image3, "Red"),  team=Teams.ENEMY)
+        cached_recolor_image(BaseProjectile.normal_image3, "Red"),  team=Teams.ENEMY)
     
     def clean_instance(self):
         super().clean_instance()
@@ -345,9 +342,10 @@ class GunnerEnemy(BaseNormalEnemy):
     active_elements : list['GunnerEnemy'] = []
     inactive_elements : list['GunnerEnemy'] = []
     linked_classes : list['Sprite'] = [Sprite, BaseEnemy, BaseNormalEnemy]
+    FIRE_PATTERNS : list[FirePattern] = [{'projectile' : 'NormalProjectile', 'volleys_per_second' : 4, 'projectiles_per_volley' : 1, 'speed' : 7}]
     BASE_SPEED : float = 3.0
 
-    gunner_image : pygame.Surface = load_alpha_to_colorkey("assets/graphics/enemy/gunner_enemy.png", (0, 255, 0))
+    gunner_image : pygame.Surface = asset_manager.add_image('gunner_enemy', "assets/graphics/enemy/gunner_enemy.png", (0, 255, 0))
     KILL_SCORE : int = 10
     def __init__(self):
         super().__init__()
@@ -357,10 +355,10 @@ class GunnerEnemy(BaseNormalEnemy):
     
     @classmethod
     def spawn(cls, position_anchor : str, position : int|pygame.Vector2, target_anchor : str = "top", target_pos : pygame.Vector2|int = 20):
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
 
         element.image = GunnerEnemy.gunner_image
-        element.mask = pygame.mask.from_surface(element.image)
+        element.use_image_mask()
         element.rect = element.image.get_rect()
 
         element.position = pygame.Vector2(0, 0)
@@ -380,7 +378,6 @@ class GunnerEnemy(BaseNormalEnemy):
     
     def update(self, delta: float):
         self.control_script.process_frame(delta)
-        self.check_collisions()
     
     def fire_homing_projectile(self) -> HomingProjectile:
         return HomingProjectile.spawn(self.position + pygame.Vector2(0, 30), pygame.Vector2(0, 7), None, None, 0,
@@ -389,7 +386,7 @@ class GunnerEnemy(BaseNormalEnemy):
     
     def fire_normal_projectile(self) -> NormalProjectile:
         return NormalProjectile.spawn(self.position + pygame.Vector2(0, 30), pygame.Vector2(0, 7), None, None, 0,
-        recolor_image(BaseProjectile.normal_image3, "Red"),  team=Teams.ENEMY)
+        cached_recolor_image(BaseProjectile.normal_image3, "Red"),  team=Teams.ENEMY)
     
     def clean_instance(self):
         super().clean_instance()
@@ -564,7 +561,7 @@ class RunnerEnemy(BaseNormalEnemy):
     linked_classes : list['Sprite'] = [Sprite, BaseEnemy, BaseNormalEnemy]
     BASE_SPEED : float = 5.0
 
-    runner_image : pygame.Surface = load_alpha_to_colorkey("assets/graphics/enemy/runner_enemy.png", (0, 255, 0))
+    runner_image : pygame.Surface = asset_manager.add_image('runner_enemy', "assets/graphics/enemy/runner_enemy.png", (0, 255, 0))
 
     KILL_SCORE : int = 10
 
@@ -576,10 +573,10 @@ class RunnerEnemy(BaseNormalEnemy):
     
     @classmethod
     def spawn(cls, position_anchor : str, position : int|pygame.Vector2, target_anchor : str = "top", target_pos : pygame.Vector2|int = 20):
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
 
         element.image = RunnerEnemy.runner_image
-        element.mask = pygame.mask.from_surface(element.image)
+        element.use_image_mask()
         element.rect = element.image.get_rect()
 
         element.position = pygame.Vector2(0, 0)
@@ -599,7 +596,6 @@ class RunnerEnemy(BaseNormalEnemy):
     
     def update(self, delta: float):
         if not self.control_script.is_over: self.control_script.process_frame(delta)
-        self.check_collisions()
     
     def fire_homing_projectile(self) -> HomingProjectile:
         return HomingProjectile.spawn(self.position + pygame.Vector2(0, 30), pygame.Vector2(0, 8), None, None, 0,
@@ -608,7 +604,7 @@ class RunnerEnemy(BaseNormalEnemy):
     
     def fire_normal_projectile(self) -> NormalProjectile:
         return NormalProjectile.spawn(self.position + pygame.Vector2(0, 30), pygame.Vector2(0, 8), None, None, 0,
-        recolor_image(BaseProjectile.normal_image3, "Red"),  team=Teams.ENEMY)
+        cached_recolor_image(BaseProjectile.normal_image3, "Red"),  team=Teams.ENEMY)
     
     def clean_instance(self):
         super().clean_instance()
@@ -705,9 +701,11 @@ Sprite.register_class(BasicEnemy)
 Sprite.register_class(EliteEnemy)
 Sprite.register_class(GunnerEnemy)
 Sprite.register_class(RunnerEnemy)
-for _ in range(30): BasicEnemy()
-for _ in range(20): EliteEnemy()
-for _ in range(20): GunnerEnemy()
-for _ in range(20) : RunnerEnemy()
+Sprite.collision_matrix.add_rule(CollisionRule(BaseEnemy, BaseProjectile, filter_b=lambda projectile : projectile.team in (Teams.ALLIED, Teams.FFA),
+                                               pair_filter=BaseEnemy.can_be_hit_by))
+BasicEnemy.configure_pool(30, growth_chunk=5)
+EliteEnemy.configure_pool(20, growth_chunk=5)
+GunnerEnemy.configure_pool(20, growth_chunk=5)
+RunnerEnemy.configure_pool(20, growth_chunk=5)
 
 
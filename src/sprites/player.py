@@ -1,12 +1,14 @@
 import pygame
 from typing import Generator, TypeAlias, Literal, TypedDict
 from framework.game.sprite import Sprite
-from framework.utils.helpers import load_alpha_to_colorkey, recolor_image, sign
+from framework.game.collision_matrix import CollisionRule
+from framework.utils.helpers import cached_recolor_image, sign
 from framework.utils.my_timer import Timer, TimeSource
 from framework.core.core import core_object
+from framework.core.asset_manager import asset_manager
 from framework.game.coroutine_scripts import CoroutineScript
 import src.sprites.projectiles
-from src.sprites.projectiles import NormalProjectile, BaseProjectile, HomingProjectile, Teams, ScatterProjectile
+from src.sprites.projectiles import NormalProjectile, BaseProjectile, HomingProjectile, Teams, ScatterProjectile, FirePattern
 import src.sprites.enemy
 from src.sprites.enemy import BaseEnemy, BaseNormalEnemy
 from enum import Enum
@@ -76,30 +78,22 @@ class Player(Sprite):
     active_elements : list['Player'] = []
     inactive_elements : list['Player'] = []
     linked_classes : list['Sprite'] = [Sprite]
-
-    animation_assets : dict[int, pygame.Surface] = {
-        i : pygame.transform.scale_by(
-            load_alpha_to_colorkey(f"assets/graphics/player/player-{i}.png", (0, 255, 0)), 2) 
-            for i in range(8)
-    }
-    heart_image : pygame.Surface = load_alpha_to_colorkey("assets/graphics/player/heart2.png", (0, 255, 0))
-    empty_heart_image : pygame.Surface = load_alpha_to_colorkey("assets/graphics/player/empty_heart4.png", (0, 255, 0))
-    hit_sfx : pygame.mixer.Sound = pygame.mixer.Sound("assets/audio/sfx/player_hit2.ogg")
-    hit_sfx.set_volume(0.50)
-    normal_shot_sfx : pygame.mixer.Sound = pygame.mixer.Sound("assets/audio/sfx/normal_shot3.ogg")
-    normal_shot_sfx.set_volume(0.5)
-
-    lazer_shot_sfx : pygame.mixer.Sound = pygame.mixer.Sound("assets/audio/sfx/lazer.ogg")
-    lazer_shot_sfx.set_volume(0.4)
-
-    shotgun_shot_sfx : pygame.mixer.Sound = pygame.mixer.Sound("assets/audio/sfx/shotgun_shot.ogg")
-    shotgun_shot_sfx.set_volume(0.7)
-
-    rocket_shot_sfx : pygame.mixer.Sound = pygame.mixer.Sound("assets/audio/sfx/rocket_shot.ogg")
-    rocket_shot_sfx.set_volume(0.18)
-
-    dash_sfx : pygame.mixer.Sound = pygame.mixer.Sound("assets/audio/sfx/dash.ogg")
-    dash_sfx.set_volume(0.4)
+    FIRE_PATTERNS : list[FirePattern] = [{'projectile' : 'NormalProjectile', 'volleys_per_second' : 9, 'projectiles_per_volley' : 1, 'speed' : 10},
+                                         {'projectile' : 'ScatterProjectile', 'volleys_per_second' : 1.5, 'projectiles_per_volley' : 20, 'speed' : 16},
+                                         {'projectile' : 'HomingProjectile', 'volleys_per_second' : 1, 'projectiles_per_volley' : 1, 'speed' : 10}]
+
+    animation_assets : dict[int, pygame.Surface] = asset_manager.add_map({
+        i : asset_manager.add_image(f'player_{i}', f"assets/graphics/player/player-{i}.png", (0, 255, 0), scale=2)
+        for i in range(8)
+    })
+    heart_image : pygame.Surface = asset_manager.add_image('heart', "assets/graphics/player/heart2.png", (0, 255, 0))
+    empty_heart_image : pygame.Surface = asset_manager.add_image('empty_heart', "assets/graphics/player/empty_heart4.png", (0, 255, 0))
+    hit_sfx : pygame.mixer.Sound = asset_manager.add_sound('player_hit', "assets/audio/sfx/player_hit2.ogg", 0.50)
+    normal_shot_sfx : pygame.mixer.Sound = asset_manager.add_sound('normal_shot', "assets/audio/sfx/normal_shot3.ogg", 0.5)
+    lazer_shot_sfx : pygame.mixer.Sound = asset_manager.add_sound('lazer_shot', "assets/audio/sfx/lazer.ogg", 0.4)
+    shotgun_shot_sfx : pygame.mixer.Sound = asset_manager.add_sound('shotgun_shot', "assets/audio/sfx/shotgun_shot.ogg", 0.7)
+    rocket_shot_sfx : pygame.mixer.Sound = asset_manager.add_sound('rocket_shot', "assets/audio/sfx/rocket_shot.ogg", 0.18)
+    dash_sfx : pygame.mixer.Sound = asset_manager.add_sound('dash', "assets/audio/sfx/dash.ogg", 0.4)
 
     ACCEL_SPEED : float = 3.0
     FRICTION : float = 0.3
@@ -166,11 +160,11 @@ class Player(Sprite):
 
     @classmethod
     def spawn(cls, position_anchor : str, position : int|pygame.Vector2):
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
 
         element.animation_images = cls.animation_assets
         element.image = element.animation_images[0]
-        element.mask = pygame.mask.from_surface(element.image)
+        element.use_image_mask()
         element.rect = element.image.get_rect()
 
         element.position = pygame.Vector2(0, 0)
@@ -223,7 +217,6 @@ class Player(Sprite):
         self.animation_script.process_frame()
         self.update_movement(delta)
         self.check_input()
-        self.check_collision()
         self.update_hearts()
         self.update_alternate_fire_visual()
         self.update_dash_cooldown_visual()
@@ -329,7 +322,7 @@ class Player(Sprite):
         self.shot_cooldown_timer.set_duration(1 / normal_firerate)
         core_object.bg_manager.play_sfx(Player.normal_shot_sfx, 1.0)
         return NormalProjectile.spawn(self.position + pygame.Vector2(0, -30), pygame.Vector2(0, -10), None, None, 0,
-                                       recolor_image(BaseProjectile.normal_image3, "White"), team=Teams.ALLIED,
+                                       cached_recolor_image(BaseProjectile.normal_image3, "White"), team=Teams.ALLIED,
                                        damage = normal_damage, can_destroy=True)
 
     def perform_alternate_fire(self, ignore_cooldown : bool = False) -> BaseProjectile|None:
@@ -371,7 +364,7 @@ class Player(Sprite):
             scatter_count = 0
             proj_count = 0
         return ScatterProjectile.spawn(self.position + pygame.Vector2(0, -30), pygame.Vector2(0, -16), None, None, 0,
-                                       recolor_image(BaseProjectile.normal_image3, "Purple"), team=Teams.ALLIED,
+                                       cached_recolor_image(BaseProjectile.normal_image3, "Purple"), team=Teams.ALLIED,
                                        damage=damage, can_destroy=True, bounce_count=0, scatter_count=scatter_count,
                                        scatter_proj_num=proj_count, scatter_reflect=True, damage_decay=damage_decay)
     
@@ -383,7 +376,7 @@ class Player(Sprite):
         for angle in (-20, -10, 0, 10, 20):
             proj_list.append(
                 ScatterProjectile.spawn(self.position + pygame.Vector2(0, -30), pygame.Vector2(0, -16).rotate(angle),
-                        None, None, angle, recolor_image(BaseProjectile.normal_image4, "White"), team=Teams.ALLIED,
+                        None, None, angle, cached_recolor_image(BaseProjectile.normal_image4, "White"), team=Teams.ALLIED,
                         damage=damage, can_destroy=True, scatter_count=scatter_count, bounce_count=bounce_count,
                         scatter_proj_num=3)
             )
@@ -412,24 +405,20 @@ class Player(Sprite):
         core_object.bg_manager.play_sfx(Player.hit_sfx, 1.0)
         return True
 
-    def check_collision(self):
-        colliding_projectiles : list[BaseProjectile] = [elem for elem in self.get_all_colliding(BaseProjectile) if elem.team in (Teams.ENEMY, Teams.FFA)]
-        colliding_enemies : list[BaseEnemy] = self.get_all_colliding(BaseEnemy)
-        for enemy in colliding_enemies:
+    def on_collision(self, other : BaseEnemy|BaseProjectile):
+        if isinstance(other, BaseEnemy):
             took_damage : bool = self.take_damage(1)
-            if isinstance(enemy, BaseNormalEnemy):
-                if took_damage:
-                    enemy.kill_instance()
-                else:
-                    ParticleEffect.load_effect('enemy_killed').play(enemy.position.copy(), core_object.game.game_timer.get_time)
+            if isinstance(other, BaseNormalEnemy):
+                if not took_damage:
+                    ParticleEffect.load_effect('enemy_killed').play(other.position.copy(), core_object.game.game_timer.get_time)
                     core_object.bg_manager.play_sfx(BaseEnemy.enemy_killed_sfx, 1.0)
-                    enemy.give_score(enemy.KILL_SCORE)
-                    enemy.kill_instance()
+                    other.give_score(other.KILL_SCORE)
+                other.kill_instance()
+            return
         if self.dash_timer.get_time() < Player.DASH_INVULN_TIME:
             return
-        for proj in colliding_projectiles:
-            self.take_damage(proj.damage)
-            proj.kill_instance()
+        self.take_damage(other.damage)
+        other.kill_instance()
     
     def update_hearts(self):
         ui_heart_count : int = len(self.ui_hearts)
@@ -472,6 +461,7 @@ class Player(Sprite):
         bar_height : int = int(pygame.math.lerp(max_height, 0, ready_percentage))
         pygame.draw.rect(self.ui_alternate_fire_sprite.surf, 'White', (0, max_height - bar_height, bar_width, bar_height))
         self.ui_alternate_fire_sprite.rect.midleft = self.rect.midright + pygame.Vector2(10, 0)
+        self.ui_alternate_fire_sprite.mark_dirty()
     
     def create_dash_cooldown_visual(self) -> UiSprite:
         BAR_DIMENSIONS : tuple[int, int] = (50, 5)
@@ -490,6 +480,7 @@ class Player(Sprite):
         bar_width : int = int(pygame.math.lerp(max_width, 0, ready_percentage))
         pygame.draw.rect(self.ui_dash_sprite.surf, 'White', (0, 0, bar_width, bar_height))
         self.ui_dash_sprite.rect.midtop = self.rect.midbottom + pygame.Vector2(0, 4)
+        self.ui_dash_sprite.mark_dirty()
     
     def handle_key_event(self, event : pygame.Event):
         if event.type == pygame.KEYDOWN:
@@ -546,7 +537,7 @@ class PlayerAnimationScript(CoroutineScript):
             image_index : int = int((animation_timer.get_time() * 8) // cycle_time) % 8
             if image_index != prev_index:
                 player.image = player.animation_images[image_index]
-                player.mask = pygame.mask.from_surface(player.image)
+                player.use_image_mask()
                 prev_index = image_index
             if player.invuln_timer.isover():
                 player.visible = True
@@ -563,5 +554,7 @@ def remove_connections():
     core_object.event_manager.unbind(pygame.KEYDOWN, Player.receive_key_event)
     core_object.event_manager.unbind(pygame.KEYUP, Player.receive_key_event)
 
-for _ in range(1): Player()
+Player.configure_pool(1, growth_chunk=1)
 Sprite.register_class(Player)
+Sprite.collision_matrix.add_rule(CollisionRule(Player, BaseEnemy))
+Sprite.collision_matrix.add_rule(CollisionRule(Player, BaseProjectile, filter_b=lambda projectile : projectile.team in (Teams.ENEMY, Teams.FFA)))
@@ -1,12 +1,23 @@
 import pygame
 from framework.game.sprite import Sprite
+from framework.game.collision_matrix import CollisionRule
 from framework.core.core import core_object
+from framework.core.asset_manager import asset_manager
 from framework.utils.pivot_2d import Pivot2D
-from framework.utils.helpers import sign, load_alpha_to_colorkey, ColorType, remove_image_empty
+from framework.utils.helpers import sign, ColorType
 from enum import Enum
 from inspect import isclass
-from typing import Union
+from typing import Union, TypedDict
 from framework.utils.particle_effects import ParticleEffect
+from framework.game.kinematics_batch import KinematicsBatch
+import framework.game.kinematics_batch as kinematics_batch
+
+class FirePattern(TypedDict):
+    '''The peak rate at which a unit fires one kind of projectile. Used by src.pool_planner to size projectile pools.'''
+    projectile : str
+    volleys_per_second : float
+    projectiles_per_volley : int
+    speed : float
 
 class Teams(Enum):
     PACIFIST = "Pacifist"
@@ -22,15 +33,14 @@ class BaseProjectile(Sprite):
     inactive_elements : list['BaseProjectile'] = []
     linked_classes : list['Sprite'] = [Sprite]
 
-    rocket_image : pygame.Surface = load_alpha_to_colorkey("assets/graphics/projectiles/rocket.png", (0, 255, 0))
+    rocket_image : pygame.Surface = asset_manager.add_image('rocket', "assets/graphics/projectiles/rocket.png", (0, 255, 0))
+
+    normal_image1 : pygame.Surface = asset_manager.add_image('normal_projectile_1', "assets/graphics/projectiles/normal_projectile_1-white.png", (0, 255, 0), crop=True)
+    normal_image2 : pygame.Surface = asset_manager.add_image('normal_projectile_2', "assets/graphics/projectiles/normal_projectile_2-white.png", (0, 255, 0), crop=True)
+    normal_image3 : pygame.Surface = asset_manager.add_image('normal_projectile_3', "assets/graphics/projectiles/normal_projectile_3-white.png", (0, 255, 0), crop=True)
+    normal_image4 : pygame.Surface = asset_manager.add_image('normal_projectile_4', "assets/graphics/projectiles/normal_projectile_4-white.png", (0, 255, 0), crop=True)
 
-    normal_image1 : pygame.Surface = remove_image_empty(load_alpha_to_colorkey("assets/graphics/projectiles/normal_projectile_1-white.png", (0, 255, 0)))
-    normal_image2 : pygame.Surface = remove_image_empty(load_alpha_to_colorkey("assets/graphics/projectiles/normal_projectile_2-white.png", (0, 255, 0)))
-    normal_image3 : pygame.Surface = remove_image_empty(load_alpha_to_colorkey("assets/graphics/projectiles/normal_projectile_3-white.png", (0, 255, 0)))
-    normal_image4 : pygame.Surface = remove_image_empty(load_alpha_to_colorkey("assets/graphics/projectiles/normal_projectile_4-white.png", (0, 255, 0))
-)
-    explosion_sfx1 : pygame.mixer.Sound = pygame.mixer.Sound("assets/audio/sfx/explosion1.ogg")
-    explosion_sfx1.set_volume(0.7)
+    explosion_sfx1 : pygame.mixer.Sound = asset_manager.add_sound('explosion1', "assets/audio/sfx/explosion1.ogg", 0.7)
     bounding_box : pygame.Rect = pygame.Rect(0, 0, *core_object.main_display.get_size())
 
     def __init__(self) -> None:
@@ -53,7 +63,7 @@ class BaseProjectile(Sprite):
     def spawn(cls, new_pos : pygame.Vector2, velocity : pygame.Vector2, accel : pygame.Vector2, drag : float, angle : float):
         
         raise NotImplementedError("Cannot instanciate base-class BaseProjectile; sub-class must implement this method")
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
         element.image = cls.test_image
         element.rect = element.image.get_rect()
         element.position = new_pos
@@ -67,7 +77,7 @@ class BaseProjectile(Sprite):
         element.pivot.pivot_offset = pygame.Vector2(0, 0)
         element.angle = angle
 
-        element.mask = pygame.mask.from_surface(element.image)
+        element.use_image_mask()
         
         cls.unpool(element)
         
@@ -82,25 +92,19 @@ class BaseProjectile(Sprite):
 
         self.velocity *=  ((1 - self.drag) ** delta) ** 0.5
     
-    def check_destruction(self):
-        if not self.destructible:
-            return
-        projectile : BaseProjectile
-        for projectile in self.get_all_colliding(BaseProjectile):
-            if projectile == self:
-                continue
-            if projectile.team == Teams.PACIFIST:
-                continue
-            if projectile.team == self.team and (self.team != Teams.FFA):
-                continue
-            if projectile.can_destroy:
-                overlap_point : tuple[int, int] = self.mask.overlap(self.mask, (self.rect.x - projectile.rect.x, self.rect.y - projectile.rect.y)) or (self.rect.width // 2, self.rect.height // 2)
-                point_of_contact : pygame.Vector2 = (pygame.Vector2(self.rect.topleft) + overlap_point)
-                ParticleEffect.load_effect('explosion_small_effect').play(point_of_contact, core_object.game.game_timer.get_time)
-                core_object.bg_manager.play_sfx(BaseProjectile.explosion_sfx1, 0.75)
-                self.kill_instance_safe()
-            if projectile.die_after_destroying:
-                projectile.kill_instance_safe()
+    def can_be_destroyed_by(self, projectile : 'BaseProjectile') -> bool:
+        if projectile.team == Teams.PACIFIST:
+            return False
+        return projectile.team != self.team or self.team == Teams.FFA
+
+    def on_collision(self, other : 'BaseProjectile'):
+        overlap_point : tuple[int, int] = self.mask.overlap(self.mask, (self.rect.x - other.rect.x, self.rect.y - other.rect.y)) or (self.rect.width // 2, self.rect.height // 2)
+        point_of_contact : pygame.Vector2 = (pygame.Vector2(self.rect.topleft) + overlap_point)
+        ParticleEffect.load_effect('explosion_small_effect').play(point_of_contact, core_object.game.game_timer.get_time)
+        core_object.bg_manager.play_sfx(BaseProjectile.explosion_sfx1, 0.75)
+        self.kill_instance_safe()
+        if other.die_after_destroying:
+            other.kill_instance_safe()
     
     def clean_instance(self):
         super().clean_instance()
@@ -121,6 +125,12 @@ class NormalProjectile(BaseProjectile):
     active_elements : list['NormalProjectile'] = []
     inactive_elements : list['NormalProjectile'] = []
     linked_classes : list['Sprite'] = [Sprite, BaseProjectile]
+    kinematics : KinematicsBatch|None = KinematicsBatch(200) if kinematics_batch.is_available() else None
+
+    _kinematics_slot : int|None = None
+    _velocity : pygame.Vector2|None = None
+    _acceleration : pygame.Vector2|None = None
+    _drag : float|None = None
 
     def __init__(self) -> None:
         super().__init__()
@@ -132,7 +142,7 @@ class NormalProjectile(BaseProjectile):
               projectile_type : str = "", pivot_offset : pygame.Vector2|None = None,
               zindex : int = 0, damage : float = 1, can_destroy : bool = False, destructible : bool = False, 
               die_after_destroying : bool = True):
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
 
         element.image = custom_image
         element.rect = element.image.get_rect()
@@ -149,7 +159,7 @@ class NormalProjectile(BaseProjectile):
         element.team = team
 
         element.type = projectile_type
-        element.mask = pygame.mask.from_surface(element.image)
+        element.use_image_mask()
         element.was_onscreen_once = False
         element.damage = damage
 
@@ -158,11 +168,95 @@ class NormalProjectile(BaseProjectile):
         element.die_after_destroying = die_after_destroying
 
         cls.unpool(element)
+        if cls.kinematics is not None:
+            element.attach_kinematics()
         return element
+
+    def attach_kinematics(self):
+        '''Moves the kinematic state of this projectile into NormalProjectile.kinematics, which then integrates it in update_batch.'''
+        extent : float = pygame.Vector2(self.rect.size).magnitude() / 2 + self.pivot.pivot_offset.magnitude()
+        self._kinematics_slot = NormalProjectile.kinematics.attach(self, self.position, self._velocity, self._acceleration, self._drag, extent)
+
+    def detach_kinematics(self):
+        if self._kinematics_slot is None: return
+        slot : int = self._kinematics_slot
+        self._velocity = pygame.Vector2(NormalProjectile.kinematics.velocity[slot])
+        self._acceleration = pygame.Vector2(NormalProjectile.kinematics.acceleration[slot])
+        self._drag = float(NormalProjectile.kinematics.drag[slot])
+        NormalProjectile.kinematics.detach(slot)
+        self._kinematics_slot = None
+
+    @property
+    def position(self) -> pygame.Vector2:
+        return Sprite.position.fget(self)
+
+    @position.setter
+    def position(self, new_val : pygame.Vector2):
+        Sprite.position.fset(self, new_val)
+        if self._kinematics_slot is not None:
+            NormalProjectile.kinematics.position[self._kinematics_slot] = new_val
+
+    @property
+    def velocity(self) -> pygame.Vector2|None:
+        '''A copy while the projectile is batched : changes must be assigned back (velocity = ..., velocity *= ...), not made in place.'''
+        if self._kinematics_slot is None: return self._velocity
+        return pygame.Vector2(NormalProjectile.kinematics.velocity[self._kinematics_slot])
+
+    @velocity.setter
+    def velocity(self, new_val : pygame.Vector2|None):
+        if self._kinematics_slot is None:
+            self._velocity = new_val
+        else:
+            NormalProjectile.kinematics.velocity[self._kinematics_slot] = new_val
+
+    @property
+    def acceleration(self) -> pygame.Vector2|None:
+        '''A copy while the projectile is batched, like velocity.'''
+        if self._kinematics_slot is None: return self._acceleration
+        return pygame.Vector2(NormalProjectile.kinematics.acceleration[self._kinematics_slot])
+
+    @acceleration.setter
+    def acceleration(self, new_val : pygame.Vector2|None):
+        if self._kinematics_slot is None:
+            self._acceleration = new_val
+        else:
+            NormalProjectile.kinematics.acceleration[self._kinematics_slot] = new_val
+
+    @property
+    def drag(self) -> float|None:
+        if self._kinematics_slot is None: return self._drag
+        return float(NormalProjectile.kinematics.drag[self._kinematics_slot])
+
+    @drag.setter
+    def drag(self, new_val : float|None):
+        if self._kinematics_slot is None:
+            self._drag = new_val
+        else:
+            NormalProjectile.kinematics.drag[self._kinematics_slot] = new_val
+
+    @classmethod
+    def update_batch(cls, delta : float):
+        batch : KinematicsBatch|None = cls.kinematics
+        if batch is None or not len(batch): return
+        slots = batch.step(delta)
+        onscreen : list[bool] = batch.get_onscreen(slots, BaseProjectile.bounding_box).tolist()
+        positions : list[list[float]] = batch.position[slots].tolist()
+        elements : list[NormalProjectile|None] = batch.elements
+        set_position = Sprite.position.fset
+        for slot, new_position, is_onscreen in zip(slots.tolist(), positions, onscreen):
+            element : NormalProjectile = elements[slot]
+            if element._zombie: continue
+            set_position(element, pygame.Vector2(new_position))
+            if is_onscreen:
+                element.was_onscreen_once = True
+            elif element.was_onscreen_once:
+                element.kill_instance_safe()
     
     def update(self, delta : float):
         if self._zombie:
             return
+        if self._kinematics_slot is not None:
+            return
         self.velocity *=  ((1 - self.drag) ** delta) ** 0.5
 
         self.velocity += self.acceleration * 0.5 * delta
@@ -175,10 +269,9 @@ class NormalProjectile(BaseProjectile):
                 self.kill_instance_safe()
         else:
             self.was_onscreen_once = True
-        if not self._zombie:
-            self.check_destruction()
     
     def clean_instance(self):
+        self.detach_kinematics()
         super().clean_instance()
         
 
@@ -212,7 +305,7 @@ class HomingProjectile(BaseProjectile):
         if homing_targets is None: homing_targets = []
         if not isinstance(homing_targets, list):
             homing_targets = [homing_targets]
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
 
         element.image = custom_image
         element.rect = element.image.get_rect()
@@ -226,7 +319,7 @@ class HomingProjectile(BaseProjectile):
         element.pivot = Pivot2D(element._position, element.image, element.image.get_colorkey() or (0, 255, 255))
         element.pivot.pivot_offset = pygame.Vector2(0, 0) if pivot_offset is None else pivot_offset
         element.angle_offset = angle_offset
-        element.mask = pygame.mask.from_surface(element.image)
+        element.use_image_mask()
 
         element.team = team
         element.type = projectile_type
@@ -296,8 +389,6 @@ class HomingProjectile(BaseProjectile):
                 self.kill_instance_safe()
         else:
             self.was_onscreen_once = True
-        if not self._zombie:
-            self.check_destruction()
     
     def pick_homing_target(self) -> Sprite|None:
         if not self.homing_targets: return None
@@ -372,7 +463,7 @@ class ScatterProjectile(BaseProjectile):
               bounce_count : int = 2, scatter_count : int = 1, scatter_proj_num : int = 3,
               ignore : list["Sprite"]|None = None, scatter_reflect : bool = False, damage_decay : float = 1.0,
               angle_offset : float = 0.0):
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
 
         element.image = custom_image
         element.rect = element.image.get_rect()
@@ -389,7 +480,7 @@ class ScatterProjectile(BaseProjectile):
         element.team = team
 
         element.type = projectile_type
-        element.mask = pygame.mask.from_surface(element.image)
+        element.use_image_mask()
         element.was_onscreen_once = False
         element.damage = damage
 
@@ -435,8 +526,6 @@ class ScatterProjectile(BaseProjectile):
                 self.kill_instance_safe()
         else:
             self.was_onscreen_once = True
-        if not self._zombie:
-            self.check_destruction()
     
     def scatter(self, hit : "BaseEnemy"):
         self.ignore.append(hit)
@@ -495,14 +584,13 @@ Sprite.register_class(BaseProjectile)
 Sprite.register_class(NormalProjectile)
 Sprite.register_class(HomingProjectile)
 Sprite.register_class(ScatterProjectile)
-for _ in range(200):
-    NormalProjectile()
-
-for _ in range(50):
-    HomingProjectile()
-
-for _ in range(50):
-    ScatterProjectile()
+Sprite.register_batch_class(NormalProjectile)
+BaseProjectile.enable_spatial_hash(64, max_speed=16)
+Sprite.collision_matrix.add_rule(CollisionRule(BaseProjectile, BaseProjectile, filter_a=lambda projectile : projectile.destructible,
+                                               filter_b=lambda projectile : projectile.can_destroy, pair_filter=BaseProjectile.can_be_destroyed_by))
+NormalProjectile.configure_pool(200, growth_chunk=50)
+HomingProjectile.configure_pool(50, growth_chunk=10)
+ScatterProjectile.configure_pool(50, growth_chunk=10)
 
 def runtime_imports():
     global src
@@ -39,7 +39,7 @@ class TestPlayer(Sprite):
 
     @classmethod
     def spawn(cls, new_pos : pygame.Vector2):
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
 
         element.image = cls.test_image
         element.color_images = cls.surfaces
@@ -1,7 +1,8 @@
 import pygame
 from framework.game.sprite import Sprite
-from framework.utils.helpers import load_alpha_to_colorkey, ColorType
+from framework.utils.helpers import load_alpha_to_colorkey, optimize_surface, ColorType
 from framework.core.core import core_object
+from framework.core.asset_manager import asset_manager
 from framework.game.coroutine_scripts import CoroutineScript
 from framework.utils.my_timer import Timer, TimeSource
 from typing import Generator
@@ -22,6 +23,7 @@ class UpgradeCard(Sprite):
     default_image.set_colorkey((0, 255, 255))
     BACKGROUND_SPEED : float = 2
     SPAWN_BACKGROUND : bool = True
+    clickable : bool = True
     display_size : tuple[int, int] = core_object.main_display.get_size()
     def __init__(self) -> None:
         super().__init__()
@@ -30,14 +32,14 @@ class UpgradeCard(Sprite):
 
     @staticmethod
     def get_font(size : int) -> pygame.Font:
-        return pygame.Font('assets/fonts/Pixeltype.ttf', size)
+        return asset_manager.add_font(f'pixeltype_{size}', 'assets/fonts/Pixeltype.ttf', size).get()
 
     @classmethod
     def spawn(cls, x_pos : int, text_lines : list[tuple[str, int, int|str, ColorType]], special : bool = False) -> "UpgradeCard":
         """
         text_tuple is a tuple of the text, y_level (relative to card.top), size
         """
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
 
         element.image = cls.default_image.copy()
         available_fonts : dict[str|int, pygame.Font] = {
@@ -63,6 +65,7 @@ class UpgradeCard(Sprite):
             element.image.blit(text_image, text_image.get_rect(center=(card_width // 2, y_level)))
         if special:
             pygame.draw.rect(element.image, "#ffd700", element.image.get_rect(), width=10)
+        element.image = optimize_surface(element.image)
         element.rect = element.image.get_rect()
 
         element.position = pygame.Vector2(0, 0)
@@ -102,7 +105,7 @@ class UpgradeCard(Sprite):
         super().clean_instance()
         
 
-for _ in range(5): UpgradeCard()
+UpgradeCard.configure_pool(5, growth_chunk=1)
 Sprite.register_class(UpgradeCard)
 
 class TransitionInScript(CoroutineScript):
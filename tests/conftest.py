@@ -0,0 +1,7 @@
+import os
+import sys
+
+#The tests import the game packages from the repository root and never open a window or an audio device
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
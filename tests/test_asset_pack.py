@@ -0,0 +1,112 @@
+import io
+import json
+import os
+import shutil
+import struct
+import pygame
+import pytest
+import framework.core.asset_pack as asset_pack
+from framework.core.asset_pack import AssetPack
+
+FONT_PATH : str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets', 'fonts', 'Pixeltype.ttf')
+
+@pytest.fixture
+def asset_dir(tmp_path, monkeypatch):
+    '''A working directory holding a few asset files, since packs store paths relative to it.'''
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('assets/data')
+    files : dict[str, bytes] = {'assets/data/empty.json' : b'',
+                                'assets/data/small.json' : json.dumps({'value' : 1}).encode(),
+                                'assets/data/large.bin' : bytes(range(256)) * 40}
+    for path, data in files.items():
+        with open(path, 'wb') as file:
+            file.write(data)
+    yield files
+    asset_pack.unmount_pack()
+
+def test_round_trip(asset_dir):
+    size : int = AssetPack.write('test.pack', list(asset_dir))
+    assert size == os.path.getsize('test.pack')
+    pack : AssetPack = AssetPack('test.pack')
+    for path, data in asset_dir.items():
+        assert path in pack
+        assert bytes(pack.get_buffer(path)) == data
+        with pack.open(path) as file:
+            assert file.read() == data
+    assert './assets/data/small.json' in pack
+    assert 'assets/data/missing.json' not in pack
+    pack.close()
+
+def test_layout_is_aligned_and_past_the_index(tmp_path, monkeypatch):
+    #Enough long names that the index size changes the offsets it holds, so the layout loop has to run again
+    monkeypatch.chdir(tmp_path)
+    paths : list[str] = [f'asset_with_a_rather_long_name_{i:04}.bin' for i in range(300)]
+    for i, path in enumerate(paths):
+        with open(path, 'wb') as file:
+            file.write(bytes([i % 256]) * (i % 97))
+    AssetPack.write('test.pack', paths)
+    pack : AssetPack = AssetPack('test.pack')
+    _, _, index_size = struct.unpack_from(AssetPack.HEADER_FORMAT, pack.view)
+    index_end : int = struct.calcsize(AssetPack.HEADER_FORMAT) + index_size
+    previous_end : int = index_end
+    for i, path in enumerate(paths):
+        offset, size, _ = pack.index[path]
+        assert offset % AssetPack.ALIGNMENT == 0
+        assert offset >= previous_end
+        assert bytes(pack.get_buffer(path)) == bytes([i % 256]) * (i % 97)
+        previous_end = offset + size
+    pack.close()
+
+def test_empty_pack(tmp_path):
+    path : str = str(tmp_path / 'empty.pack')
+    AssetPack.write(path, [])
+    pack : AssetPack = AssetPack(path)
+    assert pack.index == {}
+    assert 'anything.png' not in pack
+    pack.close()
+    pack.close()
+
+def test_rejects_other_files(tmp_path):
+    path : str = str(tmp_path / 'not_a.pack')
+    with open(path, 'wb') as file:
+        file.write(struct.pack(AssetPack.HEADER_FORMAT, b'NOPE', AssetPack.VERSION, 0))
+    with pytest.raises(ValueError):
+        AssetPack(path)
+
+def test_stat_matches_the_packed_file(asset_dir):
+    AssetPack.write('test.pack', list(asset_dir))
+    expected : dict[str, tuple[int, int]] = {path : (os.stat(path).st_size, os.stat(path).st_mtime_ns) for path in asset_dir}
+    asset_pack.mount_pack('test.pack')
+    for path in asset_dir:
+        assert asset_pack.mounted_pack.stat(path) == expected[path]
+        assert asset_pack.stat_asset(path) == expected[path]
+        os.remove(path)
+    #Only the pack holds the files now
+    assert asset_pack.load_json('assets/data/small.json') == {'value' : 1}
+
+def test_reader_seeks_like_a_file(asset_dir):
+    AssetPack.write('test.pack', list(asset_dir))
+    pack : AssetPack = AssetPack('test.pack')
+    reader = pack.open('assets/data/large.bin')
+    assert reader.seek(-10, io.SEEK_END) == len(asset_dir['assets/data/large.bin']) - 10
+    assert reader.read() == asset_dir['assets/data/large.bin'][-10:]
+    reader.seek(5)
+    reader.seek(3, io.SEEK_CUR)
+    assert reader.read(4) == bytes([8, 9, 10, 11])
+    reader.close()
+    pack.close()
+
+def test_close_with_an_open_font_reader(asset_dir):
+    os.makedirs('assets/fonts')
+    shutil.copy(FONT_PATH, 'assets/fonts/Pixeltype.ttf')
+    AssetPack.write('test.pack', ['assets/fonts/Pixeltype.ttf'])
+    os.remove('assets/fonts/Pixeltype.ttf')
+    pygame.font.init()
+    asset_pack.mount_pack('test.pack')
+    font : pygame.Font = asset_pack.load_font('assets/fonts/Pixeltype.ttf', 20)
+    asset_pack.mount_pack('test.pack')
+    second_font : pygame.Font = asset_pack.load_font('assets/fonts/Pixeltype.ttf', 20)
+    asset_pack.unmount_pack()
+    assert asset_pack.mounted_pack is None
+    assert font.render('Play', False, 'black').get_width() > 0
+    assert second_font.render('Play', False, 'black').get_width() > 0
@@ -0,0 +1,98 @@
+from framework.utils.render_list import RenderList
+
+class Drawable:
+    '''Smallest item a RenderList accepts : a zindex whose setter refreshes the lists holding the item.'''
+    def __init__(self, name : str, zindex : int|None) -> None:
+        self.name : str = name
+        self._zindex : int|None = zindex
+        self._render_lists : list[RenderList] = []
+
+    @property
+    def zindex(self) -> int|None:
+        return self._zindex
+
+    @zindex.setter
+    def zindex(self, new_val : int|None):
+        self._zindex = new_val
+        for render_list in self._render_lists:
+            render_list.refresh(self)
+
+    def __repr__(self) -> str:
+        return self.name
+
+def make_list(*items : Drawable) -> RenderList:
+    render_list : RenderList = RenderList()
+    for item in items:
+        render_list.add(item)
+    return render_list
+
+def test_iterates_by_zindex_then_insertion_order():
+    a, b, c, d = Drawable('a', 2), Drawable('b', 0), Drawable('c', 2), Drawable('d', -1)
+    render_list : RenderList = make_list(a, b, c, d)
+    assert list(render_list) == [d, b, a, c]
+    assert len(render_list) == 4
+
+def test_add_is_idempotent():
+    a = Drawable('a', 0)
+    render_list : RenderList = make_list(a, a)
+    assert list(render_list) == [a]
+    assert a._render_lists == [render_list]
+
+def test_zindex_change_moves_the_item_to_the_back_of_its_new_bucket():
+    a, b, c = Drawable('a', 0), Drawable('b', 1), Drawable('c', 1)
+    render_list : RenderList = make_list(a, b, c)
+    a.zindex = 1
+    assert list(render_list) == [b, c, a]
+    assert render_list.keys == [1]
+    b.zindex = 1
+    assert list(render_list) == [b, c, a]
+    c.zindex = -5
+    assert list(render_list) == [c, b, a]
+    assert render_list.keys == [-5, 1]
+
+def test_zindex_none_is_kept_but_not_drawn():
+    a, b = Drawable('a', None), Drawable('b', 0)
+    render_list : RenderList = make_list(a, b)
+    assert a in render_list and len(render_list) == 2
+    assert list(render_list) == [b]
+    a.zindex = 3
+    assert list(render_list) == [b, a]
+    b.zindex = None
+    assert list(render_list) == [a]
+    assert render_list.keys == [3]
+    render_list.discard(b)
+    assert b not in render_list and b._render_lists == []
+
+def test_discard_drops_empty_buckets():
+    a, b = Drawable('a', 0), Drawable('b', 1)
+    render_list : RenderList = make_list(a, b)
+    render_list.discard(a)
+    render_list.discard(a)
+    assert render_list.keys == [1] and 0 not in render_list.buckets
+    assert a._render_lists == []
+    a.zindex = 7
+    assert list(render_list) == [b]
+
+def test_item_in_several_lists_refreshes_each():
+    a, b = Drawable('a', 0), Drawable('b', 1)
+    first : RenderList = make_list(a, b)
+    second : RenderList = make_list(b, a)
+    a.zindex = 2
+    assert list(first) == [b, a]
+    assert list(second) == [b, a]
+    first.clear()
+    assert len(first) == 0 and first.keys == []
+    assert a._render_lists == [second] and b._render_lists == [second]
+
+def test_merged_puts_earlier_lists_first_on_ties():
+    sprite_a, sprite_b = Drawable('sprite_a', 0), Drawable('sprite_b', 5)
+    ui_a, ui_b = Drawable('ui_a', 0), Drawable('ui_b', 3)
+    sprites : RenderList = make_list(sprite_a, sprite_b)
+    ui : RenderList = make_list(ui_b, ui_a)
+    assert list(RenderList.merged(sprites, ui)) == [sprite_a, ui_a, ui_b, sprite_b]
+    assert list(RenderList.merged(ui, sprites)) == [ui_a, sprite_a, ui_b, sprite_b]
+
+def test_merged_with_empty_lists():
+    a = Drawable('a', 0)
+    assert list(RenderList.merged(RenderList(), make_list(a), RenderList())) == [a]
+    assert list(RenderList.merged()) == []
@@ -0,0 +1,127 @@
+import pytest
+from framework.game.sprite import Sprite
+from framework.game.sprite_pool import SpritePool
+
+class Item:
+    def __init__(self, name : str) -> None:
+        self.name : str = name
+
+    def __repr__(self) -> str:
+        return self.name
+
+def make_items(count : int) -> list[Item]:
+    return [Item(str(i)) for i in range(count)]
+
+def assert_consistent(pool : SpritePool):
+    '''Every slot index matches the position of its element.'''
+    assert len(pool._slots) == len(pool)
+    for slot, element in enumerate(pool):
+        assert pool._slots[element] == slot
+        assert pool.index(element) == slot
+
+def test_append_is_idempotent():
+    a, b = make_items(2)
+    pool : SpritePool = SpritePool([a, b, a])
+    assert list(pool) == [a, b]
+    pool.append(b)
+    pool += [a, b]
+    assert list(pool) == [a, b]
+    assert pool.count(a) == 1
+    assert_consistent(pool)
+
+def test_discard_swaps_the_last_element_in():
+    a, b, c, d = make_items(4)
+    pool : SpritePool = SpritePool([a, b, c, d])
+    assert pool.discard(b)
+    assert list(pool) == [a, d, c]
+    assert b not in pool
+    assert_consistent(pool)
+
+def test_discard_last_and_only_elements():
+    a, b = make_items(2)
+    pool : SpritePool = SpritePool([a, b])
+    assert pool.discard(b)
+    assert list(pool) == [a]
+    assert pool.discard(a)
+    assert list(pool) == [] and not pool._slots
+    assert not pool.discard(a)
+
+def test_remove_and_index_of_a_missing_element_raise():
+    pool : SpritePool = SpritePool(make_items(2))
+    missing : Item = Item('missing')
+    with pytest.raises(ValueError):
+        pool.remove(missing)
+    with pytest.raises(ValueError):
+        pool.index(missing)
+
+def test_remove_during_iteration_over_a_copy():
+    items : list[Item] = make_items(10)
+    pool : SpritePool = SpritePool(items)
+    for element in pool[:]:
+        if int(element.name) % 3 == 0:
+            pool.remove(element)
+    assert sorted(pool, key=lambda element : int(element.name)) == [item for item in items if int(item.name) % 3]
+    assert_consistent(pool)
+
+def test_pop_keeps_slots_consistent():
+    a, b, c = make_items(3)
+    pool : SpritePool = SpritePool([a, b, c])
+    assert pool.pop(0) is a
+    assert pool.pop() is b
+    assert list(pool) == [c]
+    assert_consistent(pool)
+
+def test_order_changing_operations_reindex():
+    a, b, c = make_items(3)
+    pool : SpritePool = SpritePool([c, a, b])
+    pool.sort(key=lambda element : element.name)
+    assert list(pool) == [a, b, c]
+    assert_consistent(pool)
+    pool.reverse()
+    assert_consistent(pool)
+    pool.insert(0, Item('3'))
+    assert_consistent(pool)
+    del pool[1]
+    assert_consistent(pool)
+    pool[0] = Item('4')
+    assert_consistent(pool)
+    pool.clear()
+    assert len(pool) == 0 and not pool._slots
+
+class PooledSprite(Sprite):
+    active_elements : list['PooledSprite'] = []
+    inactive_elements : list['PooledSprite'] = []
+    linked_classes : list['Sprite'] = [Sprite]
+
+    def __init__(self) -> None:
+        super().__init__()
+        PooledSprite.inactive_elements.append(self)
+
+def test_subclass_pools_are_converted():
+    assert isinstance(PooledSprite.active_elements, SpritePool)
+    assert isinstance(PooledSprite.inactive_elements, SpritePool)
+
+def test_get_inactive_follows_pool_and_unpool():
+    PooledSprite.grow_pool(2 - PooledSprite.get_pool_size())
+    first, second = PooledSprite.inactive_elements[:2]
+    assert PooledSprite.get_inactive() is first
+    PooledSprite.unpool(first)
+    assert first in PooledSprite.active_elements and first in Sprite.active_elements
+    assert first not in PooledSprite.inactive_elements
+    assert PooledSprite.get_inactive() is second
+    PooledSprite.pool(first)
+    assert first not in PooledSprite.active_elements and first not in Sprite.active_elements
+    assert PooledSprite.inactive_elements[-1] is first
+    assert_consistent(PooledSprite.inactive_elements)
+    assert_consistent(Sprite.active_elements)
+
+def test_get_inactive_grows_an_exhausted_pool():
+    PooledSprite.POOL_GROWTH_CHUNK = 3
+    while PooledSprite.inactive_elements:
+        PooledSprite.unpool(PooledSprite.inactive_elements[0])
+    size : int = PooledSprite.get_pool_size()
+    element : PooledSprite = PooledSprite.get_inactive()
+    assert element is PooledSprite.inactive_elements[0]
+    assert PooledSprite.get_pool_size() == size + 3
+    for element in PooledSprite.active_elements[:]:
+        PooledSprite.pool(element)